@@ -0,0 +1,4 @@
+"""
+Shared building blocks for the AA Wheel & Truck Supply Python tooling
+(scrape_website.py and the scripts in scripts/).
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from aawheel.cli import main
+
+sys.exit(main())
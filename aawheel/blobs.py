@@ -0,0 +1,265 @@
+"""
+Content-addressed image store.
+
+Every image is stored once, named by the SHA-256 of its bytes
+(public/images/blobs/ab/ab12...ef.jpg), however many products use it. The
+store's index maps each product-image slug to a blob, so which image a
+product shows is an explicit assignment instead of a download order or a
+file name, and remembers the URL each blob came from so re-runs skip
+known downloads. Blob files never change, so they can be cached forever.
+
+Perceptual hashes (64-bit dHash) are computed in bulk on a process pool
+and cached per blob, which means each image is decoded once for its whole
+life in the store. near_duplicates() compares them with the same band
+bucketing as page SimHashes to find images that look the same but are
+stored as different bytes (re-encodes, resizes, re-uploads).
+
+prune() deletes blobs that no slug references, so a deployment only ships
+images that are in use.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from aawheel.downloads import download_file, file_sha256
+from aawheel.fingerprint import near_duplicates as _near_duplicates
+
+DEFAULT_STORE = 'public/images/blobs'
+DEFAULT_URL_PREFIX = '/images/blobs'
+INDEX_FILE = '.index.json'
+INDEX_VERSION = 1
+DHASH_SIZE = 8
+# dHashes at most this many bits apart are reported as the same picture
+NEAR_DUPLICATE_BITS = 5
+
+SIGNATURES = (
+    (b'\xff\xd8\xff', '.jpg'),
+    (b'\x89PNG\r\n\x1a\n', '.png'),
+    (b'GIF87a', '.gif'),
+    (b'GIF89a', '.gif'),
+)
+
+def sniff_extension(head):
+    """File extension for an image from its first bytes ('.bin' if unknown)."""
+    for magic, ext in SIGNATURES:
+        if head.startswith(magic):
+            return ext
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    if head[4:8] == b'ftyp' and head[8:12] in (b'avif', b'avis'):
+        return '.avif'
+    return '.bin'
+
+def _sniff_file(path):
+    with open(path, 'rb') as f:
+        return sniff_extension(f.read(16))
+
+def dhash(path):
+    """64-bit difference hash: left/right brightness steps in a 9x8 grayscale thumbnail."""
+    from aawheel.images import load_pillow
+    Image, _ = load_pillow()
+    with Image.open(path) as image:
+        # JPEGs decode straight to a small grayscale draft (up to 1/8 scale)
+        image.draft('L', (DHASH_SIZE * 4, DHASH_SIZE * 4))
+        pixels = image.convert('L').resize((DHASH_SIZE + 1, DHASH_SIZE), Image.LANCZOS).tobytes()
+    value = 0
+    for row in range(DHASH_SIZE):
+        line = pixels[row * (DHASH_SIZE + 1):(row + 1) * (DHASH_SIZE + 1)]
+        for col in range(DHASH_SIZE):
+            value = value << 1 | (line[col] > line[col + 1])
+    return value
+
+def _dhash_or_none(path):
+    try:
+        return dhash(path)
+    except Exception:
+        return None
+
+class BlobStore:
+    """Blobs under root plus an index of slug -> sha256 refs, blob metadata and source URLs."""
+
+    def __init__(self, root=DEFAULT_STORE, url_prefix=DEFAULT_URL_PREFIX):
+        self.root = Path(root)
+        self.url_prefix = url_prefix
+        self.index_path = self.root / INDEX_FILE
+        self._lock = threading.Lock()
+        self.dirty = False
+        self.blobs = {}
+        self.refs = {}
+        self.sources = {}
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.blobs = data["blobs"]
+                self.refs = data["refs"]
+                self.sources = data["sources"]
+        except (OSError, ValueError):
+            pass
+
+    def path(self, sha256):
+        return self.root / sha256[:2] / (sha256 + self.blobs[sha256]["ext"])
+
+    def url(self, sha256):
+        return f"{self.url_prefix}/{sha256[:2]}/{sha256}{self.blobs[sha256]['ext']}"
+
+    def has(self, sha256):
+        return sha256 in self.blobs and self.path(sha256).exists()
+
+    def _adopt(self, tmp, sha256, ext):
+        """Move a complete file into place under its hash. False if the blob was already stored."""
+        with self._lock:
+            if sha256 not in self.blobs:
+                self.blobs[sha256] = {"ext": ext, "bytes": tmp.stat().st_size, "dhash": None}
+                self.dirty = True
+            dest = self.path(sha256)
+            if dest.exists():
+                tmp.unlink()
+                return False
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, dest)
+            return True
+
+    def put_file(self, source):
+        """Store a copy of a local file. Returns (sha256, True if it was not stored yet)."""
+        source = Path(source)
+        sha256 = file_sha256(source)
+        if self.has(sha256):
+            return sha256, False
+        # A copy, not a hard link: editing the original in place must not alter the blob
+        tmp = self.root / '.incoming' / f"{sha256}.tmp"
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, tmp)
+        return sha256, self._adopt(tmp, sha256, _sniff_file(tmp))
+
+    def put_url(self, url, fetcher=None):
+        """Download url into the store unless its blob is already present.
+
+        Returns (sha256, status) with status 'current' (known URL, no
+        request made), 'duplicate' (downloaded, content already stored) or
+        'downloaded'. Interrupted downloads resume. Raises on HTTP errors.
+        """
+        with self._lock:
+            sha256 = self.sources.get(url)
+        if sha256 and self.has(sha256):
+            return sha256, 'current'
+        incoming = self.root / '.incoming' / hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        sha256 = download_file(url, incoming, fetcher)
+        new = self._adopt(incoming, sha256, _sniff_file(incoming))
+        with self._lock:
+            self.sources[url] = sha256
+            self.dirty = True
+        return sha256, 'downloaded' if new else 'duplicate'
+
+    def assign(self, key, sha256):
+        """Point key (a product-image slug) at a stored blob. True if that changed anything."""
+        with self._lock:
+            if self.refs.get(key) == sha256:
+                return False
+            self.refs[key] = sha256
+            self.dirty = True
+            return True
+
+    def resolve(self, key):
+        """The sha256 of key's blob if it is assigned and present, else None."""
+        sha256 = self.refs.get(key)
+        return sha256 if sha256 and self.has(sha256) else None
+
+    def shared(self):
+        """{sha256: [keys]} for blobs used by more than one key."""
+        users = {}
+        for key, sha256 in sorted(self.refs.items()):
+            users.setdefault(sha256, []).append(key)
+        return {sha256: keys for sha256, keys in users.items() if len(keys) > 1}
+
+    def hash_all(self, workers=None):
+        """Compute missing perceptual hashes on a process pool. Returns {sha256: dhash}."""
+        pending = [sha256 for sha256, blob in self.blobs.items()
+                   if blob["dhash"] is None and blob["ext"] != '.bin' and self.has(sha256)]
+        if pending:
+            from concurrent.futures import ProcessPoolExecutor
+            from aawheel.images import load_pillow
+            load_pillow()
+            paths = [str(self.path(sha256)) for sha256 in pending]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                values = executor.map(_dhash_or_none, paths, chunksize=max(1, len(paths) // 64))
+                for sha256, value in zip(pending, values):
+                    if value is None:
+                        print(f"✗ Could not hash {self.path(sha256)}")
+                        continue
+                    self.blobs[sha256]["dhash"] = value
+                    self.dirty = True
+        return {sha256: blob["dhash"] for sha256, blob in self.blobs.items() if blob["dhash"] is not None}
+
+    def near_duplicates(self, max_bits=NEAR_DUPLICATE_BITS, workers=None):
+        """[(sha256, sha256, distance)] for stored blobs that look alike."""
+        return _near_duplicates(self.hash_all(workers), max_bits)
+
+    def prune(self):
+        """Delete blobs no key references. Returns the removed paths."""
+        used = set(self.refs.values())
+        removed = []
+        for sha256 in [sha256 for sha256 in self.blobs if sha256 not in used]:
+            path = self.path(sha256)
+            if path.exists():
+                path.unlink()
+                removed.append(path)
+            del self.blobs[sha256]
+            self.dirty = True
+        self.sources = {url: sha256 for url, sha256 in self.sources.items() if sha256 in self.blobs}
+        return removed
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "blobs": self.blobs, "refs": self.refs,
+                       "sources": self.sources}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.index_path)
+        self.dirty = False
+
+def download_into(store, jobs, workers=8, fetcher=None):
+    """Download (url, key) jobs into store on a bounded pool and assign each key its blob.
+
+    Each URL is fetched once however many keys use it. Returns {key: status}
+    with status one of 'downloaded', 'current', 'duplicate' or 'failed'.
+    """
+    # Imported here so that opening a store (e.g. `python -m aawheel status`)
+    # loads neither requests nor multiprocessing
+    from concurrent.futures import ThreadPoolExecutor
+    from aawheel.fetch import get_fetcher
+
+    if fetcher is None:
+        fetcher = get_fetcher()
+    by_url = {}
+    for url, key in jobs:
+        by_url.setdefault(url, []).append(key)
+
+    def fetch(url):
+        try:
+            return url, *store.put_url(url, fetcher)
+        except Exception as e:
+            return url, None, e
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for url, sha256, status in executor.map(fetch, by_url):
+            for key in by_url[url]:
+                if sha256 is None:
+                    results[key] = 'failed'
+                    print(f"✗ Failed to download {key}: {status}")
+                    continue
+                store.assign(key, sha256)
+                results[key] = status
+                if status == 'duplicate':
+                    print(f"≡ {key}: already stored as {sha256[:12]}")
+                elif status == 'downloaded':
+                    print(f"✓ Downloaded {key}: {store.path(sha256)}")
+    store.save()
+    return results
@@ -0,0 +1,198 @@
+"""
+Persistent on-disk HTTP response cache.
+
+Bodies are stored under the SHA-256 of their URL together with their
+ETag/Last-Modified validators, so re-runs can send conditional GETs and
+skip unchanged pages. The cache is size-bounded with least-recently-used
+eviction and can also replay responses with no network at all (offline).
+
+The index is saved every SAVE_EVERY stores as well as on close, and files
+that a killed run left out of the index are deleted when the cache is
+opened, so the size limit holds across interrupted runs.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+DEFAULT_CACHE_DIR = '.cache/http'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+SAVE_EVERY = 50
+
+class OfflineCacheMiss(requests.ConnectionError):
+    """Raised in offline mode when a URL has never been cached."""
+
+def _atomic_write(path, data):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class ResponseCache:
+    """URL-keyed response store with conditional-GET validators and LRU eviction."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._index_path = self.directory / 'index.json'
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._unsaved = 0
+        self._index = {}
+        if self._index_path.exists():
+            try:
+                with open(self._index_path, encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        self._total = sum(entry['size'] for entry in self._index.values())
+        self._sweep()
+
+    def _sweep(self):
+        """Drop index entries without a body and files without an index entry."""
+        on_disk = set()
+        for item in os.scandir(self.directory):
+            if item.name == 'index.json' or not item.is_file():
+                continue
+            key = item.name.split('.', 1)[0]
+            if key not in self._index or item.name.endswith('.tmp'):
+                os.unlink(item.path)
+                self._dirty = True
+            elif item.name.endswith('.body'):
+                on_disk.add(key)
+        for key in set(self._index) - on_disk:
+            self._remove(key)
+            self._dirty = True
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key):
+        return self.directory / f"{key}.body"
+
+    def _derived_path(self, key, name):
+        return self.directory / f"{key}.{name}.json"
+
+    def lookup(self, url):
+        """Return the index entry for a URL, or None if it is not cached."""
+        with self._lock:
+            entry = self._index.get(self.key(url))
+            if entry and not self._body_path(self.key(url)).exists():
+                return None
+            return entry
+
+    def validators(self, url):
+        """Conditional request headers for a cached URL."""
+        entry = self.lookup(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def response(self, url, not_modified=False):
+        """Rebuild a requests.Response from the cached body, or None if it has been evicted since lookup()."""
+        key = self.key(url)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            entry['accessed'] = time.time()
+            self._dirty = True
+        try:
+            content = self._body_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = content
+        response.headers['Content-Type'] = entry.get('content_type', '')
+        if entry.get('etag'):
+            response.headers['ETag'] = entry['etag']
+        if entry.get('last_modified'):
+            response.headers['Last-Modified'] = entry['last_modified']
+        response.from_cache = True
+        response.not_modified = not_modified
+        return response
+
+    def store(self, url, response):
+        """Cache a 200 response body with its validators."""
+        key = self.key(url)
+        body = response.content
+        self.invalidate(url)
+        _atomic_write(self._body_path(key), body)
+        with self._lock:
+            previous = self._index.get(key)
+            if previous:
+                self._total -= previous['size']
+            self._index[key] = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_type': response.headers.get('Content-Type', ''),
+                'size': len(body),
+                'accessed': time.time()
+            }
+            self._total += len(body)
+            self._dirty = True
+            self._evict()
+            self._unsaved += 1
+            save = self._unsaved >= SAVE_EVERY
+        if save:
+            self.save()
+
+    def get_derived(self, url, name):
+        """Return data previously derived from this URL's cached body, if any."""
+        path = self._derived_path(self.key(url), name)
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put_derived(self, url, name, data):
+        """Store data derived from the cached body (dropped when the body changes)."""
+        key = self.key(url)
+        if key not in self._index:
+            return
+        _atomic_write(self._derived_path(key, name), json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    def _remove(self, key):
+        entry = self._index.pop(key, None)
+        if entry:
+            self._total -= entry['size']
+        for path in self.directory.glob(f"{key}.*"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda item: item[1]['accessed']):
+            self._remove(key)
+            if self._total <= self.max_bytes:
+                break
+
+    def invalidate(self, url):
+        """Drop everything derived from a URL whose body has changed."""
+        key = self.key(url)
+        for path in self.directory.glob(f"{key}.*.json"):
+            path.unlink(missing_ok=True)
+
+    def save(self):
+        """Persist the index if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            _atomic_write(self._index_path, json.dumps(self._index).encode('utf-8'))
+            self._dirty = False
+            self._unsaved = 0
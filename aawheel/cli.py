@@ -0,0 +1,227 @@
+"""
+Command-line entry point for the Python tooling: python -m aawheel <command>.
+
+    scrape   scrape the website (scrape_website.py, same options)
+    images   set up product images (scripts/setup_product_images.py, same
+             options); `images download ...` runs
+             scripts/download_facebook_images.py instead
+    status   report the scraped data, search index, binary catalog, shards,
+             product images and any unfinished crawl, offline
+    index    rebuild search_index.json, website_data.bin and the shards from
+             website_data.json without scraping
+
+Only this module and argparse are loaded before a command runs, and each
+command imports what it needs itself: requests, BeautifulSoup, Pillow and
+multiprocessing are loaded by the commands that use them and no others.
+`status` and `index` therefore start in a few tens of milliseconds, which
+benchmarks/bench_startup.py measures against a budget.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PROG = 'python -m aawheel'
+
+def load_script(name):
+    """Import scrape_website.py or a script in scripts/ as a module."""
+    for directory in (ROOT / 'scripts', ROOT):
+        if str(directory) not in sys.path:
+            sys.path.insert(0, str(directory))
+    return importlib.import_module(name)
+
+def run_script(name, prog, argv):
+    """Run a script's main() as if it had been started with argv."""
+    main = load_script(name).main
+    sys.argv = [prog, *argv]
+    return main()
+
+def scrape(args, rest):
+    return run_script('scrape_website', f"{PROG} scrape", rest)
+
+def images(args, rest):
+    if rest[:1] == ['download']:
+        return run_script('download_facebook_images', f"{PROG} images download", rest[1:])
+    return run_script('setup_product_images', f"{PROG} images", rest)
+
+def _age(path):
+    seconds = time.time() - path.stat().st_mtime
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{seconds / size:.0f}{unit} ago"
+    return "just now"
+
+def _outdated(path, expected):
+    """Why a file built from website_data needs rebuilding, or None.
+
+    Compares content rather than modification times, which a checkout or
+    copy does not preserve.
+    """
+    try:
+        with open(path, 'rb') as f:
+            actual = f.read()
+    except OSError:
+        return "is missing"
+    return None if actual == expected else "is out of date"
+
+def _crawl_counts(path):
+    """{status name: URLs} from a crawl frontier database, read-only."""
+    import sqlite3
+    from aawheel.frontier import DEFERRED, DONE, FAILED, IN_PROGRESS, QUEUED, SKIPPED
+    names = {QUEUED: "queued", IN_PROGRESS: "in progress", DONE: "done", FAILED: "failed", SKIPPED: "skipped",
+             DEFERRED: "waiting for robots.txt"}
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = db.execute('SELECT status, COUNT(*) FROM urls GROUP BY status').fetchall()
+    finally:
+        db.close()
+    return {names.get(status, str(status)): count for status, count in rows}
+
+def status(args, rest):
+    """Print the state of every output; returns 1 with --strict if anything committed needs attention.
+
+    website_data.bin is gitignored and the image store is not committed, so
+    on a clean checkout they are missing; they are reported but not counted.
+    """
+    from aawheel.blobs import BlobStore
+    from aawheel.models import Catalog, ValidationError, load_product_images
+    from aawheel.search import encode_search_index
+    from aawheel.shards import encode_shards, load_manifest, split_shards
+
+    lines = []
+    problems = 0
+    data_path = Path(args.data)
+    try:
+        with open(data_path, encoding='utf-8') as f:
+            website_data = json.load(f)
+    except (OSError, ValueError) as e:
+        lines.append(f"✗ Data: cannot read {data_path}: {e}")
+        problems += 1
+        website_data = None
+    if website_data is not None:
+        content = website_data.get("content", {})
+        pages = len(website_data.get("pages", [])) or 1
+        lines.append(f"✓ Data: {data_path} ({data_path.stat().st_size / 1024:.1f} KB, {pages} pages, "
+                     f"{len(content.get('products', []))} products, {len(content.get('testimonials', []))} testimonials, "
+                     f"scraped {_age(data_path)})")
+        try:
+            catalog = Catalog.from_website_data(website_data).to_bytes()
+        except ValidationError as e:
+            lines.append(f"✗ Data: {data_path} does not match the data model: {e}")
+            problems += 1
+            catalog = None
+        # (path, label, expected bytes, committed)
+        derived = [(data_path.with_name("search_index.json"), "Search index",
+                    encode_search_index(website_data).encode('utf-8'), True)]
+        if catalog is not None:
+            derived.append((data_path.with_suffix(".bin"), "Binary catalog", catalog, False))
+        for path, label, expected, committed in derived:
+            reason = _outdated(path, expected)
+            if reason:
+                lines.append(f"{'✗' if committed else '-'} {label}: {path} {reason} (run `{PROG} index`)")
+                if committed:
+                    problems += 1
+            else:
+                lines.append(f"✓ {label}: {path} ({len(expected) / 1024:.1f} KB)")
+        shards_dir = Path(args.shards_dir)
+        manifest = load_manifest(shards_dir)
+        if manifest is None:
+            lines.append(f"- Shards: none in {shards_dir}")
+        else:
+            expected = {key: filename for key, (filename, _) in encode_shards(split_shards(website_data)).items()}
+            listed = {key: entry["file"] for key, entry in manifest["shards"].items()}
+            missing = [filename for filename in listed.values() if not (shards_dir / filename).exists()]
+            if listed != expected:
+                lines.append(f"✗ Shards: {shards_dir} is out of date (run `{PROG} index`)")
+                problems += 1
+            elif missing:
+                lines.append(f"✗ Shards: {len(missing)} files in {shards_dir / 'manifest.json'} are missing (run `{PROG} index`)")
+                problems += 1
+            else:
+                lines.append(f"✓ Shards: {len(listed)} in {shards_dir}")
+
+    store = BlobStore(args.store)
+    entries = load_product_images()
+    absent = [entry.category for entry in entries if store.resolve(entry.slug) is None]
+    if absent:
+        lines.append(f"- Product images: {len(entries) - len(absent)}/{len(entries)} in {args.store}, "
+                     f"missing {', '.join(absent)} (run `{PROG} images`)")
+    else:
+        lines.append(f"✓ Product images: {len(entries)}/{len(entries)} in {args.store}")
+
+    state = Path(args.state)
+    if state.exists():
+        try:
+            counts = _crawl_counts(state)
+        except Exception as e:
+            lines.append(f"✗ Crawl: cannot read {state}: {e}")
+            problems += 1
+        else:
+            summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+            unfinished = counts.get("queued", 0) + counts.get("in progress", 0) + counts.get("waiting for robots.txt", 0)
+            if unfinished:
+                lines.append(f"- Crawl: {summary}; continue with `{PROG} scrape --crawl --resume`")
+            else:
+                lines.append(f"✓ Crawl: {summary}")
+
+    for line in lines:
+        print(line)
+    return 1 if args.strict and problems else 0
+
+def index(args, rest):
+    """Rebuild everything derived from website_data.json."""
+    from aawheel.models import Catalog, ValidationError
+    from aawheel.search import write_search_index
+    from aawheel.shards import size_report, write_shards
+
+    data_path = Path(args.data)
+    with open(data_path, encoding='utf-8') as f:
+        website_data = json.load(f)
+    try:
+        catalog = Catalog.from_website_data(website_data)
+    except ValidationError as e:
+        sys.exit(f"✗ {data_path} does not match the data model: {e}")
+    index_file = data_path.with_name("search_index.json")
+    index_size = write_search_index(website_data, index_file)
+    catalog_file = data_path.with_suffix(".bin")
+    catalog_size = catalog.write(catalog_file)
+    print(f"✓ Search index: {index_file} ({index_size / 1024:.1f} KB)")
+    print(f"✓ Binary catalog: {catalog_file} ({catalog_size / 1024:.1f} KB)")
+    if not args.no_shards:
+        manifest, previous = write_shards(website_data, args.shards_dir)
+        print(f"✓ Wrote {len(manifest['shards'])} shards to {args.shards_dir}")
+        for line in size_report(manifest, previous):
+            print(f"  {line}")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog=PROG, description='AA Wheel & Truck Supply Python tooling')
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+    # Options of scrape and images (including -h) belong to the scripts they run
+    commands.add_parser('scrape', add_help=False, help='Scrape the website (scrape_website.py options)')
+    commands.add_parser('images', add_help=False, help='Set up product images (setup_product_images.py options); '
+                        '`images download` runs download_facebook_images.py')
+
+    status_parser = commands.add_parser('status', help='Report the state of the scraped data, index, shards, images and crawl')
+    index_parser = commands.add_parser('index', help='Rebuild the search index, binary catalog and shards from website_data.json')
+    for command in (status_parser, index_parser):
+        command.add_argument('--data', default='website_data.json', help='Scraped data file (default: website_data.json)')
+        command.add_argument('--shards-dir', default='public/data', help='Shards directory (default: public/data)')
+    status_parser.add_argument('--store', default='public/images/blobs', help='Content-addressed image store (default: public/images/blobs)')
+    status_parser.add_argument('--state', default='.cache/crawl_frontier.sqlite', help='Crawl frontier database')
+    status_parser.add_argument('--strict', action='store_true', help='Exit with 1 if the data, search index or shards are missing or stale (for CI and pre-commit hooks)')
+    index_parser.add_argument('--no-shards', action='store_true', help='Do not rewrite the shards')
+    return parser
+
+COMMANDS = {"scrape": scrape, "images": images, "status": status, "index": index}
+
+def main(argv=None):
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    if rest and args.command not in ('scrape', 'images'):
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    return COMMANDS[args.command](args, rest)
@@ -0,0 +1,163 @@
+"""
+One-pass contact scanner.
+
+ContactScanner collects a page's strings, checks each for an address as it
+arrives, and finds phones and emails over the joined page text (so a number
+split across inline elements is still found), matching it in pieces so only
+a bounded tail of the text is ever held. Phones and emails are matched
+by two precompiled patterns whose hits are merged by offset: with Python's
+re this is faster than one alternation, which loses the per-pattern
+literal/charset prefilters. Results come back in page order, de-duplicated
+after normalization:
+
+    phone    E.164 (+1XXXXXXXXXX); numbers that are not valid NANP are dropped
+    email    lower-cased
+    address  the whole string, whitespace collapsed
+
+Each match carries the raw text and its offset in the page's string stream
+(all strings, including script/style/comment text, concatenated in document
+order).
+"""
+
+import bisect
+import heapq
+import re
+from typing import NamedTuple
+
+PHONE_PATTERN = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+
+PHONE_RE = re.compile(PHONE_PATTERN)
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+STREET_RE = re.compile(r'Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr', re.I)
+DIGIT_RE = re.compile(r'\d')
+NON_DIGIT_RE = re.compile(r'\D')
+SPACE_RE = re.compile(r'\s+')
+# No phone or email match can extend across whitespace that is not followed by a digit
+CUT_RE = re.compile(r'\s(?=\D)')
+# Characters of page text buffered before it is matched and dropped
+SCAN_CHUNK = 64 * 1024
+
+class ContactMatch(NamedTuple):
+    value: str
+    raw: str
+    offset: int
+
+def normalize_phone(raw):
+    """E.164 form of a 10-digit NANP number, or None if it cannot be one."""
+    digits = NON_DIGIT_RE.sub('', raw)
+    if len(digits) != 10 or digits[0] in '01' or digits[3] in '01':
+        return None
+    return '+1' + digits
+
+def normalize_email(raw):
+    return raw.lower()
+
+def looks_like_address(string):
+    """Same test as re.search(r'\\d+.*(Street|St|...)', string, re.I), in linear time."""
+    digit = DIGIT_RE.search(string)
+    if digit is None:
+        return False
+    if '\n' not in string:
+        return STREET_RE.search(string, digit.end()) is not None
+    for line in string.split('\n'):
+        digit = DIGIT_RE.search(line)
+        if digit and STREET_RE.search(line, digit.end()):
+            return True
+    return False
+
+class ContactScanner:
+    """Feed page strings in document order, then scan() once.
+
+    Page text is matched in pieces as it arrives, so only the text since
+    the last safe cut is held, however large the page. A cut goes after a
+    whitespace character that is not followed by a digit: emails contain no
+    whitespace and phones only before a digit, so no match (and no attempt
+    at one) crosses it, and the results equal a scan of the joined text.
+    """
+
+    def __init__(self):
+        self._text = []
+        # (buffer offset, stream offset) where each buffered string starts
+        self._segments = []
+        self._text_length = 0
+        self._scan_at = SCAN_CHUNK
+        self._offset = 0
+        self._found = {"phone": [], "email": []}
+        self._seen = set()
+        self.addresses = []
+        self._seen_addresses = set()
+
+    def feed(self, string, is_text=True):
+        if is_text:
+            self._segments.append((self._text_length, self._offset))
+            self._text.append(string)
+            self._text_length += len(string)
+            if self._text_length >= self._scan_at:
+                self._scan_buffer(final=False)
+        if looks_like_address(string):
+            value = SPACE_RE.sub(' ', string).strip()
+            if value not in self._seen_addresses:
+                self._seen_addresses.add(value)
+                self.addresses.append(ContactMatch(value, string.strip(), self._offset))
+        self._offset += len(string)
+
+    def _stream_offset(self, text_offset):
+        i = bisect.bisect_right(self._segments, (text_offset, float('inf'))) - 1
+        start, stream_start = self._segments[i]
+        return stream_start + text_offset - start
+
+    def _matches(self, text, end):
+        """(start, kind, raw) for every email and phone in text[:end], in offset order.
+
+        Phones inside an email (8162219556@aawheel.com) are not reported.
+        """
+        emails = [(m.start(), "email", m.group()) for m in EMAIL_RE.finditer(text, 0, end)]
+        email_starts = [start for start, _, _ in emails]
+        email_ends = [start + len(raw) for start, _, raw in emails]
+        phones = []
+        for m in PHONE_RE.finditer(text, 0, end):
+            i = bisect.bisect_right(email_starts, m.start()) - 1
+            if i < 0 or m.start() >= email_ends[i]:
+                phones.append((m.start(), "phone", m.group()))
+        return heapq.merge(emails, phones)
+
+    def _scan_buffer(self, final):
+        """Match the buffered text up to its last cut (all of it if final) and drop that part."""
+        text = ''.join(self._text)
+        cut = len(text)
+        if not final:
+            cut = 0
+            for m in CUT_RE.finditer(text, max(0, len(text) - SCAN_CHUNK // 2)):
+                cut = m.end()
+        if cut:
+            normalizers = {"phone": normalize_phone, "email": normalize_email}
+            for start, kind, raw in self._matches(text, cut):
+                value = normalizers[kind](raw)
+                if value is None or value in self._seen:
+                    continue
+                self._seen.add(value)
+                self._found[kind].append(ContactMatch(value, raw, self._stream_offset(start)))
+            i = bisect.bisect_right(self._segments, (cut, float('inf'))) - 1
+            start, stream_start = self._segments[i]
+            self._segments = [(0, stream_start + cut - start)] + [
+                (start - cut, stream_start) for start, stream_start in self._segments[i + 1:]]
+            text = text[cut:]
+        self._text = [text] if text else []
+        self._text_length = len(text)
+        # With no cut in sight, wait for a chunk more text rather than re-joining on every string
+        self._scan_at = self._text_length + SCAN_CHUNK
+
+    def scan(self):
+        """{'phone': [...], 'email': [...], 'address': [...]} of ContactMatch, in page order."""
+        if self._text:
+            self._scan_buffer(final=True)
+        found = {kind: list(matches) for kind, matches in self._found.items()}
+        found["address"] = list(self.addresses)
+        return found
+
+def scan_text(text):
+    """Scan a single string (e.g. already extracted page text)."""
+    scanner = ContactScanner()
+    scanner.feed(text)
+    return scanner.scan()
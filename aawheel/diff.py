@@ -0,0 +1,133 @@
+"""
+Structured diff between two versions of website_data.
+
+Products (keyed by name) and testimonials (keyed by author and date) are
+reported item by item as added, removed or changed, with the fields that
+changed. Several items may share a key (scraped testimonials have no date,
+and one author can leave several reviews); those are told apart by their
+content and, for testimonials, their text. Any other top-level or content
+section that differs is listed by name. "rebuild" is true whenever anything
+the site is built from changed.
+
+A crawl merges pages in the order they complete, so for crawled data the
+order of the merged lists is not compared.
+"""
+
+import json
+
+# (content field, item key) of the lists diffed item by item
+ITEM_KEYS = {
+    "products": lambda product: product.get("name"),
+    "testimonials": lambda testimonial: [testimonial.get("author"), testimonial.get("date")]
+}
+
+# Second key for items that share their ITEM_KEYS key
+TIEBREAK_KEYS = {
+    "testimonials": lambda testimonial: testimonial.get("text")
+}
+
+# Lists whose order depends on crawl completion order
+MERGED_LISTS = [
+    ("pages",),
+    ("content", "sections"), ("content", "products"), ("content", "testimonials"),
+    ("contact", "phone"), ("contact", "email"), ("contact", "address")
+]
+
+def canonical(website_data):
+    """Copy of website_data with the crawl-merged lists sorted."""
+    data = json.loads(json.dumps(website_data))
+    for path in MERGED_LISTS:
+        parent = data
+        for part in path[:-1]:
+            parent = parent.get(part) if isinstance(parent, dict) else None
+        if isinstance(parent, dict) and isinstance(parent.get(path[-1]), list):
+            parent[path[-1]].sort(key=lambda item: json.dumps(item, sort_keys=True))
+    return data
+
+def _group(items, key):
+    groups = {}
+    for item in items:
+        groups.setdefault(repr(key(item)), []).append(item)
+    return groups
+
+def _pairs(old, new, tiebreak, lone_pair=True):
+    """Match the items of one key: identical items, then equal tiebreak keys.
+
+    With lone_pair, a single old and a single new item are a change
+    whatever their tiebreak keys. Returns (pairs of changed items,
+    removed, added).
+    """
+    if lone_pair and len(old) == 1 and len(new) == 1:
+        return ([] if old[0] == new[0] else [(old[0], new[0])]), [], []
+    old = list(old)
+    unmatched = []
+    for item in new:
+        if item in old:
+            old.remove(item)
+        else:
+            unmatched.append(item)
+    new = unmatched
+    pairs = []
+    if tiebreak is not None:
+        by_tiebreak = _group(new, tiebreak)
+        for previous in list(old):
+            candidates = by_tiebreak.get(repr(tiebreak(previous)))
+            if candidates:
+                item = candidates.pop(0)
+                pairs.append((previous, item))
+                old.remove(previous)
+                new.remove(item)
+    return pairs, old, new
+
+def diff_items(old, new, key, tiebreak=None):
+    """{"added": [...], "removed": [...], "changed": [{"key", "fields"}]} of two item lists.
+
+    An item that is the only one with its non-empty key on both sides
+    (e.g. an author's only review) is a change. Items sharing a key are
+    matched by content, then by tiebreak, and any left over are reported
+    as removed and added.
+    """
+    before, after = _group(old, key), _group(new, key)
+    added, removed, changed = [], [], []
+    for name in list(before) + [name for name in after if name not in before]:
+        items = before.get(name) or after[name]
+        value = key(items[0])
+        identified = any(value) if isinstance(value, list) else bool(value)
+        pairs, gone, new_items = _pairs(before.get(name, []), after.get(name, []), tiebreak, identified)
+        removed += gone
+        added += new_items
+        for previous, item in pairs:
+            fields = {field: [previous.get(field), item.get(field)]
+                      for field in sorted(set(previous) | set(item)) if previous.get(field) != item.get(field)}
+            changed.append({"key": key(item), "fields": fields})
+    return {"added": added, "removed": removed, "changed": changed}
+
+def diff_website_data(old, new, ordered=True):
+    """Diff two website_data dicts; old may be None (no previous data).
+
+    With ordered=False (crawled data) list order is ignored.
+    """
+    old = old or {}
+    if not ordered:
+        old, new = canonical(old), canonical(new)
+    old_content = old.get("content", {})
+    new_content = new.get("content", {})
+    diff = {field: diff_items(old_content.get(field, []), new_content.get(field, []), key, TIEBREAK_KEYS.get(field))
+            for field, key in ITEM_KEYS.items()}
+    sections = [section for section in sorted(set(old) | set(new))
+                if section != "content" and old.get(section) != new.get(section)]
+    sections += [f"content.{section}" for section in sorted(set(old_content) | set(new_content))
+                 if section not in ITEM_KEYS and old_content.get(section) != new_content.get(section)]
+    diff["sections"] = sections
+    diff["rebuild"] = not old or old != new
+    return diff
+
+def summary_lines(diff):
+    lines = []
+    for field in ITEM_KEYS:
+        counts = {change: len(items) for change, items in diff[field].items()}
+        if any(counts.values()):
+            lines.append(f"{field}: +{counts['added']} -{counts['removed']} ~{counts['changed']}")
+    if diff["sections"]:
+        lines.append(f"sections changed: {', '.join(diff['sections'])}")
+    return lines
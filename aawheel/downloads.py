@@ -0,0 +1,109 @@
+"""
+Resumable file downloads.
+
+download_file() streams into a `.part` file, resumes it with an HTTP Range
+request when a previous attempt was interrupted, and renames it into place
+only once complete. The response's ETag or Last-Modified is kept next to
+the `.part` file and sent as If-Range, so a file that changed on the
+server is downloaded again instead of being spliced onto stale bytes. file_sha256() hashes a file in chunks. The image store
+(aawheel/blobs.py) builds its batch downloads on both.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+CHUNK_SIZE = 256 * 1024
+CONTENT_RANGE_RE = re.compile(r'bytes (\d+)-\d+/(?:\d+|\*)$')
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _validator(response):
+    """The response's If-Range validator: a strong ETag, else Last-Modified."""
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+def _continues(response, offset, validator):
+    """True if a 206 is the rest of the same file, starting at offset.
+
+    Servers that ignore If-Range answer with the current file's range, so
+    its validator is checked as well.
+    """
+    match = CONTENT_RANGE_RE.match(response.headers.get('Content-Range', ''))
+    current = response.headers.get('ETag' if validator.startswith('"') else 'Last-Modified')
+    return match is not None and int(match.group(1)) == offset and current in (None, validator)
+
+def download_file(url, dest, fetcher=None, timeout=30):
+    """Download url to dest via dest.part, resuming a partial file.
+
+    A partial file is only resumed if its validator was saved and the
+    server answers 206 from exactly where it stopped; otherwise it is
+    downloaded from scratch. Returns the SHA-256 of the complete file.
+    Raises on HTTP errors.
+    """
+    # Imported here so that file_sha256() users (the image store) do not load requests
+    from aawheel.fetch import get_fetcher
+
+    if fetcher is None:
+        fetcher = get_fetcher()
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    part = dest.with_name(dest.name + '.part')
+    state = dest.with_name(dest.name + '.part.json')
+
+    try:
+        with open(state, encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    offset = part.stat().st_size if part.exists() else 0
+    headers = {}
+    if offset and saved.get("url") == url and saved.get("validator"):
+        headers = {'Range': f'bytes={offset}-', 'If-Range': saved["validator"]}
+    else:
+        offset = 0
+
+    digest = hashlib.sha256()
+    response = fetcher.get(url, stream=True, timeout=timeout, headers=headers)
+    with response:
+        if response.status_code == 416 and offset:
+            # The partial file is stale or already complete; start over
+            part.unlink()
+            state.unlink(missing_ok=True)
+            return download_file(url, dest, fetcher, timeout)
+        response.raise_for_status()
+
+        if offset and response.status_code == 206 and _continues(response, offset, saved["validator"]):
+            with open(part, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            mode = 'ab'
+        elif response.status_code == 206:
+            # Not the rest of the .part file (or a range nobody asked for)
+            response.close()
+            part.unlink(missing_ok=True)
+            state.unlink(missing_ok=True)
+            if not offset:
+                raise OSError(f"{url}: unexpected partial response ({response.headers.get('Content-Range')})")
+            return download_file(url, dest, fetcher, timeout)
+        else:
+            # A full body: the file changed since the .part was written, or this is a first attempt
+            mode = 'wb'
+            with open(state, 'w', encoding='utf-8') as f:
+                json.dump({"url": url, "validator": _validator(response)}, f)
+        with open(part, mode) as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+    os.replace(part, dest)
+    state.unlink(missing_ok=True)
+    return digest.hexdigest()
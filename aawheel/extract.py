@@ -0,0 +1,504 @@
+"""
+Single-pass extraction engine.
+
+The parsed document is walked exactly once. Every element start, element
+end and text node is dispatched to the registered extractors (navigation,
+title/hero, sections, products, reviews, contacts, social, crawl links),
+which together produce the same output as the original find_all()-based
+extract_* functions in scrape_website.py.
+
+Extractors only see tag names, attribute dicts and strings, never parser
+objects, so they do not depend on the parse tree implementation. What they
+look for comes from aawheel.rules: the engine matches each element against
+the compiled rules once and hands every extractor the names of the
+matchers it satisfies.
+
+Given a stats dict, the engine also counts elements and times every
+extractor's handlers (used for the scraper's --metrics output).
+"""
+
+import time
+from urllib.parse import urljoin
+
+from aawheel.contact import ContactScanner
+from aawheel.rules import default_rules
+
+# String kinds passed to Extractor.text(). Only TEXT counts towards
+# get_text(); OTHER covers comments, doctypes, script/style/template bodies.
+TEXT = 'text'
+OTHER = 'other'
+
+def class_string(attrs):
+    """Lower-cased, space-joined class attribute ('' when absent)."""
+    value = attrs.get('class')
+    if not value:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return ' '.join(value).lower()
+    return value.lower()
+
+class Extractor:
+    """Base class for extractors fed by ExtractionEngine.
+
+    Subclasses override any of start(), end() and text(); the engine only
+    dispatches the events a subclass actually overrides. start() receives
+    the names of the rules matchers the element satisfies (see
+    aawheel.rules.Rules.match).
+    """
+
+    engine = None
+
+    def start(self, name, attrs, matched, depth):
+        pass
+
+    def end(self, name, depth):
+        pass
+
+    def text(self, string, kind):
+        pass
+
+    def result(self):
+        raise NotImplementedError
+
+class ExtractionEngine:
+    """Dispatches one walk over a document to many extractors.
+
+    With stats, fills stats["elements"] and stats["extractors"] (seconds
+    spent in each extractor class, including result()). Elements are
+    matched against rules (the default rules if None), which should be the
+    ones the extractors were built with.
+    """
+
+    def __init__(self, extractors, stats=None, rules=None):
+        self.extractors = list(extractors)
+        self._match = (rules or default_rules()).match
+        for extractor in self.extractors:
+            extractor.engine = self
+        self.stats = stats
+        if stats is not None:
+            stats["elements"] = 0
+            stats.setdefault("extractors", {})
+            self.start = self._counted_start
+        self._starts = self._overridden('start')
+        self._ends = self._overridden('end')
+        self._texts = self._overridden('text')
+        self._captures = []
+
+    def _overridden(self, method):
+        base = getattr(Extractor, method)
+        return [self._timed(ex, getattr(ex, method)) for ex in self.extractors
+                if getattr(type(ex), method) is not base]
+
+    def _timed(self, extractor, handler):
+        if self.stats is None:
+            return handler
+        seconds = self.stats["extractors"]
+        name = type(extractor).__name__
+        seconds.setdefault(name, 0.0)
+        clock = time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            result = handler(*args)
+            seconds[name] += clock() - start
+            return result
+        return timed
+
+    def capture(self, depth, callback):
+        """Collect the stripped text of the element opened at `depth`.
+
+        callback receives the equivalent of element.get_text(strip=True)
+        when the element closes.
+        """
+        self._captures.append((depth, [], callback))
+
+    def start(self, name, attrs, depth):
+        matched = self._match(name, class_string(attrs))
+        for handler in self._starts:
+            handler(name, attrs, matched, depth)
+
+    def _counted_start(self, name, attrs, depth):
+        self.stats["elements"] += 1
+        ExtractionEngine.start(self, name, attrs, depth)
+
+    def end(self, name, depth):
+        captures = self._captures
+        while captures and captures[-1][0] == depth:
+            _, parts, callback = captures.pop()
+            callback(''.join(parts))
+        for handler in self._ends:
+            handler(name, depth)
+
+    def text(self, string, kind):
+        if kind is TEXT and self._captures:
+            stripped = string.strip()
+            if stripped:
+                for _, parts, _ in self._captures:
+                    parts.append(stripped)
+        for handler in self._texts:
+            handler(string, kind)
+
+    def feed_soup(self, soup):
+        """Walk a BeautifulSoup tree once, in document order."""
+        from bs4.element import CData, NavigableString, Tag
+
+        main_string_types = (NavigableString, CData)
+        start, end, text = self.start, self.end, self.text
+        stack = [iter(soup.contents)]
+        names = []
+        while stack:
+            for node in stack[-1]:
+                if isinstance(node, Tag):
+                    start(node.name, node.attrs, len(names))
+                    names.append(node.name)
+                    stack.append(iter(node.contents))
+                    break
+                text(node, TEXT if type(node) in main_string_types else OTHER)
+            else:
+                stack.pop()
+                if names:
+                    end(names.pop(), len(names))
+
+    def results(self):
+        return [self._timed(extractor, extractor.result)() for extractor in self.extractors]
+
+class _Link:
+    __slots__ = ('href', 'text')
+
+    def __init__(self, href):
+        self.href = href
+        self.text = ''
+
+class NavigationExtractor(Extractor):
+    """Header links (unless a menu list exists) and the first footer links."""
+
+    def __init__(self, base_url, rules=None):
+        rules = (rules or default_rules())["navigation"]
+        self.base_url = base_url
+        self.footer_limit = rules["footer_limit"]
+        self.has_nav = False
+        # One header per "headers" matcher: the first element matching each.
+        # The earliest matcher that found one wins, wherever they are.
+        self.header_names = [f"navigation.headers.{index}" for index in range(len(rules["headers"]))]
+        self.header_depths = [None] * len(self.header_names)
+        self.header_links = [None] * len(self.header_names)
+        self.footer_depth = None
+        self.footer_links = None
+
+    def _link(self, attrs, depth, links):
+        link = _Link(attrs['href'])
+        links.append(link)
+        self.engine.capture(depth, lambda text: setattr(link, 'text', text))
+
+    def _open_header(self, matched, depth):
+        for index, header in enumerate(self.header_names):
+            if header in matched and self.header_links[index] is None:
+                self.header_depths[index] = depth
+                self.header_links[index] = []
+                return True
+        return False
+
+    def start(self, name, attrs, matched, depth):
+        if not self.has_nav and 'navigation.menus' in matched:
+            self.has_nav = True
+        if matched and self._open_header(matched, depth):
+            return
+        if 'navigation.footer' in matched and self.footer_links is None:
+            self.footer_depth = depth
+            self.footer_links = []
+        elif name == 'a' and 'href' in attrs:
+            for index, header_depth in enumerate(self.header_depths):
+                if header_depth is not None:
+                    self._link(attrs, depth, self.header_links[index])
+            if self.footer_depth is not None and len(self.footer_links) < self.footer_limit:
+                self._link(attrs, depth, self.footer_links)
+
+    def end(self, name, depth):
+        if depth in self.header_depths:
+            self.header_depths = [None if header_depth == depth else header_depth for header_depth in self.header_depths]
+        if depth == self.footer_depth:
+            self.footer_depth = None
+
+    def result(self):
+        nav = {"main": [], "footer": []}
+        if not self.has_nav:
+            links = next((links for links in self.header_links if links is not None), None)
+            for link in links or []:
+                if link.text and link.href:
+                    nav["main"].append({"text": link.text, "href": urljoin(self.base_url, link.href)})
+        for link in self.footer_links or []:
+            if link.text and link.href and not link.href.startswith('#'):
+                nav["footer"].append({"text": link.text, "href": urljoin(self.base_url, link.href)})
+        return nav
+
+class HeroExtractor(Extractor):
+    """Page title, plus hero text and tagline from the first heading when no hero block exists."""
+
+    def __init__(self):
+        self.title = None
+        self.has_hero = False
+        self.h1 = None
+        self.tagline = None
+        self.seen_h1 = False
+        self.seen_p = False
+
+    def _set(self, field):
+        return lambda text: setattr(self, field, text)
+
+    def start(self, name, attrs, matched, depth):
+        if name == 'title':
+            if self.title is None:
+                self.title = ''
+                self.engine.capture(depth, self._set('title'))
+        elif 'hero.heading' in matched:
+            if not self.seen_h1:
+                self.seen_h1 = True
+                self.engine.capture(depth, self._set('h1'))
+        elif 'hero.tagline' in matched:
+            if self.seen_h1 and not self.seen_p:
+                self.seen_p = True
+                self.engine.capture(depth, self._set('tagline'))
+        if not self.has_hero and 'hero.block' in matched:
+            self.has_hero = True
+
+    def result(self):
+        content = {"title": self.title or "", "tagline": "", "hero": ""}
+        if not self.has_hero and self.h1 is not None:
+            content["hero"] = self.h1
+            if self.tagline is not None:
+                content["tagline"] = self.tagline
+        return content
+
+class _Container:
+    """One matched block and the state of its first-descendant lookups."""
+
+    __slots__ = ('depth', 'heading', 'found_heading', 'paragraphs', 'author', 'full_text')
+
+    def __init__(self, depth):
+        self.depth = depth
+        self.heading = None
+        self.found_heading = False
+        self.paragraphs = []
+        self.author = None
+        self.full_text = None
+
+class BlockExtractor(Extractor):
+    """Collects the first rules[section]["limit"] elements matching its "block" matcher.
+
+    Subclasses react to descendants of each open match in descendant().
+    """
+
+    section = None
+
+    def __init__(self, rules=None):
+        self.rules = (rules or default_rules())[self.section]
+        self.block_name = f"{self.section}.block"
+        self.limit = self.rules["limit"]
+        self.matched = 0
+        self.open = []
+        self.blocks = []
+
+    def start(self, name, attrs, matched, depth):
+        for block in self.open:
+            self.descendant(block, name, matched, depth)
+        if self.matched < self.limit and self.block_name in matched:
+            self.matched += 1
+            block = _Container(depth)
+            self.open.append(block)
+            self.blocks.append(block)
+            self.opened(block)
+
+    def end(self, name, depth):
+        if self.open and self.open[-1].depth == depth:
+            self.open.pop()
+
+    def opened(self, block):
+        pass
+
+    def descendant(self, block, name, matched, depth):
+        raise NotImplementedError
+
+    def _set(self, block, field):
+        return lambda text: setattr(block, field, text)
+
+class SectionExtractor(BlockExtractor):
+    """Heading plus first paragraphs of the first section blocks."""
+
+    section = "sections"
+
+    def descendant(self, block, name, matched, depth):
+        if 'sections.heading' in matched and not block.found_heading:
+            block.found_heading = True
+            self.engine.capture(depth, self._set(block, 'heading'))
+        elif 'sections.paragraph' in matched and len(block.paragraphs) < self.rules["paragraph_limit"]:
+            index = len(block.paragraphs)
+            block.paragraphs.append('')
+            self.engine.capture(depth, lambda text: block.paragraphs.__setitem__(index, text))
+
+    def result(self):
+        sections = []
+        for block in self.blocks:
+            if block.found_heading:
+                content = " ".join(block.paragraphs)
+                if content:
+                    sections.append({"heading": block.heading, "content": content})
+        return sections
+
+class ProductExtractor(BlockExtractor):
+    """Name and description of the first product blocks."""
+
+    section = "products"
+
+    def descendant(self, block, name, matched, depth):
+        if 'products.name' in matched and not block.found_heading:
+            block.found_heading = True
+            self.engine.capture(depth, self._set(block, 'heading'))
+        elif 'products.description' in matched and not block.paragraphs:
+            block.paragraphs.append('')
+            self.engine.capture(depth, lambda text: block.paragraphs.__setitem__(0, text))
+
+    def result(self):
+        products = []
+        for block in self.blocks:
+            if block.found_heading:
+                products.append({
+                    "name": block.heading,
+                    "description": block.paragraphs[0] if block.paragraphs else ""
+                })
+        return products
+
+class ReviewExtractor(BlockExtractor):
+    """Author and (truncated) text of the first review blocks."""
+
+    section = "testimonials"
+
+    def opened(self, block):
+        # Falls back to the whole block's text when it has no text element
+        self.engine.capture(block.depth, self._set(block, 'full_text'))
+
+    def descendant(self, block, name, matched, depth):
+        if block.author is None and 'testimonials.author' in matched:
+            block.author = ''
+            self.engine.capture(depth, self._set(block, 'author'))
+        if 'testimonials.text' in matched and not block.paragraphs:
+            block.paragraphs.append('')
+            self.engine.capture(depth, lambda text: block.paragraphs.__setitem__(0, text))
+
+    def result(self):
+        testimonials = []
+        for block in self.blocks:
+            if block.author is not None:
+                text = block.paragraphs[0] if block.paragraphs else block.full_text
+                testimonials.append({"author": block.author, "text": text[:self.rules["text_limit"]]})
+        return testimonials
+
+class ContactExtractor(Extractor):
+    """First phones (E.164), emails and addresses in page order (see aawheel.contact)."""
+
+    def __init__(self, rules=None):
+        self.limit = (rules or default_rules())["contact"]["limit"]
+        self.scanner = ContactScanner()
+
+    def text(self, string, kind):
+        self.scanner.feed(string, kind is TEXT)
+
+    def result(self):
+        found = self.scanner.scan()
+        limit = self.limit
+        return {
+            "phone": [match.value for match in found["phone"][:limit]],
+            "email": [match.value for match in found["email"][:limit]],
+            "address": [match.raw for match in found["address"][:limit]],
+            "locations": []
+        }
+
+class SocialExtractor(Extractor):
+    """Links to known social networks (the last link per network wins)."""
+
+    def __init__(self, base_url, rules=None):
+        self.base_url = base_url
+        self.networks = (rules or default_rules())["social"]["networks"]
+        self.social = {}
+
+    def start(self, name, attrs, matched, depth):
+        if name == 'a' and 'href' in attrs:
+            href = attrs['href']
+            lowered = href.lower()
+            for keyword in self.networks:
+                if keyword in lowered:
+                    self.social[keyword] = urljoin(self.base_url, href)
+                    break
+
+    def result(self):
+        return self.social
+
+class LinkExtractor(Extractor):
+    """Raw hrefs to crawl: anchors inside link containers (nav/header/footer), or every anchor."""
+
+    def __init__(self, all_anchors=False):
+        self.all_anchors = all_anchors
+        self.container_depths = []
+        self.hrefs = []
+
+    def start(self, name, attrs, matched, depth):
+        if 'links.containers' in matched:
+            self.container_depths.append(depth)
+        elif name == 'a' and 'href' in attrs and (self.all_anchors or self.container_depths):
+            self.hrefs.append(attrs['href'])
+
+    def end(self, name, depth):
+        if self.container_depths and self.container_depths[-1] == depth:
+            self.container_depths.pop()
+
+    def result(self):
+        return self.hrefs
+
+def content_extractors(rules=None):
+    return [HeroExtractor(), SectionExtractor(rules), ProductExtractor(rules), ReviewExtractor(rules)]
+
+def assemble_content(hero, sections, products, testimonials):
+    """Build the extract_content() dict from the content extractors' results."""
+    return {
+        "title": hero["title"],
+        "tagline": hero["tagline"],
+        "hero": hero["hero"],
+        "sections": sections,
+        "features": [],
+        "products": products,
+        "testimonials": testimonials
+    }
+
+def run(document, extractors, stats=None, rules=None):
+    """Walk a parsed page once with the given extractors and return their results.
+
+    document is a BeautifulSoup tree or an aawheel.parsers.ParsedPage.
+    """
+    from aawheel.parsers import ParsedPage
+
+    engine = ExtractionEngine(extractors, stats, rules)
+    # Not hasattr(): attribute access on a BeautifulSoup tag is a child-tag search
+    if isinstance(document, ParsedPage):
+        document.walk(engine)
+    else:
+        engine.feed_soup(document)
+    return engine.results()
+
+def extract_all(document, base_url, all_anchors=False, stats=None, rules=None):
+    """Run every extractor in a single pass, with rules (aawheel.rules) or the default ones.
+
+    Returns navigation, content, contact, social and the raw crawl hrefs.
+    """
+    nav, hero, sections, products, testimonials, contact, social, hrefs = run(document, [
+        NavigationExtractor(base_url, rules),
+        *content_extractors(rules),
+        ContactExtractor(rules),
+        SocialExtractor(base_url, rules),
+        LinkExtractor(all_anchors)
+    ], stats, rules)
+    return {
+        "navigation": nav,
+        "content": assemble_content(hero, sections, products, testimonials),
+        "contact": contact,
+        "social": social,
+        "hrefs": hrefs
+    }
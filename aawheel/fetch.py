@@ -0,0 +1,355 @@
+"""
+Shared HTTP fetch layer.
+
+One pooled requests.Session with keep-alive connections and a per-host
+concurrency limit, plus an asyncio API on top of it so large URL batches
+reuse connections (and TLS sessions) instead of reconnecting per request.
+An optional ResponseCache turns plain GETs into conditional GETs and an
+optional HostScheduler paces requests per host. With a Metrics registry,
+every request records DNS, connect, TLS, TTFB and download times.
+
+Network requests are retried with backoff, fail fast while their host's
+circuit breaker is open and can be hedged (see aawheel/resilience.py).
+"""
+
+import asyncio
+import functools
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+from aawheel.cache import OfflineCacheMiss
+from aawheel.resilience import (CircuitBreakers, CircuitOpenError, HedgePolicy, RetryPolicy, is_failure,
+                                parse_retry_after)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_TIMEOUT = 15
+
+class _TimedConnectionMixin:
+    """Times DNS and TCP connect (and TLS for HTTPS) of new connections.
+
+    The hostname is resolved here and urllib3 connects to the resulting
+    addresses, so resolution and connecting are measured separately. The
+    time spent setting up connections is also added to a per-thread total
+    so Fetcher can separate it from the time to first byte.
+    """
+
+    metrics = None
+    setup = None
+
+    def _new_conn(self):
+        host = self._dns_host
+        labels = {"host": self.host}
+        start = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)))
+        except OSError:
+            # Let urllib3 resolve again and raise its own error
+            addresses = [host]
+        resolved = time.perf_counter()
+        self.metrics.observe("fetch_dns_seconds", resolved - start, **labels)
+        try:
+            for i, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError:
+                    if i == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+        connected = time.perf_counter()
+        self.metrics.observe("fetch_connect_seconds", connected - resolved, **labels)
+        self.setup.seconds = getattr(self.setup, 'seconds', 0.0) + connected - start
+        return sock
+
+class _TimedHTTPSConnectionMixin(_TimedConnectionMixin):
+
+    def connect(self):
+        start = time.perf_counter()
+        before = getattr(self.setup, 'seconds', 0.0)
+        super().connect()
+        elapsed = time.perf_counter() - start
+        handshake = elapsed - (getattr(self.setup, 'seconds', 0.0) - before)
+        self.metrics.observe("fetch_tls_seconds", handshake, host=self.host)
+        self.setup.seconds = getattr(self.setup, 'seconds', 0.0) + handshake
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools use the timed connection classes."""
+
+    def __init__(self, metrics, setup, **kwargs):
+        attrs = {"metrics": metrics, "setup": setup}
+        http = type('TimedHTTPConnection', (_TimedConnectionMixin, HTTPConnection), attrs)
+        https = type('TimedHTTPSConnection', (_TimedHTTPSConnectionMixin, HTTPSConnection), attrs)
+        self._pool_classes = {
+            'http': type('TimedHTTPConnectionPool', (HTTPConnectionPool,), {"ConnectionCls": http}),
+            'https': type('TimedHTTPSConnectionPool', (HTTPSConnectionPool,), {"ConnectionCls": https})
+        }
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+
+class Fetcher:
+    """Keep-alive HTTP client shared by the scraper and image scripts.
+
+    pool_size bounds the number of hosts kept in the pool and the number of
+    in-flight async requests; per_host bounds concurrent requests (and
+    pooled connections) to any single host. With a cache, non-streaming GETs
+    are revalidated with If-None-Match/If-Modified-Since and a 304 is served
+    from disk; offline=True serves only from the cache. With a scheduler,
+    every network request first waits for its host's rate limit. With a
+    metrics registry, network requests record per-stage timings and bytes.
+
+    retry, breakers and hedge take a RetryPolicy, CircuitBreakers and
+    HedgePolicy; True uses one with default settings and False/None turns
+    the feature off. Retries and circuit breakers are on by default,
+    hedging (which can double the load on slow hosts) is off.
+    """
+
+    def __init__(self, pool_size=32, per_host=6, timeout=DEFAULT_TIMEOUT, headers=None,
+                 cache=None, offline=False, scheduler=None, metrics=None, retry=True, breakers=True, hedge=False):
+        self.pool_size = pool_size
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.retry = RetryPolicy() if retry is True else retry or None
+        self.breakers = CircuitBreakers() if breakers is True else breakers or None
+        self.hedge = HedgePolicy() if hedge is True else hedge or None
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        if headers:
+            self.session.headers.update(headers)
+        if metrics is None:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=per_host)
+        else:
+            self._setup = threading.local()
+            adapter = TimedHTTPAdapter(metrics, self._setup, pool_connections=pool_size, pool_maxsize=per_host)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._host_limits = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._hedge_executor = None
+
+    def _host_limit(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return limit
+
+    def get(self, url, **kwargs):
+        """GET a URL through the pool, waiting for a free per-host slot.
+
+        Responses carry from_cache/not_modified flags so callers can reuse
+        work derived from an unchanged body.
+        """
+        if self.cache is None or kwargs.get('stream'):
+            if self.offline:
+                raise OfflineCacheMiss(f"Offline mode: streaming fetch of {url} is not cached")
+            return self._send(url, **kwargs)
+
+        entry = self.cache.lookup(url)
+        if self.offline:
+            cached = self.cache.response(url) if entry is not None else None
+            if cached is None:
+                raise OfflineCacheMiss(f"Offline mode: {url} is not in the cache")
+            return cached
+
+        plain = dict(kwargs)
+        if entry is not None:
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers.update(self.cache.validators(url))
+            kwargs['headers'] = headers
+        response = self._send(url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            cached = self.cache.response(url, not_modified=True)
+            if cached is not None:
+                return cached
+            # Evicted by another thread since lookup(): fetch the body again
+            response = self._send(url, **plain)
+        if response.status_code == 200:
+            self.cache.store(url, response)
+        response.from_cache = False
+        response.not_modified = False
+        return response
+
+    def _send(self, url, **kwargs):
+        """Send a GET with retries; raises the last error or returns the last response."""
+        kwargs.setdefault('timeout', self.timeout)
+        host = urlparse(url).netloc.lower()
+        attempt = 0
+        while True:
+            probe = False
+            if self.breakers is not None:
+                try:
+                    probe = self.breakers.before(host)
+                except CircuitOpenError:
+                    if self.metrics is not None:
+                        self.metrics.add("fetch_circuit_open_total", host=host)
+                    raise
+            response = error = None
+            try:
+                response = self._attempt(url, host, kwargs)
+            except requests.RequestException as e:
+                error = e
+            if self.breakers is not None:
+                self.breakers.record(host, is_failure(response, error), probe)
+            delay = None if self.retry is None else self.retry.delay(attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            if self.metrics is not None:
+                reason = type(error).__name__ if error is not None else str(response.status_code)
+                self.metrics.add("fetch_retries_total", host=host, reason=reason)
+            asked = False
+            if response is not None:
+                asked = parse_retry_after(response.headers.get('Retry-After')) is not None
+                response.close()
+            if asked and self.scheduler is not None:
+                # The host asked everyone to wait, not just this request
+                self.scheduler.pause(url, delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def _attempt(self, url, host, kwargs):
+        """One try, hedged with a second request if it is slower than the host usually is."""
+        if self.hedge is None or kwargs.get('stream'):
+            return self._request(url, kwargs)
+        delay = self.hedge.delay(host)
+        if delay is None:
+            return self._request(url, kwargs)
+        # Wait for the host's rate limit here, so the hedge timer only counts the server's time
+        if self.scheduler is not None:
+            self.scheduler.acquire(url)
+        executor = self._get_hedge_executor()
+        primary = executor.submit(self._request, url, kwargs, True)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        hedged = executor.submit(self._request, url, kwargs)
+        roles = {primary: "primary", hedged: "hedge"}
+        error = None
+        for future in as_completed(roles):
+            try:
+                response = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            (hedged if future is primary else primary).add_done_callback(_close_response)
+            if self.metrics is not None:
+                self.metrics.add("fetch_hedges_total", host=host, winner=roles[future])
+            return response
+        raise error
+
+    def _request(self, url, kwargs, paced=False):
+        if self.scheduler is not None and not paced:
+            self.scheduler.acquire(url)
+        with self._host_limit(url):
+            start = time.perf_counter()
+            if self.metrics is not None:
+                self._setup.seconds = 0.0
+            response = self.session.get(url, **kwargs)
+            total = time.perf_counter() - start
+        if self.hedge is not None and not kwargs.get('stream'):
+            self.hedge.record(urlparse(url).netloc.lower(), total)
+        if self.metrics is not None:
+            self._record(url, response, total, self._setup.seconds, kwargs.get('stream'))
+        return response
+
+    def _record(self, url, response, total, setup, stream):
+        host = urlparse(url).hostname
+        # response.elapsed runs from sending the request (including any new
+        # connection's setup) to parsing the headers
+        headers_at = response.elapsed.total_seconds()
+        self.metrics.observe("fetch_ttfb_seconds", max(headers_at - setup, 0.0), host=host)
+        self.metrics.add("fetch_requests_total", host=host, status=str(response.status_code))
+        if stream:
+            # The body is read later by the caller
+            size = int(response.headers.get('Content-Length') or 0)
+        else:
+            self.metrics.observe("fetch_download_seconds", max(total - headers_at, 0.0), host=host)
+            size = len(response.content)
+        self.metrics.add("fetch_bytes_total", size, host=host)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='fetch')
+            return self._executor
+
+    def _get_hedge_executor(self):
+        # Separate from the async pool: hedges are submitted from its threads
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self.pool_size * 2, thread_name_prefix='hedge')
+            return self._hedge_executor
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking call that uses this fetcher on the fetch thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+
+    async def aget(self, url, **kwargs):
+        """Async GET; runs on the fetch thread pool and shares its connections."""
+        return await self.run(self.get, url, **kwargs)
+
+    async def afetch_all(self, urls, **kwargs):
+        """Fetch many URLs concurrently. Failed fetches come back as exceptions."""
+        return await asyncio.gather(*(self.aget(url, **kwargs) for url in urls), return_exceptions=True)
+
+    def fetch_all(self, urls, **kwargs):
+        """Blocking wrapper around afetch_all() for non-async callers."""
+        return asyncio.run(self.afetch_all(urls, **kwargs))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=True)
+            self._hedge_executor = None
+        if self.cache is not None:
+            self.cache.save()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _close_response(future):
+    """Release the connection of a hedged request whose twin answered first."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+def get_fetcher():
+    """Return the process-wide shared Fetcher, creating it on first use."""
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = Fetcher()
+        return _default_fetcher
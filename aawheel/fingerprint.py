@@ -0,0 +1,183 @@
+"""
+Page fingerprints for change detection.
+
+A page is fingerprinted by two values:
+
+    dom      hash of the normalized markup: whitespace runs collapsed and
+             tag names lower-cased, so re-indented templates do not count
+             as changes
+    simhash  64-bit SimHash of the page's words; pages whose simhashes differ
+             in only a few bits are near-duplicates
+
+Comments, script and style bodies stay in the hash: the contact extractor
+reads addresses, phones and emails from them. The SimHash ignores comments.
+
+PageFingerprints remembers each URL's fingerprint together with the
+extraction made from it and when the page was last fetched, so a re-scrape
+only re-extracts pages whose dom hash changed (and need not fetch pages a
+sitemap says are older than that), and reports which pages were added or
+changed this run.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_FINGERPRINTS = '.cache/page_fingerprints.json'
+FINGERPRINTS_VERSION = 2
+SIMHASH_BITS = 64
+# Pages at most this many bits apart are reported as near-duplicates
+NEAR_DUPLICATE_BITS = 3
+
+COMMENT_RE = re.compile(rb'<!--.*?-->', re.S)
+SPACE_RE = re.compile(rb'\s+')
+TAG_NAME_RE = re.compile(rb'</?[A-Za-z][^\s/>]*')
+TAG_RE = re.compile(rb'<[^>]*>')
+WORD_RE = re.compile(rb'\w+')
+
+# Spreads the 8 bits of a byte into 8 fields FIELD_BITS wide, so one big-int
+# addition updates 64 per-bit SimHash counters at once
+FIELD_BITS = 32
+_SPREAD = [sum(1 << (FIELD_BITS * bit) for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+def normalize_html(content):
+    content = TAG_NAME_RE.sub(lambda m: m.group().lower(), content)
+    return SPACE_RE.sub(b' ', content).strip()
+
+def dom_hash(content):
+    """Hex digest of the normalized markup (bytes in, str out)."""
+    return hashlib.blake2b(normalize_html(content), digest_size=16).hexdigest()
+
+def simhash(content):
+    """64-bit SimHash of the words in a page, weighted by their counts."""
+    words = Counter(WORD_RE.findall(TAG_RE.sub(b' ', COMMENT_RE.sub(b'', content)).lower()))
+    if not words:
+        return 0
+    counts = 0
+    for word, weight in words.items():
+        digest = hashlib.blake2b(word, digest_size=8).digest()
+        spread = 0
+        for i, byte in enumerate(digest):
+            spread |= _SPREAD[byte] << (FIELD_BITS * 8 * i)
+        counts += spread * weight
+    half = sum(words.values()) / 2
+    mask = (1 << FIELD_BITS) - 1
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        if (counts >> (FIELD_BITS * bit)) & mask > half:
+            value |= 1 << bit
+    return value
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+def near_duplicates(simhashes, max_bits=NEAR_DUPLICATE_BITS):
+    """[(url, url, distance)] for every pair within max_bits of each other.
+
+    Values are split into max_bits + 1 bands (four 16-bit bands for 3
+    bits); a pair at most max_bits apart agrees on at least one band, so
+    only values sharing a band bucket are compared.
+    """
+    count = max_bits + 1
+    width = SIMHASH_BITS // count
+    mask = (1 << width) - 1
+    bands = {}
+    for url, value in simhashes.items():
+        for band in range(count):
+            bands.setdefault((band, value >> (width * band) & mask), []).append(url)
+    pairs = {}
+    for urls in bands.values():
+        for i, a in enumerate(urls):
+            for b in urls[i + 1:]:
+                distance = hamming(simhashes[a], simhashes[b])
+                if distance <= max_bits:
+                    pairs[tuple(sorted((a, b)))] = distance
+    return [(a, b, distance) for (a, b), distance in sorted(pairs.items())]
+
+class PageFingerprints:
+    """URL -> fingerprint and extraction from previous runs, saved as JSON.
+
+    reuse() returns the stored extraction when a page's dom hash is
+    unchanged; update() stores a fresh one. Both record what happened to
+    the URL this run for report(). unchanged_since() returns it without a
+    fetch when the page was fetched after its sitemap lastmod.
+    """
+
+    def __init__(self, path=DEFAULT_FINGERPRINTS):
+        self.path = Path(path)
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.changes = {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == FINGERPRINTS_VERSION:
+                self._entries = data["pages"]
+        except (OSError, ValueError):
+            pass
+
+    def reuse(self, url, dom, name):
+        """The extraction stored for url if its dom hash and extraction name match."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or entry["dom"] != dom or entry["name"] != name:
+                return None
+            entry["fetched"] = time.time()
+            self._dirty = True
+            self.changes[url] = {"status": "unchanged", "simhash": entry["simhash"]}
+            return entry["data"]
+
+    def unchanged_since(self, url, lastmod, name):
+        """The stored extraction if url was last fetched at or after lastmod (a Unix timestamp)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or entry["name"] != name or entry.get("fetched", 0.0) < lastmod:
+                return None
+            self.changes[url] = {"status": "unchanged", "simhash": entry["simhash"]}
+            return entry["data"]
+
+    def update(self, url, content, dom, name, data):
+        value = simhash(content)
+        with self._lock:
+            previous = self._entries.get(url)
+            if previous is None:
+                change = {"status": "added"}
+            elif previous["dom"] == dom:
+                # Same markup, extracted again for a different name/version
+                change = {"status": "unchanged"}
+            else:
+                change = {"status": "changed", "distance": hamming(previous["simhash"], value)}
+            change["simhash"] = value
+            self.changes[url] = change
+            self._entries[url] = {"dom": dom, "simhash": value, "name": name, "data": data, "fetched": time.time()}
+            self._dirty = True
+
+    def report(self):
+        """Pages added, changed (with their SimHash distance) and unchanged this run."""
+        with self._lock:
+            changes = dict(self.changes)
+        return {
+            "added": sorted(url for url, change in changes.items() if change["status"] == "added"),
+            "changed": [{"url": url, "distance": change["distance"]}
+                        for url, change in sorted(changes.items()) if change["status"] == "changed"],
+            "unchanged": sum(change["status"] == "unchanged" for change in changes.values()),
+            "near_duplicates": [{"urls": [a, b], "distance": distance} for a, b, distance in
+                                near_duplicates({url: change["simhash"] for url, change in changes.items()})]
+        }
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({"version": FINGERPRINTS_VERSION, "pages": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._dirty = False
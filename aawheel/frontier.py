@@ -0,0 +1,113 @@
+"""
+Persistent crawl frontier.
+
+The URL queue, the visited set and every URL's status live in one SQLite
+table, so a killed crawl resumes by reopening the database instead of
+replaying its history. URLs are keyed by a 64-bit hash of their normalized
+form; the keys are also held in a Python set, so membership checks while
+enqueueing links are O(1) and never touch the database.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+
+QUEUED = 0
+IN_PROGRESS = 1
+DONE = 2
+FAILED = 3
+SKIPPED = 4
+# Waiting until the host's robots.txt can be read
+DEFERRED = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    key INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_queue ON urls (status, seq);
+"""
+
+def url_key(url):
+    """Signed 64-bit key of a (normalized) URL, usable as a SQLite rowid."""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big', signed=True)
+
+class CrawlFrontier:
+    """SQLite-backed queue + visited set with per-URL status.
+
+    Not thread-safe: the crawler drives it from its scheduling loop only.
+    """
+
+    def __init__(self, path=':memory:'):
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        self._keys = {key for (key,) in self.db.execute('SELECT key FROM urls')}
+        row = self.db.execute('SELECT MAX(seq) FROM urls').fetchone()
+        self._seq = (row[0] or 0) + 1
+
+    def __contains__(self, url):
+        return url_key(url) in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def reset(self):
+        """Forget everything (start a fresh crawl)."""
+        self.db.execute('DELETE FROM urls')
+        self.db.commit()
+        self._keys.clear()
+        self._seq = 1
+
+    def add(self, url, depth, status=QUEUED):
+        """Record a URL unless it is already known. Returns True if it was new."""
+        key = url_key(url)
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        self.db.execute('INSERT INTO urls (key, url, depth, status, seq) VALUES (?, ?, ?, ?, ?)',
+                        (key, url, depth, status, self._seq))
+        self._seq += 1
+        return True
+
+    def pop(self, limit=1):
+        """Claim up to `limit` queued URLs in FIFO order as (url, depth, seq)."""
+        rows = self.db.execute('SELECT key, url, depth, seq FROM urls WHERE status = ? ORDER BY seq LIMIT ?',
+                               (QUEUED, limit)).fetchall()
+        self.db.executemany('UPDATE urls SET status = ? WHERE key = ?', [(IN_PROGRESS, row[0]) for row in rows])
+        return [row[1:] for row in rows]
+
+    def mark(self, url, status):
+        self.db.execute('UPDATE urls SET status = ? WHERE key = ?', (status, url_key(url)))
+
+    def requeue(self, statuses=(IN_PROGRESS, FAILED)):
+        """Put interrupted (and by default failed) URLs back in the queue."""
+        placeholders = ', '.join('?' * len(statuses))
+        self.db.execute(f'UPDATE urls SET status = ? WHERE status IN ({placeholders})', (QUEUED, *statuses))
+        self.db.commit()
+
+    def deferred(self):
+        """(url, depth) of every DEFERRED URL, in discovery order."""
+        return self.db.execute('SELECT url, depth FROM urls WHERE status = ? ORDER BY seq', (DEFERRED,)).fetchall()
+
+    def status(self, url):
+        """Status of a URL, or None if it is not known."""
+        row = self.db.execute('SELECT status FROM urls WHERE key = ?', (url_key(url),)).fetchone()
+        return row[0] if row else None
+
+    def count(self, status):
+        return self.db.execute('SELECT COUNT(*) FROM urls WHERE status = ?', (status,)).fetchone()[0]
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
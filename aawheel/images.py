@@ -0,0 +1,268 @@
+"""
+Responsive image variants.
+
+optimize_image() resizes one source image to several widths (never
+upscaling) and encodes each width as AVIF, WebP and JPEG, so the frontend
+can serve a <picture> with srcsets instead of the full-size download.
+optimize_images() spreads the work over a process pool, one image per task,
+and build_images() adds an incremental build cache on top: unchanged sources
+(same size and mtime, or same content hash) with the same parameters and
+intact outputs are not reprocessed.
+
+Needs Pillow (pip install pillow). AVIF is skipped when the installed
+Pillow cannot encode it (Pillow < 11.2 without pillow-avif-plugin).
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from aawheel.downloads import file_sha256
+
+WIDTHS = (320, 640, 960, 1280)
+FORMATS = ('avif', 'webp', 'jpeg')
+EXTENSIONS = {'avif': '.avif', 'webp': '.webp', 'jpeg': '.jpg'}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+SAVE_OPTIONS = {
+    'avif': {'quality': 50, 'speed': 6},
+    'webp': {'quality': 75, 'method': 4},
+    'jpeg': {'quality': 80, 'optimize': True, 'progressive': True}
+}
+DEFAULT_URL_PREFIX = '/images/optimized'
+DEFAULT_BUILD_CACHE = '.cache/image_build.json'
+
+# Bump to invalidate every cached image build
+BUILD_VERSION = 1
+
+def load_pillow():
+    """Import Pillow, raising ImportError with an install hint if it is missing."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as e:
+        raise ImportError("Image optimization needs Pillow: pip install pillow") from e
+    return Image, ImageOps
+
+def supported_formats(formats=FORMATS):
+    """The requested formats the installed Pillow can encode."""
+    load_pillow()
+    from PIL import features
+    supported = []
+    for fmt in formats:
+        if fmt == 'jpeg' or features.check(fmt):
+            supported.append(fmt)
+    return supported
+
+def variant_widths(width, widths=WIDTHS):
+    """Target widths for an image `width` pixels wide, without upscaling."""
+    targets = [w for w in sorted(widths) if w < width]
+    if width <= max(widths):
+        targets.append(width)
+    return targets or [width]
+
+def _save(image, path, fmt):
+    tmp = path.with_name(path.name + '.tmp')
+    image.save(tmp, format=fmt.upper(), **SAVE_OPTIONS[fmt])
+    os.replace(tmp, path)
+
+def optimize_image(source, output_dir, widths=WIDTHS, formats=FORMATS, url_prefix=DEFAULT_URL_PREFIX):
+    """Write the resized/re-encoded variants of one image.
+
+    Returns the source's width, height and bytes plus a list of variants
+    (format, width, height, path, url, bytes).
+    """
+    Image, ImageOps = load_pillow()
+    source = Path(source)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        width, height = image.size
+        variants = []
+        for target in variant_widths(width, widths):
+            target_height = max(1, round(height * target / width))
+            resized = image if target == width else image.resize(
+                (target, target_height), Image.LANCZOS, reducing_gap=3.0)
+            for fmt in formats:
+                frame = resized.convert('RGB') if fmt == 'jpeg' and resized.mode != 'RGB' else resized
+                name = f"{source.stem}-{target}{EXTENSIONS[fmt]}"
+                path = output_dir / name
+                _save(frame, path, fmt)
+                variants.append({
+                    "format": fmt,
+                    "width": target,
+                    "height": target_height,
+                    "path": str(path),
+                    "url": f"{url_prefix}/{name}",
+                    "bytes": path.stat().st_size
+                })
+
+    return {
+        "width": width,
+        "height": height,
+        "bytes": source.stat().st_size,
+        "variants": variants
+    }
+
+def srcsets(variants):
+    """{mime type: srcset string} for a list of variants, smallest first."""
+    sets = {}
+    for fmt in FORMATS:
+        entries = sorted((v for v in variants if v["format"] == fmt), key=lambda v: v["width"])
+        if entries:
+            sets[MIME_TYPES[fmt]] = ", ".join(f"{v['url']} {v['width']}w" for v in entries)
+    return sets
+
+def optimize_images(sources, output_dir, widths=WIDTHS, formats=FORMATS, workers=None,
+                    url_prefix=DEFAULT_URL_PREFIX):
+    """Optimize many images in a process pool.
+
+    Returns {source: result}; images that fail are reported and left out.
+    """
+    formats = supported_formats(formats)
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(optimize_image, source, output_dir, widths, formats, url_prefix): source
+            for source in sources
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                results[source] = future.result()
+            except Exception as e:
+                print(f"✗ Failed to optimize {source}: {e}")
+    return results
+
+def build_params(widths=WIDTHS, formats=FORMATS, url_prefix=DEFAULT_URL_PREFIX):
+    """Short hash of everything besides the source that determines the outputs."""
+    params = {
+        "version": BUILD_VERSION,
+        "widths": sorted(widths),
+        "formats": list(formats),
+        "options": {fmt: SAVE_OPTIONS[fmt] for fmt in formats},
+        "url_prefix": url_prefix
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+class ImageBuildCache:
+    """Per-source record of size, mtime, sha256, parameters and outputs.
+
+    lookup() checks stat() first and hashes the source only when size or
+    mtime differ, so a no-op rebuild costs one stat per source and output.
+    """
+
+    def __init__(self, path=DEFAULT_BUILD_CACHE):
+        self.path = Path(path)
+        self.dirty = False
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def lookup(self, source, params):
+        """The cached result for source if it is still valid, else None."""
+        entry = self.entries.get(str(source))
+        if entry is None or entry["params"] != params:
+            return None
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        if stat.st_size != entry["size"] or stat.st_mtime_ns != entry["mtime_ns"]:
+            # Touched or copied: only a content change invalidates the outputs
+            if stat.st_size != entry["size"] or file_sha256(source) != entry["sha256"]:
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.dirty = True
+        for variant in entry["result"]["variants"]:
+            if not os.path.exists(variant["path"]):
+                return None
+        return entry["result"]
+
+    def store(self, source, params, result, size, mtime_ns, sha256):
+        old = self.entries.get(str(source))
+        if old:
+            # Drop outputs the new parameters/dimensions no longer produce
+            keep = {variant["path"] for variant in result["variants"]}
+            for variant in old["result"]["variants"]:
+                if variant["path"] not in keep and os.path.exists(variant["path"]):
+                    os.remove(variant["path"])
+        self.entries[str(source)] = {
+            "params": params,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "sha256": sha256,
+            "result": result
+        }
+        self.dirty = True
+
+    def forget(self, source):
+        """Drop source's entry and delete its outputs."""
+        entry = self.entries.pop(str(source), None)
+        if entry is None:
+            return
+        for variant in entry["result"]["variants"]:
+            if os.path.exists(variant["path"]):
+                os.remove(variant["path"])
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+def _build_one(source, output_dir, widths, formats, url_prefix):
+    # Stat and hash before processing so an edit made meanwhile is seen as a change
+    stat = os.stat(source)
+    sha256 = file_sha256(source)
+    result = optimize_image(source, output_dir, widths, formats, url_prefix)
+    return result, stat.st_size, stat.st_mtime_ns, sha256
+
+def build_images(sources, output_dir, widths=WIDTHS, formats=FORMATS, workers=None,
+                 url_prefix=DEFAULT_URL_PREFIX, cache=None):
+    """Incremental optimize_images(): only new or changed sources are processed.
+
+    Returns {source: result} for every source that has valid outputs.
+    """
+    if cache is None:
+        cache = ImageBuildCache()
+    formats = supported_formats(formats)
+    params = build_params(widths, formats, url_prefix)
+    results = {}
+    stale = []
+    for source in sources:
+        result = cache.lookup(source, params)
+        if result is None:
+            stale.append(source)
+        else:
+            results[source] = result
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_build_one, source, output_dir, widths, formats, url_prefix): source
+                for source in stale
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    result, size, mtime_ns, sha256 = future.result()
+                except Exception as e:
+                    print(f"✗ Failed to optimize {source}: {e}")
+                    continue
+                cache.store(source, params, result, size, mtime_ns, sha256)
+                results[source] = result
+    cache.save()
+    print(f"✓ Images: {len(results) - len(stale)} unchanged, {len(stale)} processed")
+    return results
@@ -0,0 +1,168 @@
+"""
+Pipeline metrics.
+
+A Metrics registry collects per-stage durations (as histograms) and counters
+(bytes, elements, requests) keyed by name and labels, and exports them as
+JSON or in the Prometheus text format. Stages recorded by the scraper:
+
+    fetch_dns_seconds        hostname resolution for a new connection
+    fetch_connect_seconds    TCP connect for a new connection
+    fetch_tls_seconds        TLS handshake for a new HTTPS connection
+    fetch_ttfb_seconds       request sent -> response headers received
+    fetch_download_seconds   response headers -> body fully read
+    parse_seconds            HTML -> parse tree, per parser backend
+    extract_seconds          time spent in each extractor
+    page_seconds             one page from fetch through extraction
+    fetch_bytes_total, fetch_requests_total, fetch_retries_total,
+    fetch_hedges_total, fetch_circuit_open_total, parse_bytes_total,
+    parse_elements_total, pages_total
+
+Recording is thread-safe; a registry is only created when metrics are
+requested, so the default pipeline pays nothing. Histograms only keep
+bucket counts unless the registry is created with samples=True, which
+also keeps every observation so exact percentiles can be reported.
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def percentile(values, q):
+    """Nearest-rank q-th percentile (0-100) of a sorted list."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, math.ceil(q / 100 * len(values)) - 1))]
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+class Metrics:
+    """Histograms and counters keyed by (name, labels)."""
+
+    def __init__(self, buckets=BUCKETS, samples=False):
+        self.buckets = buckets
+        self.samples = samples
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    "count": 0, "sum": 0.0, "min": seconds, "max": seconds,
+                    "buckets": [0] * len(self.buckets)
+                }
+                if self.samples:
+                    histogram["samples"] = []
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+            histogram["min"] = min(histogram["min"], seconds)
+            histogram["max"] = max(histogram["max"], seconds)
+            if self.samples:
+                histogram["samples"].append(seconds)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram["buckets"][i] += 1
+                    break
+
+    def add(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def percentiles(self, name, qs=(50, 99), **labels):
+        """{q: seconds} from the kept samples (needs samples=True), or None if nothing was observed."""
+        with self._lock:
+            histogram = self.histograms.get((name, _label_key(labels)))
+            if histogram is None:
+                return None
+            values = sorted(histogram["samples"])
+        return {q: percentile(values, q) for q in qs}
+
+    def to_dict(self):
+        with self._lock:
+            histograms = []
+            for (name, labels), h in sorted(self.histograms.items()):
+                entry = dict(name=name, labels=dict(labels), count=h["count"], sum=round(h["sum"], 6),
+                             min=round(h["min"], 6), max=round(h["max"], 6),
+                             mean=round(h["sum"] / h["count"], 6))
+                if self.samples:
+                    values = sorted(h["samples"])
+                    entry.update(p50=round(percentile(values, 50), 6), p99=round(percentile(values, 99), 6))
+                histograms.append(entry)
+            return {
+                "histograms": histograms,
+                "counters": [
+                    dict(name=name, labels=dict(labels), value=value)
+                    for (name, labels), value in sorted(self.counters.items())
+                ]
+            }
+
+    def to_prometheus(self, prefix="aawheel"):
+        """Prometheus text exposition format (histograms are cumulative)."""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), h in sorted(self.histograms.items()):
+                metric = f"{prefix}_{name}"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(self.buckets, h["buckets"]):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{_label_text(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{metric}_bucket{_label_text(labels, [('le', '+Inf')])} {h['count']}")
+                lines.append(f"{metric}_sum{_label_text(labels)} {h['sum']:.6f}")
+                lines.append(f"{metric}_count{_label_text(labels)} {h['count']}")
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"{prefix}_{name}"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}{_label_text(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write Prometheus text for *.prom/*.txt paths, JSON otherwise."""
+        path = str(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith(('.prom', '.txt')):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2)
+
+    def summary_lines(self):
+        """Human-readable per-stage totals, slowest first."""
+        totals = {}
+        with self._lock:
+            for (name, labels), h in self.histograms.items():
+                label = ",".join(str(value) for _, value in labels)
+                key = f"{name}[{label}]" if label else name
+                totals[key] = (h["sum"], h["count"])
+        return [f"{key:<44} {total:9.3f}s  n={count}"
+                for key, (total, count) in sorted(totals.items(), key=lambda item: -item[1][0])]
@@ -0,0 +1,209 @@
+"""
+Typed data model for the scraped dataset.
+
+Product, Testimonial, Location and NavItem are slotted dataclasses shared
+by the scraper and the image scripts (lib/types.ts mirrors them for the
+pages). Catalog.from_website_data() validates website_data dicts into them;
+Catalog.to_bytes() / from_bytes() are a compact binary form of the same
+data: every distinct string is stored once, NUL-separated, and each model
+list is stored column by column as uint32 indexes into that string table.
+Decoding is a single UTF-8 decode and split plus one array per column.
+
+The product image map (slug, category and file name per product category)
+lives in product_images.json at the repository root, which
+scripts/setup-images.js reads as well.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from dataclasses import MISSING, asdict, dataclass, fields
+from pathlib import Path
+
+PRODUCT_IMAGES_FILE = Path(__file__).resolve().parent.parent / 'product_images.json'
+
+MAGIC = b'AAWC'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sBII')
+
+class ValidationError(ValueError):
+    """Data does not match the model; the message starts with the offending path."""
+
+@dataclass(slots=True)
+class Product:
+    name: str
+    description: str = ""
+    category: str | None = None
+    image: str | None = None
+
+@dataclass(slots=True)
+class Testimonial:
+    author: str
+    text: str
+    date: str | None = None
+
+@dataclass(slots=True)
+class Location:
+    city: str
+    phone: str | None = None
+
+@dataclass(slots=True)
+class NavItem:
+    text: str
+    href: str
+
+@dataclass(slots=True)
+class ProductImage:
+    slug: str
+    category: str
+    image: str
+
+def _spec(cls):
+    """(field name, required, default) per field; every field is a string."""
+    return tuple((f.name, f.default is MISSING, None if f.default is MISSING else f.default)
+                 for f in fields(cls))
+
+SPECS = {cls: _spec(cls) for cls in (Product, Testimonial, Location, NavItem, ProductImage)}
+
+def validate_list(cls, items, path):
+    """Build cls objects from a list of dicts, checking required and string fields.
+
+    Unknown keys are ignored.
+    """
+    if not isinstance(items, list):
+        raise ValidationError(f"{path}: expected a list, got {type(items).__name__}")
+    spec = SPECS[cls]
+    result = []
+    append = result.append
+    for i, item in enumerate(items):
+        if type(item) is not dict:
+            raise ValidationError(f"{path}[{i}]: expected an object, got {type(item).__name__}")
+        values = []
+        for name, required, default in spec:
+            value = item.get(name)
+            if value is None:
+                if required:
+                    raise ValidationError(f"{path}[{i}].{name}: missing")
+                value = default
+            elif type(value) is not str:
+                raise ValidationError(f"{path}[{i}].{name}: expected a string, got {type(value).__name__}")
+            values.append(value)
+        append(cls(*values))
+    return result
+
+def to_dicts(items):
+    """JSON-ready dicts, leaving out unset optional fields."""
+    return [{key: value for key, value in asdict(item).items() if value is not None} for item in items]
+
+def load_product_images(path=PRODUCT_IMAGES_FILE):
+    with open(path, encoding='utf-8') as f:
+        return validate_list(ProductImage, json.load(f), Path(path).name)
+
+# Catalog attribute, model and location in website_data
+CATALOG_LISTS = (
+    ("products", Product, ("content", "products")),
+    ("testimonials", Testimonial, ("content", "testimonials")),
+    ("locations", Location, ("contact", "locations")),
+    ("navigation", NavItem, ("navigation", "main")),
+    ("footer", NavItem, ("navigation", "footer"))
+)
+
+@dataclass(slots=True)
+class Catalog:
+    products: list
+    testimonials: list
+    locations: list
+    navigation: list
+    footer: list
+
+    @classmethod
+    def from_website_data(cls, website_data):
+        """Validate the model lists of a website_data dict (missing lists are empty)."""
+        if not isinstance(website_data, dict):
+            raise ValidationError(f"website_data: expected an object, got {type(website_data).__name__}")
+        lists = []
+        for _, model, (group, field) in CATALOG_LISTS:
+            section = website_data.get(group) or {}
+            if not isinstance(section, dict):
+                raise ValidationError(f"{group}: expected an object, got {type(section).__name__}")
+            lists.append(validate_list(model, section.get(field, []), f"{group}.{field}"))
+        return cls(*lists)
+
+    def to_dict(self):
+        return {name: to_dicts(getattr(self, name)) for name, _, _ in CATALOG_LISTS}
+
+    def to_bytes(self):
+        # Index 0 stands for None
+        strings = {}
+        columns = []
+        for name, model, _ in CATALOG_LISTS:
+            items = getattr(self, name)
+            for field, _, _ in SPECS[model]:
+                column = array('I')
+                for item in items:
+                    value = getattr(item, field)
+                    if value is None:
+                        column.append(0)
+                        continue
+                    index = strings.get(value)
+                    if index is None:
+                        if '\0' in value:
+                            raise ValidationError(f"{name}.{field}: NUL characters cannot be encoded")
+                        index = strings[value] = len(strings) + 1
+                    column.append(index)
+                columns.append(column)
+        table = '\0'.join(strings).encode('utf-8')
+        counts = [len(getattr(self, name)) for name, _, _ in CATALOG_LISTS]
+        if sys.byteorder == 'big':
+            for column in columns:
+                column.byteswap()
+        return b''.join([
+            HEADER.pack(MAGIC, FORMAT_VERSION, len(strings), len(table)),
+            struct.pack(f'<{len(counts)}I', *counts),
+            table,
+            *(column.tobytes() for column in columns)
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        try:
+            magic, version, string_count, table_size = HEADER.unpack_from(data)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValidationError(f"not a version {FORMAT_VERSION} catalog")
+            offset = HEADER.size
+            counts = struct.unpack_from(f'<{len(CATALOG_LISTS)}I', data, offset)
+            offset += 4 * len(CATALOG_LISTS)
+            strings = [None]
+            if string_count:
+                strings += bytes(data[offset:offset + table_size]).decode('utf-8').split('\0')
+            if len(strings) != string_count + 1:
+                raise ValidationError("string table does not match its count")
+            offset += table_size
+            lists = []
+            for (_, model, _), count in zip(CATALOG_LISTS, counts):
+                columns = []
+                for _ in SPECS[model]:
+                    column = array('I')
+                    column.frombytes(data[offset:offset + 4 * count])
+                    if len(column) != count:
+                        raise ValidationError("truncated catalog")
+                    if sys.byteorder == 'big':
+                        column.byteswap()
+                    offset += 4 * count
+                    columns.append(map(strings.__getitem__, column))
+                lists.append(list(map(model, *columns)))
+        except (struct.error, UnicodeDecodeError, IndexError) as e:
+            raise ValidationError(f"corrupt catalog: {e}") from None
+        return cls(*lists)
+
+    def write(self, path):
+        data = self.to_bytes()
+        with open(path, 'wb') as f:
+            f.write(data)
+        return len(data)
+
+    @classmethod
+    def read(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
@@ -0,0 +1,222 @@
+"""
+Pluggable HTML parser backends for the extraction engine.
+
+Each backend parses raw page bytes into its own tree and walks that tree,
+feeding element start/end and text events to an ExtractionEngine. The
+extractors never touch parser objects, so every backend produces the same
+extracted data:
+
+    html.parser  BeautifulSoup with Python's built-in parser (default, no extra deps)
+    lxml         lxml.html (libxml2), pip install lxml
+    selectolax   selectolax's lexbor parser, pip install selectolax
+    stream       no tree: html.parser tokens become events as the bytes are
+                 read (aawheel.streaming), for pages too big to hold as a tree
+"""
+
+from aawheel.extract import OTHER, TEXT
+
+DEFAULT_PARSER = 'html.parser'
+STREAM_PARSER = 'stream'
+
+# Text inside these elements is not page text (BeautifulSoup stores it as
+# Script/Stylesheet/TemplateString/Ruby strings, which get_text() skips)
+NON_TEXT_CONTAINERS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+def decode_html(content):
+    """Decode page bytes for backends that would otherwise guess Latin-1."""
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content.decode('cp1252', errors='replace')
+
+class ParsedPage:
+    """A parsed document plus the backend that knows how to walk it."""
+
+    def __init__(self, backend, tree):
+        self.backend = backend
+        self.tree = tree
+
+    def walk(self, engine):
+        self.backend.walk(self.tree, engine)
+
+class SoupBackend:
+    """BeautifulSoup tree; the engine walks it natively."""
+
+    name = 'html.parser'
+
+    def parse(self, content):
+        from bs4 import BeautifulSoup
+        return ParsedPage(self, BeautifulSoup(content, 'html.parser'))
+
+    def walk(self, tree, engine):
+        engine.feed_soup(tree)
+
+class LxmlBackend:
+    """lxml.html tree walked with an explicit stack (text/tail aware)."""
+
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.etree
+        import lxml.html
+        self._fromstring = lxml.html.document_fromstring
+        self._empty = lxml.etree.ParserError
+
+    def parse(self, content):
+        try:
+            root = self._fromstring(decode_html(content))
+        except self._empty:
+            # lxml refuses a document without elements; the other backends give an empty page
+            root = self._fromstring('<html></html>')
+        return ParsedPage(self, root)
+
+    def walk(self, root, engine):
+        start, end, text = engine.start, engine.end, engine.text
+        containers = 0
+        # Comments before <html> are siblings of the root element
+        for node in reversed(list(root.itersiblings(preceding=True))):
+            if node.text:
+                text(node.text, OTHER)
+
+        stack = [(root, None)]
+        while stack:
+            node, children = stack[-1]
+            if children is None:
+                tag = node.tag
+                if not isinstance(tag, str):
+                    # Comment or processing instruction
+                    stack.pop()
+                    if node.text:
+                        text(node.text, OTHER)
+                    if node.tail:
+                        text(node.tail, OTHER if containers else TEXT)
+                    continue
+                start(tag, node.attrib, len(stack) - 1)
+                if tag in NON_TEXT_CONTAINERS:
+                    containers += 1
+                if node.text:
+                    text(node.text, OTHER if containers else TEXT)
+                children = iter(node)
+                stack[-1] = (node, children)
+            child = next(children, None)
+            if child is not None:
+                stack.append((child, None))
+                continue
+            stack.pop()
+            end(node.tag, len(stack))
+            if node.tag in NON_TEXT_CONTAINERS:
+                containers -= 1
+            if node.tail and stack:
+                text(node.tail, OTHER if containers else TEXT)
+
+class SelectolaxBackend:
+    """selectolax (lexbor) tree walked through child/next/parent links."""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, content):
+        return ParsedPage(self, self._parser(decode_html(content)))
+
+    def walk(self, tree, engine):
+        start, end, text = engine.start, engine.end, engine.text
+        containers = 0
+        stack = []
+        node = tree.root
+        while node is not None:
+            if node.is_element_node:
+                tag = node.tag
+                attrs = node.attributes
+                if None in attrs.values():
+                    # Valueless attributes (<a href>) are '' in the other backends
+                    attrs = {key: '' if value is None else value for key, value in attrs.items()}
+                start(tag, attrs, len(stack))
+                if tag in NON_TEXT_CONTAINERS:
+                    containers += 1
+                child = node.child
+                if child is not None:
+                    stack.append(node)
+                    node = child
+                    continue
+                end(tag, len(stack))
+                if tag in NON_TEXT_CONTAINERS:
+                    containers -= 1
+            elif node.is_text_node:
+                text(node.text_content, OTHER if containers else TEXT)
+            elif node.is_comment_node:
+                text(node.comment_content or '', OTHER)
+
+            following = node.next
+            while following is None and stack:
+                node = stack.pop()
+                end(node.tag, len(stack))
+                if node.tag in NON_TEXT_CONTAINERS:
+                    containers -= 1
+                following = node.next
+            node = following
+
+class StreamBackend:
+    """No tree at all: the walk tokenizes the page and emits events as it goes.
+
+    parse() only holds on to its input, which may also be an iterable of
+    chunks (e.g. response.iter_content()); such a page can be walked once.
+    """
+
+    name = STREAM_PARSER
+
+    def __init__(self):
+        from aawheel import streaming
+        self._streaming = streaming
+
+    def parse(self, content):
+        return ParsedPage(self, content)
+
+    def walk(self, content, engine):
+        if isinstance(content, (bytes, bytearray, str)):
+            content = self._streaming.iter_chunks(content)
+        self._streaming.feed(content, engine)
+
+BACKENDS = {
+    'html.parser': SoupBackend,
+    'lxml': LxmlBackend,
+    'selectolax': SelectolaxBackend,
+    STREAM_PARSER: StreamBackend
+}
+
+_instances = {}
+
+def get_backend(name=DEFAULT_PARSER):
+    """Return the backend instance for a parser name.
+
+    Raises ValueError for unknown names and ImportError (with an install
+    hint) when the backend's library is missing.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser '{name}' (choose from {', '.join(BACKENDS)})")
+    backend = _instances.get(name)
+    if backend is None:
+        try:
+            backend = _instances[name] = BACKENDS[name]()
+        except ImportError as e:
+            raise ImportError(f"The '{name}' parser needs an extra package: pip install {name}") from e
+    return backend
+
+def available_backends():
+    """Names of the backends whose libraries are installed."""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+def parse(content, parser=DEFAULT_PARSER):
+    """Parse page bytes (or text) with the named backend."""
+    return get_backend(parser).parse(content)
@@ -0,0 +1,86 @@
+"""
+Profiling for --profile.
+
+profile(prefix) runs cProfile over the calling thread and, alongside it, a
+sampling profiler over every thread (so crawl workers show up too), then
+writes:
+
+    <prefix>.pstats   cProfile stats (python -m pstats, snakeviz)
+    <prefix>.folded   collapsed stacks, one "a;b;c count" line per stack
+                      (flamegraph.pl, speedscope, inferno)
+
+Parser worker processes in --manifest mode are not sampled.
+"""
+
+import cProfile
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_INTERVAL = 0.005
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{Path(code.co_filename).name}:{code.co_name}"
+
+class StackSampler:
+    """Samples the Python stacks of all other threads every `interval` seconds."""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write_folded(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+@contextmanager
+def profile(prefix, interval=DEFAULT_INTERVAL):
+    """Profile the enclosed block, writing <prefix>.pstats and <prefix>.folded."""
+    Path(prefix).parent.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile()
+    sampler = StackSampler(interval)
+    sampler.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        sampler.stop()
+        profiler.dump_stats(f"{prefix}.pstats")
+        sampler.write_folded(f"{prefix}.folded")
+        print(f"✓ Profile written to {prefix}.pstats and {prefix}.folded "
+              f"({sum(sampler.stacks.values())} samples)")
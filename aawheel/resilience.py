@@ -0,0 +1,219 @@
+"""
+Retries, per-host circuit breakers and hedged requests for the fetch layer.
+
+Fetcher sends every network request through these, so the scraper, the
+sitemap reader and the image downloaders all get the same behaviour:
+
+    RetryPolicy      retries connection errors, timeouts and 429/5xx
+                     responses with full-jitter exponential backoff, waiting
+                     at least as long as a Retry-After header asks (a
+                     HostScheduler then holds the whole host, so other
+                     workers back off too)
+    CircuitBreakers  once at least half of a host's last 20 attempts failed
+                     its circuit opens and requests to it fail at once with
+                     CircuitOpenError; after `cooldown` seconds one probe
+                     request is let through, and its outcome closes or
+                     re-opens the circuit
+    HedgePolicy      a GET that has not answered within the host's recent
+                     p95 latency is sent a second time and whichever answer
+                     arrives first is used, cutting off slow tail responses
+
+A 404 or other 4xx is an answer, not a failure: it is neither retried nor
+counted against the host. Nor is a 429 or a 503 with Retry-After, which is
+a live host asking for less load; they are retried after the wait it asks.
+"""
+
+import email.utils
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+
+from aawheel.metrics import percentile
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+# Errors a second attempt can fix; SSL and invalid-URL errors cannot
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+PERMANENT_ERRORS = (requests.exceptions.SSLError, requests.exceptions.InvalidURL)
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        # The spec allows whole seconds only, but fractions are seen in the wild
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+def is_failure(response=None, error=None):
+    """True if an attempt says the host is unhealthy (network error, or 5xx without Retry-After)."""
+    if error is not None:
+        return True
+    if response.status_code < 500:
+        return False
+    return parse_retry_after(response.headers.get('Retry-After')) is None
+
+class RetryPolicy:
+    """Up to `attempts` tries per request, sleeping a random 0..min(cap, base * 2**n) between them."""
+
+    def __init__(self, attempts=4, base=0.5, cap=30.0, max_retry_after=120.0, statuses=RETRY_STATUSES):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.max_retry_after = max_retry_after
+        self.statuses = frozenset(statuses)
+        self._random = random.Random()
+
+    def retryable(self, response=None, error=None):
+        if error is not None:
+            return isinstance(error, RETRY_ERRORS) and not isinstance(error, PERMANENT_ERRORS)
+        return response.status_code in self.statuses
+
+    def backoff(self, attempt):
+        """Full jitter: a uniform wait below the exponential bound, so retries do not arrive in waves."""
+        return self._random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+
+    def delay(self, attempt, response=None, error=None):
+        """Seconds to wait before retrying after attempt number `attempt` (from 0), or None to give up.
+
+        A Retry-After longer than max_retry_after gives up rather than
+        stalling the crawl.
+        """
+        if attempt + 1 >= self.attempts or not self.retryable(response, error):
+            return None
+        wait = self.backoff(attempt)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+                wait = max(wait, retry_after)
+        return wait
+
+class _Circuit:
+    __slots__ = ('outcomes', 'failures', 'opened_at', 'probing')
+
+    def __init__(self, window):
+        # True for each failed attempt among the last `window`
+        self.outcomes = deque(maxlen=window)
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+class CircuitBreakers:
+    """One circuit per host: closed, open (failing fast) or half-open (one probe in flight).
+
+    A circuit opens when at least `threshold` of the host's last `window`
+    attempts failed, once `min_attempts` are known. Judging a share rather
+    than a run of consecutive failures keeps a burst of concurrent errors
+    on a mostly healthy host from tripping it.
+    """
+
+    def __init__(self, threshold=0.5, window=20, min_attempts=10, cooldown=30.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.window = window
+        self.min_attempts = min_attempts
+        self.cooldown = cooldown
+        self.clock = clock
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, host):
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = _Circuit(self.window)
+        return circuit
+
+    def before(self, host):
+        """Raise CircuitOpenError unless a request to host may be sent now.
+
+        Returns True if the request is the probe of a half-open circuit.
+        """
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit.opened_at is None:
+                return False
+            remaining = circuit.opened_at + self.cooldown - self.clock()
+            if remaining > 0 or circuit.probing:
+                raise CircuitOpenError(f"Circuit open for {host} ({circuit.failures} of the last "
+                                       f"{len(circuit.outcomes)} requests failed)"
+                                       + (f", retrying in {remaining:.0f}s" if remaining > 0 else ""))
+            circuit.probing = True
+            return True
+
+    def record(self, host, failed, probe=False):
+        """Count an attempt's outcome. A probe closes the circuit, or re-opens it for another cooldown."""
+        with self._lock:
+            circuit = self._circuit(host)
+            if probe:
+                circuit.probing = False
+                if failed:
+                    circuit.opened_at = self.clock()
+                else:
+                    circuit.outcomes.clear()
+                    circuit.failures = 0
+                    circuit.opened_at = None
+                return
+            if circuit.opened_at is not None:
+                # Sent before the circuit opened; only the probe decides now
+                return
+            if len(circuit.outcomes) == circuit.outcomes.maxlen:
+                circuit.failures -= circuit.outcomes[0]
+            circuit.outcomes.append(failed)
+            circuit.failures += failed
+            if len(circuit.outcomes) >= self.min_attempts and circuit.failures >= self.threshold * len(circuit.outcomes):
+                circuit.opened_at = self.clock()
+
+    def state(self, host):
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.opened_at is None:
+                return 'closed'
+            if circuit.probing or self.clock() >= circuit.opened_at + self.cooldown:
+                return 'half-open'
+            return 'open'
+
+class HedgePolicy:
+    """Hedge after the `quantile` latency of a host's last `window` responses.
+
+    No hedging until min_samples responses are known, and never sooner
+    than min_delay.
+    """
+
+    def __init__(self, quantile=95, window=200, min_samples=20, min_delay=0.05):
+        self.quantile = quantile
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def record(self, host, seconds):
+        with self._lock:
+            latencies = self._latencies.get(host)
+            if latencies is None:
+                latencies = self._latencies[host] = deque(maxlen=self.window)
+            latencies.append(seconds)
+
+    def delay(self, host):
+        """Seconds to wait for an answer before hedging, or None if too little is known."""
+        with self._lock:
+            latencies = self._latencies.get(host)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            values = sorted(latencies)
+        return max(self.min_delay, percentile(values, self.quantile))
@@ -0,0 +1,212 @@
+"""
+robots.txt enforcement and per-host request pacing.
+
+RobotsCache fetches and parses each host's robots.txt once and answers
+can-fetch questions for the crawl frontier. As in RFC 9309, a robots.txt
+answered with any 4xx (including 401 and 403) allows everything, while a server error or an unreachable
+robots.txt disallows everything: the last copy in the response cache is
+used instead if there is one, otherwise the host is blocked and asked again
+after ROBOTS_RETRY seconds. HostScheduler is a token bucket
+per host that honors Crawl-delay, so requests to one host are spaced out
+while different hosts still proceed in parallel.
+"""
+
+import threading
+import time
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+ROBOTS_AGENT = '*'
+ROBOTS_RETRY = 30.0
+
+class HostScheduler:
+    """Per-host token buckets: at most `burst` requests per `delay` seconds per host."""
+
+    def __init__(self, default_delay=0.0, burst=1):
+        self.default_delay = default_delay
+        self.burst = burst
+        self._delays = {}
+        self._buckets = {}
+        self._paused = {}
+        self._lock = threading.Lock()
+
+    def set_delay(self, host, delay):
+        """Set the minimum spacing between requests to a host (e.g. its Crawl-delay)."""
+        with self._lock:
+            self._delays[host.lower()] = max(delay or 0.0, self.default_delay)
+
+    def delay(self, host):
+        with self._lock:
+            return self._delays.get(host.lower(), self.default_delay)
+
+    def pause(self, url, seconds):
+        """Hold every request to this URL's host for `seconds` (e.g. a Retry-After)."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._paused.get(host, 0.0):
+                self._paused[host] = until
+
+    def acquire(self, url):
+        """Block until a request to this URL's host may be sent."""
+        host = urlparse(url).netloc.lower()
+        wait = self._reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _reserve(self, host):
+        with self._lock:
+            delay = self._delays.get(host, self.default_delay)
+            now = time.monotonic()
+            paused = self._paused.get(host, now) - now
+            if delay <= 0:
+                return max(paused, 0.0)
+            tokens, last = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) / delay)
+            # Take the token now, possibly going negative; the caller sleeps off the debt
+            tokens -= 1
+            self._buckets[host] = (tokens, now)
+            return max(-tokens * delay if tokens < 0 else 0.0, paused)
+
+def parse_crawl_delays(lines):
+    """Map user-agent -> Crawl-delay seconds.
+
+    urllib.robotparser only accepts whole seconds, but fractional delays
+    such as 0.5 are common.
+    """
+    delays = {}
+    agents = []
+    in_rules = False
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = (part.strip() for part in line.split(':', 1))
+        field = field.lower()
+        if field == 'user-agent':
+            if in_rules:
+                agents = []
+                in_rules = False
+            agents.append(value.lower())
+            continue
+        in_rules = True
+        if field == 'crawl-delay':
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in agents:
+                delays[agent] = delay
+    return delays
+
+class RobotsPolicy:
+    """Parsed robots.txt rules for one host."""
+
+    def __init__(self, robots_url, parser=None, found=False, delays=None, retry_at=None):
+        self.robots_url = robots_url
+        self.found = found
+        self.retry_at = retry_at
+        self._parser = parser
+        self._delays = delays or {}
+
+    @property
+    def unavailable(self):
+        """True if robots.txt could not be read, so everything is disallowed for now."""
+        return self.retry_at is not None
+
+    def stale(self):
+        return self.retry_at is not None and time.monotonic() >= self.retry_at
+
+    def allowed(self, url, agent=ROBOTS_AGENT):
+        if self._parser is None:
+            return True
+        return self._parser.can_fetch(agent, url)
+
+    def crawl_delay(self, agent=ROBOTS_AGENT):
+        if self._parser is None:
+            return None
+        delay = self._delays.get(agent.lower(), self._delays.get('*'))
+        if delay is None:
+            rate = self._parser.request_rate(agent)
+            if rate:
+                delay = rate.seconds / rate.requests
+        return float(delay) if delay is not None else None
+
+    def sitemaps(self):
+        if self._parser is None:
+            return []
+        return self._parser.site_maps() or []
+
+class RobotsCache:
+    """Fetches and caches one RobotsPolicy per scheme+host.
+
+    Crawl-delays found in robots.txt are pushed to the scheduler so the
+    fetcher paces that host accordingly.
+    """
+
+    def __init__(self, fetcher, scheduler=None, agent=ROBOTS_AGENT):
+        self.fetcher = fetcher
+        self.scheduler = scheduler
+        self.agent = agent
+        self._policies = {}
+        self._host_locks = {}
+        self._lock = threading.Lock()
+
+    def policy(self, url):
+        """Return the (cached) robots policy of the host serving this URL."""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc.lower()}"
+        with self._lock:
+            policy = self._policies.get(origin)
+            if policy is not None and not policy.stale():
+                return policy
+            host_lock = self._host_locks.setdefault(origin, threading.Lock())
+
+        with host_lock:
+            with self._lock:
+                policy = self._policies.get(origin)
+            if policy is None or policy.stale():
+                policy = self._fetch(origin)
+                with self._lock:
+                    self._policies[origin] = policy
+        return policy
+
+    def allowed(self, url):
+        return self.policy(url).allowed(url, self.agent)
+
+    def _fetch(self, origin):
+        robots_url = urljoin(origin, '/robots.txt')
+        try:
+            response = self.fetcher.get(robots_url, timeout=10)
+        except Exception:
+            response = None
+        if response is None or response.status_code >= 500:
+            response = self._cached(robots_url)
+            if response is None:
+                parser = RobotFileParser(robots_url)
+                parser.disallow_all = True
+                parser.modified()
+                return RobotsPolicy(robots_url, parser, retry_at=time.monotonic() + ROBOTS_RETRY)
+
+        parser = RobotFileParser(robots_url)
+        delays = {}
+        if response.status_code >= 400:
+            parser.allow_all = True
+        else:
+            lines = response.text.splitlines()
+            parser.parse(lines)
+            delays = parse_crawl_delays(lines)
+        parser.modified()
+        policy = RobotsPolicy(robots_url, parser, found=response.status_code == 200, delays=delays)
+
+        delay = policy.crawl_delay(self.agent)
+        if delay and self.scheduler is not None:
+            self.scheduler.set_delay(urlparse(origin).netloc, delay)
+        return policy
+
+    def _cached(self, robots_url):
+        """The last robots.txt stored in the fetcher's response cache, if any."""
+        cache = getattr(self.fetcher, 'cache', None)
+        if cache is None or cache.lookup(robots_url) is None:
+            return None
+        return cache.response(robots_url)
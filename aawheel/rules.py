@@ -0,0 +1,232 @@
+"""
+Declarative extraction rules.
+
+What the extractors in aawheel/extract.py look for (which blocks are
+sections, products or reviews, where the navigation lives, how many of
+each to keep) is read from a JSON rules file instead of being written into
+the code, so the scraper can be pointed at another supplier's site with a
+new file. extraction_rules.json at the repository root holds the rules for
+aawheel.com; another file only needs the sections and keys that differ.
+
+Each element test ("matcher") is either a CSS selector list or an object
+of tags and class keywords:
+
+    "h2, h3, div.title, [class*=name]"
+    {"tags": ["div", "article"], "class_keywords": ["product", "service"]}
+
+Selectors are limited to what one element's tag and class decide: a tag
+name or *, .class and [class*=text], combined (div.card[class*=item]) and
+comma-separated. A class keyword matches anywhere in the class attribute
+("product" matches class="products-grid"). Class tests ignore case.
+
+Rules are compiled once into a table of candidate tests per tag name, and
+the set of matchers an element satisfies is memoized by its tag and class
+attribute, so matching an element costs one dict lookup however many
+rules there are. Compiled rules are cached by the SHA-256 of their
+content, which also goes into page cache keys so that changed rules are
+never served extractions made with the old ones. Pickling sends only the
+digest and rules, and a worker process that has seen them before reuses
+its compiled copy.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+RULES_FILE = Path(__file__).resolve().parent.parent / 'extraction_rules.json'
+
+# Memoized (tag, class attribute) pairs kept per compiled rules
+MEMO_LIMIT = 10_000
+
+MATCHER = 'matcher'
+MATCHERS = 'matchers'
+LIMIT = 'limit'
+WORDS = 'words'
+
+SCHEMA = {
+    "navigation": {"menus": MATCHER, "headers": MATCHERS, "footer": MATCHER, "footer_limit": LIMIT},
+    "hero": {"block": MATCHER, "heading": MATCHER, "tagline": MATCHER},
+    "sections": {"block": MATCHER, "limit": LIMIT, "heading": MATCHER, "paragraph": MATCHER, "paragraph_limit": LIMIT},
+    "products": {"block": MATCHER, "limit": LIMIT, "name": MATCHER, "description": MATCHER},
+    "testimonials": {"block": MATCHER, "limit": LIMIT, "author": MATCHER, "text": MATCHER, "text_limit": LIMIT},
+    "contact": {"limit": LIMIT},
+    "social": {"networks": WORDS},
+    "links": {"containers": MATCHER},
+}
+
+_TAG = re.compile(r'\*|[a-zA-Z][\w-]*')
+_PART = re.compile(r'\.(?P<cls>[\w-]+)|\[class\*=(?P<quote>["\']?)(?P<keyword>[^"\'\]]+)(?P=quote)\]')
+_NO_MATCH = frozenset()
+
+class RulesError(ValueError):
+    """The rules are invalid; the message starts with the offending key."""
+
+def parse_selector(selector, where):
+    """[(tag or '*', exact classes, class substrings)] for a comma-separated selector list."""
+    compounds = []
+    for text in selector.split(','):
+        text = text.strip()
+        if not text:
+            raise RulesError(f"{where}: empty selector in {selector!r}")
+        match = _TAG.match(text)
+        tag = match.group().lower() if match else '*'
+        position = match.end() if match else 0
+        classes, keywords = set(), []
+        while position < len(text):
+            part = _PART.match(text, position)
+            if part is None:
+                raise RulesError(f"{where}: unsupported selector {text!r} (tag, *, .class and [class*=text] only)")
+            if part.group('cls'):
+                classes.add(part.group('cls').lower())
+            else:
+                keywords.append(part.group('keyword').lower())
+            position = part.end()
+        compounds.append((tag, frozenset(classes), tuple(keywords)))
+    return compounds
+
+def compile_matcher(matcher, where):
+    """[(tag, test)] for one matcher; test is (exact classes, all of these substrings, any of these substrings)."""
+    if isinstance(matcher, str):
+        return [(tag, (classes, keywords, ())) for tag, classes, keywords in parse_selector(matcher, where)]
+    if not isinstance(matcher, dict):
+        raise RulesError(f"{where}: expected a selector string or an object of tags and class_keywords")
+    unknown = set(matcher) - {"tags", "class_keywords"}
+    if unknown:
+        raise RulesError(f"{where}: unknown keys {sorted(unknown)}")
+    tags = _words(matcher.get("tags", ['*']), f"{where}.tags")
+    keywords = tuple(keyword.lower() for keyword in _words(matcher.get("class_keywords", []), f"{where}.class_keywords"))
+    return [(tag.lower(), (_NO_MATCH, (), keywords)) for tag in tags]
+
+def _words(value, where):
+    if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+        raise RulesError(f"{where}: expected a list of strings")
+    return value
+
+def _passes(test, classes):
+    required, substrings, keywords = test
+    if required and not required <= set(classes.split()):
+        return False
+    for substring in substrings:
+        if substring not in classes:
+            return False
+    if keywords:
+        for keyword in keywords:
+            if keyword in classes:
+                return True
+        return False
+    return True
+
+class Rules:
+    """Compiled extraction rules: rules[section][key] for limits, match() for elements."""
+
+    def __init__(self, spec, digest):
+        self.spec = spec
+        self.digest = digest
+        self._table = {}
+        self._memo = {}
+        for section, keys in SCHEMA.items():
+            for key, kind in keys.items():
+                if kind == MATCHER:
+                    self._add(f"{section}.{key}", spec[section][key], f"{section}.{key}")
+                elif kind == MATCHERS:
+                    for index, matcher in enumerate(spec[section][key]):
+                        self._add(f"{section}.{key}.{index}", matcher, f"{section}.{key}[{index}]")
+        self._wildcard = self._table.pop('*', [])
+
+    def _add(self, name, matcher, where):
+        for tag, test in compile_matcher(matcher, where):
+            self._table.setdefault(tag, []).append((name, test))
+
+    def __getitem__(self, section):
+        return self.spec[section]
+
+    def __reduce__(self):
+        return _restore, (self.spec, self.digest)
+
+    def match(self, name, classes):
+        """Names ("products.block", "navigation.headers.0", ...) of the matchers an element satisfies.
+
+        classes is the lower-cased, space-joined class attribute.
+        """
+        key = (name, classes)
+        matched = self._memo.get(key)
+        if matched is None:
+            found = [rule for rule, test in self._table.get(name, ()) if _passes(test, classes)]
+            found += [rule for rule, test in self._wildcard if _passes(test, classes)]
+            matched = frozenset(found) if found else _NO_MATCH
+            if len(self._memo) >= MEMO_LIMIT:
+                self._memo.clear()
+            self._memo[key] = matched
+        return matched
+
+_compiled = {}
+_defaults = None
+_default_rules = None
+
+def default_spec():
+    """The rules in RULES_FILE, which also fill in anything another rules file leaves out."""
+    global _defaults
+    if _defaults is None:
+        with open(RULES_FILE, encoding='utf-8') as f:
+            _defaults = json.load(f)
+    return _defaults
+
+def validate(spec, where='rules'):
+    """Merge spec over the default rules and check every key; returns the full rules."""
+    if not isinstance(spec, dict):
+        raise RulesError(f"{where}: expected an object")
+    unknown = set(spec) - set(SCHEMA)
+    if unknown:
+        raise RulesError(f"{where}: unknown sections {sorted(unknown)}")
+    defaults = default_spec()
+    merged = {}
+    for section, keys in SCHEMA.items():
+        values = spec.get(section, {})
+        if not isinstance(values, dict):
+            raise RulesError(f"{section}: expected an object")
+        unknown = set(values) - set(keys)
+        if unknown:
+            raise RulesError(f"{section}: unknown keys {sorted(unknown)}")
+        merged[section] = dict(defaults[section], **values)
+        for key, kind in keys.items():
+            value = merged[section][key]
+            if kind == LIMIT and (type(value) is not int or value < 0):
+                raise RulesError(f"{section}.{key}: expected a non-negative integer")
+            if kind == WORDS:
+                _words(value, f"{section}.{key}")
+            if kind == MATCHERS and (not isinstance(value, list) or not value):
+                raise RulesError(f"{section}.{key}: expected a non-empty list of matchers")
+    return merged
+
+def compile_rules(spec):
+    """Validate and compile a rules dict, reusing an earlier compilation of the same rules."""
+    merged = validate(spec)
+    digest = hashlib.sha256(json.dumps(merged, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+    return _restore(merged, digest)
+
+def _restore(spec, digest):
+    rules = _compiled.get(digest)
+    if rules is None:
+        rules = _compiled[digest] = Rules(spec, digest)
+    return rules
+
+def load_rules(path=None):
+    """Compiled rules from a JSON file (RULES_FILE by default)."""
+    path = Path(path or RULES_FILE)
+    with open(path, encoding='utf-8') as f:
+        try:
+            spec = json.load(f)
+        except json.JSONDecodeError as e:
+            raise RulesError(f"{path.name}: {e}") from None
+    try:
+        return compile_rules(spec)
+    except RulesError as e:
+        raise RulesError(f"{path.name}: {e}") from None
+
+def default_rules():
+    """The compiled RULES_FILE rules, shared by every extractor not given others."""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = compile_rules({})
+    return _default_rules
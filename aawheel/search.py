@@ -0,0 +1,171 @@
+"""
+Prebuilt product search index.
+
+build_search_index() turns the product list from website_data.json into a
+compact JSON index that the products page loads instead of scanning every
+product on each keystroke:
+
+    terms     sorted stemmed terms
+    postings  per term, the ids (positions in content.products) of the
+              products containing it, delta-encoded
+    prefixes  first two letters of a term -> [start, end) range in terms,
+              so prefix lookups for the word being typed scan one bucket
+    words     sorted unstemmed words whose stem differs from the word, and
+    stems     the position in terms of each word's stem, so a partly typed
+              word ("lightin") finds its stemmed term ("light")
+    facets    category -> product ids
+
+tokenize(), stem() and search_products() are mirrored in lib/searchIndex.ts;
+the two must stay in sync or queries will not match the indexed terms.
+"""
+
+import bisect
+import json
+import re
+
+INDEX_VERSION = 2
+SEARCH_FIELDS = ("name", "category", "description")
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset("a an and are as at be by for from in is it of on or our that the to with your".split())
+
+# (suffix, replacement), first match wins; the stem must keep 3+ letters
+STEM_RULES = (
+    ("sses", "ss"),
+    ("ies", "y"),
+    ("ss", "ss"),
+    ("us", "us"),
+    ("is", "is"),
+    ("ments", ""),
+    ("ment", ""),
+    ("ness", ""),
+    ("ings", ""),
+    ("ing", ""),
+    ("edly", ""),
+    ("ed", ""),
+    ("ers", "er"),
+    ("ly", ""),
+    ("s", "")
+)
+
+def stem(word):
+    """Strip common English suffixes (plurals, -ing, -ed, -ly, -ment, -ness)."""
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    for suffix, replacement in STEM_RULES:
+        if word.endswith(suffix):
+            if len(word) - len(suffix) + len(replacement) < 3:
+                return word
+            return word[:len(word) - len(suffix)] + replacement
+    return word
+
+def tokenize(text):
+    """Lowercased alphanumeric words of text, minus stopwords."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+def _delta_encode(ids):
+    previous = 0
+    encoded = []
+    for doc in ids:
+        encoded.append(doc - previous)
+        previous = doc
+    return encoded
+
+def build_search_index(products, fields=SEARCH_FIELDS):
+    """Build the index for a list of product dicts (ids are list positions)."""
+    postings = {}
+    facets = {}
+    surface = {}
+    for doc, product in enumerate(products):
+        terms = set()
+        for field in fields:
+            for token in tokenize(product.get(field) or ""):
+                term = stem(token)
+                terms.add(term)
+                if term != token:
+                    surface[token] = term
+        for term in terms:
+            postings.setdefault(term, []).append(doc)
+        category = product.get("category")
+        if category:
+            facets.setdefault(category, []).append(doc)
+
+    terms = sorted(postings)
+    prefixes = {}
+    for position, term in enumerate(terms):
+        bucket = prefixes.setdefault(term[:2], [position, position + 1])
+        bucket[1] = position + 1
+    positions = {term: position for position, term in enumerate(terms)}
+    words = sorted(surface)
+
+    return {
+        "version": INDEX_VERSION,
+        "count": len(products),
+        "fields": list(fields),
+        "terms": terms,
+        "postings": [_delta_encode(postings[term]) for term in terms],
+        "prefixes": prefixes,
+        "words": words,
+        "stems": [positions[surface[word]] for word in words],
+        "facets": {"category": facets}
+    }
+
+def _postings(index, position):
+    ids = []
+    doc = 0
+    for delta in index["postings"][position]:
+        doc += delta
+        ids.append(doc)
+    return ids
+
+def _exact(index, term):
+    terms = index["terms"]
+    position = bisect.bisect_left(terms, term)
+    return _postings(index, position) if position < len(terms) and terms[position] == term else []
+
+def _prefix(index, prefix):
+    """Ids of products with a stemmed term or an unstemmed word starting with prefix."""
+    terms, words = index["terms"], index["words"]
+    matched = set()
+    position = bisect.bisect_left(terms, prefix)
+    while position < len(terms) and terms[position].startswith(prefix):
+        matched.add(position)
+        position += 1
+    position = bisect.bisect_left(words, prefix)
+    while position < len(words) and words[position].startswith(prefix):
+        matched.add(index["stems"][position])
+        position += 1
+    ids = set()
+    for position in matched:
+        ids.update(_postings(index, position))
+    return ids
+
+def search_products(index, query, category="all"):
+    """Ids of products matching every query word and the category (None = no filter).
+
+    The last word also matches as a prefix, like the search box does while typing.
+    """
+    tokens = tokenize(query)
+    lists = []
+    for i, token in enumerate(tokens):
+        ids = set(_exact(index, stem(token)))
+        if i == len(tokens) - 1:
+            ids |= _prefix(index, token)
+        lists.append(ids)
+    if category != "all":
+        lists.append(set(index["facets"]["category"].get(category, [])))
+    if not lists:
+        return None
+    lists.sort(key=len)
+    return sorted(set.intersection(*lists))
+
+def encode_search_index(website_data):
+    """The search_index.json text for website_data."""
+    index = build_search_index(website_data.get("content", {}).get("products", []))
+    return json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+
+def write_search_index(website_data, output_file="search_index.json"):
+    """Write the product search index for website_data. Returns its size in bytes."""
+    data = encode_search_index(website_data)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(data)
+    return len(data.encode('utf-8'))
@@ -0,0 +1,129 @@
+"""
+Sharded catalog output.
+
+write_shards() splits website_data into small JSON files that pages can
+fetch lazily: one per top-level section (site_info, navigation, contact,
+...), one per content section (hero, about, features, testimonials) and one
+per product category. File names carry a hash of their content, so an
+unchanged shard keeps its URL across builds and can be cached forever;
+manifest.json maps shard keys to the current files. Shards left over from
+the previous build are deleted.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+DEFAULT_SHARDS_DIR = "public/data"
+HASH_LENGTH = 10
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'other'
+
+def split_shards(website_data):
+    """{shard key: data} for website_data."""
+    shards = {}
+    for section, value in website_data.items():
+        if section != "content":
+            shards[section] = value
+    content = website_data.get("content", {})
+    for section, value in content.items():
+        if section != "products":
+            shards[f"content/{section}"] = value
+
+    categories = {}
+    for product in content.get("products", []):
+        categories.setdefault(product.get("category") or "Other", []).append(product)
+    for category, products in categories.items():
+        key = base = f"products/{slugify(category)}"
+        suffix = 2
+        while key in shards:
+            # Distinct categories that slugify alike ("A&B" and "A B")
+            key = f"{base}-{suffix}"
+            suffix += 1
+        shards[key] = {"category": category, "products": products}
+    return shards
+
+def encode_shards(shards):
+    """{shard key: (file name, encoded data)} for split_shards() output; file names carry a hash of the data."""
+    encoded = {}
+    for key, value in shards.items():
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        encoded[key] = (f"{key.replace('/', '.')}.{digest}.json", data)
+    return encoded
+
+def _write(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def load_manifest(output_dir=DEFAULT_SHARDS_DIR):
+    try:
+        with open(Path(output_dir) / MANIFEST_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_shards(website_data, output_dir=DEFAULT_SHARDS_DIR):
+    """Write content-hashed shards plus manifest.json. Returns (manifest, previous manifest)."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest(output_dir)
+
+    entries = {}
+    categories = {}
+    shards = split_shards(website_data)
+    for key, (filename, data) in encode_shards(shards).items():
+        value = shards[key]
+        path = output_dir / filename
+        if not path.exists():
+            _write(path, data)
+        entries[key] = {
+            "file": filename,
+            "bytes": len(data),
+            "gzip_bytes": len(gzip.compress(data, mtime=0)),
+            "items": len(value["products"]) if key.startswith("products/") else
+                     len(value) if isinstance(value, (list, dict)) else 1
+        }
+        if key.startswith("products/"):
+            categories[value["category"]] = key
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "shards": entries,
+        "categories": categories
+    }
+    _write(output_dir / MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    # Remove shards the new manifest no longer references
+    if previous:
+        current = {entry["file"] for entry in entries.values()}
+        for entry in previous.get("shards", {}).values():
+            if entry["file"] not in current:
+                (output_dir / entry["file"]).unlink(missing_ok=True)
+    return manifest, previous
+
+def size_report(manifest, previous=None):
+    """Lines describing each shard's size and its change since the previous build."""
+    old = (previous or {}).get("shards", {})
+    lines = []
+    for key, entry in sorted(manifest["shards"].items(), key=lambda item: -item[1]["bytes"]):
+        change = ""
+        if key not in old:
+            change = "  (new)"
+        elif entry["bytes"] != old[key]["bytes"]:
+            change = f"  ({entry['bytes'] - old[key]['bytes']:+,} B)"
+        lines.append(f"{key:<36} {entry['bytes'] / 1024:8.1f} KB {entry['gzip_bytes'] / 1024:8.1f} KB gz{change}")
+    for key in sorted(set(old) - set(manifest["shards"])):
+        lines.append(f"{key:<36} {'removed':>11}")
+    total = sum(entry["bytes"] for entry in manifest["shards"].values())
+    total_gzip = sum(entry["gzip_bytes"] for entry in manifest["shards"].values())
+    lines.append(f"{'total':<36} {total / 1024:8.1f} KB {total_gzip / 1024:8.1f} KB gz")
+    return lines
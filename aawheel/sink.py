@@ -0,0 +1,116 @@
+"""
+Streaming JSONL sink for crawl results.
+
+Every extracted page is appended to a JSONL file as soon as it is done:
+one record per section, product and testimonial, followed by a "page"
+record carrying the rest of the page and its outgoing links. The page
+record is written last and acts as the commit marker, so the file can be
+appended to by a resumed run and compacted into website_data.json later
+without holding the crawl in memory. Appending first cuts the file back to
+its last page record, dropping the items of a page whose write was killed.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+# Content lists that are written as one record per item
+ITEM_TYPES = {
+    "sections": "section",
+    "products": "product",
+    "testimonials": "testimonial"
+}
+
+def page_records(page, links):
+    """Split an extracted page into item records plus a final page record."""
+    url = page["url"]
+    records = []
+    content = dict(page["content"])
+    for field, record_type in ITEM_TYPES.items():
+        for item in content.pop(field, []):
+            records.append(dict(item, type=record_type, url=url))
+    record = {key: value for key, value in page.items() if key != "content"}
+    record.update(type="page", content=content, links=links)
+    records.append(record)
+    return records
+
+def read_records(path):
+    """Yield records from a JSONL file, ignoring a torn final line."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            try:
+                yield json.loads(line)
+            except ValueError:
+                break
+
+def read_pages(path):
+    """Yield (page, links) for every complete page in a JSONL file.
+
+    Item records are buffered until their page record arrives; items of a
+    page that never got its page record (interrupted write) are dropped,
+    as are buffered items whose url is not the page record's.
+    """
+    buffered = []
+    types = {record_type: field for field, record_type in ITEM_TYPES.items()}
+    for record in read_records(path):
+        record_type = record.pop("type", None)
+        if record_type in types:
+            buffered.append((types[record_type], record.pop("url", None), record))
+        elif record_type == "page":
+            items = {field: [] for field in ITEM_TYPES}
+            for field, url, item in buffered:
+                if url == record.get("url"):
+                    items[field].append(item)
+            links = record.pop("links", [])
+            record["content"] = dict(record["content"], **items)
+            yield record, links
+            buffered = []
+
+class JsonlSink:
+    """Thread-safe append-only writer of page records."""
+
+    def __init__(self, path, append=False):
+        self.path = Path(path)
+        self.pages = 0
+        self._lock = threading.Lock()
+        if append and self.path.exists():
+            self._truncate_to_last_page()
+            self._file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+
+    def _truncate_to_last_page(self):
+        """Cut the file after its last page record, dropping any records of an unfinished page."""
+        end = 0
+        with open(self.path, 'rb+') as f:
+            for line in iter(f.readline, b''):
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record.get("type") == "page":
+                    end = f.tell()
+            f.truncate(end)
+
+    def write_page(self, page, links=()):
+        """Append one page's records and flush them to disk."""
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in page_records(page, list(links)))
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.pages += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
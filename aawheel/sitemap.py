@@ -0,0 +1,124 @@
+"""
+Sitemap discovery.
+
+Sitemaps (from robots.txt Sitemap: lines, or /sitemap.xml) are streamed
+through ElementTree.iterparse: each <url> or <sitemap> element is dropped
+as soon as it has been read, so memory stays flat on multi-MB sitemaps.
+Gzipped sitemaps are decompressed on the fly and sitemap index files are
+followed breadth-first, each sitemap once.
+
+discover() keeps only the `limit` best entries in a bounded heap: highest
+<priority> first, then the most recently modified, then document order.
+"""
+
+import gzip
+import heapq
+import io
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+DEFAULT_PRIORITY = 0.5
+MAX_SITEMAPS = 100
+GZIP_MAGIC = b'\x1f\x8b'
+
+class SitemapEntry(NamedTuple):
+    url: str
+    lastmod: float | None
+    priority: float
+
+def parse_lastmod(value):
+    """W3C datetime (2024-05-01, 2024-05-01T12:00:00Z, ...) as a Unix timestamp, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def _local_name(tag):
+    return tag.rpartition('}')[2]
+
+def iter_sitemap(stream):
+    """Yield (kind, SitemapEntry) for a sitemap ("url") or sitemap index ("sitemap")."""
+    root = None
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            continue
+        kind = _local_name(element.tag)
+        if kind not in ('url', 'sitemap'):
+            continue
+        fields = {_local_name(child.tag): (child.text or '').strip() for child in element}
+        if fields.get('loc'):
+            try:
+                priority = float(fields.get('priority') or DEFAULT_PRIORITY)
+            except ValueError:
+                priority = DEFAULT_PRIORITY
+            yield kind, SitemapEntry(fields['loc'], parse_lastmod(fields.get('lastmod')), priority)
+        element.clear()
+        # The root still references every finished child until cleared
+        root.clear()
+
+def open_sitemap(fetcher, url):
+    """Stream a sitemap body, gunzipping it if it is gzip data. Returns (response, stream)."""
+    response = fetcher.get(url, stream=True, timeout=30)
+    response.raise_for_status()
+    response.raw.decode_content = True
+    # urllib3 closes the stream at EOF, which BufferedReader reports as an error
+    response.raw.auto_close = False
+    stream = io.BufferedReader(response.raw)
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+    return response, stream
+
+def discover(sitemap_urls, fetcher, limit, accept=None):
+    """Read sitemaps (following index files) and return the `limit` best entries, best first.
+
+    accept(url) filters page URLs before they compete for a place. Returns
+    (entries, stats) with stats counting sitemaps read and page URLs seen
+    and listing (sitemap url, error) for sitemaps that could not be read.
+    """
+    if limit <= 0:
+        return [], {"sitemaps": 0, "urls": 0, "errors": []}
+    queue = list(dict.fromkeys(sitemap_urls))
+    visited = set(queue)
+    stats = {"sitemaps": 0, "urls": 0, "errors": []}
+    heap = []
+    members = set()
+    index = 0
+    while queue and stats["sitemaps"] < MAX_SITEMAPS:
+        sitemap_url = queue.pop(0)
+        try:
+            response, stream = open_sitemap(fetcher, sitemap_url)
+            try:
+                for kind, entry in iter_sitemap(stream):
+                    if kind == 'sitemap':
+                        if entry.url not in visited:
+                            visited.add(entry.url)
+                            queue.append(entry.url)
+                        continue
+                    stats["urls"] += 1
+                    if entry.url in members or (accept is not None and not accept(entry.url)):
+                        continue
+                    index += 1
+                    item = (entry.priority, entry.lastmod or 0.0, -index, entry)
+                    if len(heap) < limit:
+                        heapq.heappush(heap, item)
+                        members.add(entry.url)
+                    elif item > heap[0]:
+                        members.discard(heapq.heapreplace(heap, item)[3].url)
+                        members.add(entry.url)
+            finally:
+                response.close()
+            stats["sitemaps"] += 1
+        except Exception as e:
+            stats["errors"].append((sitemap_url, str(e)))
+    return [item[3] for item in sorted(heap, reverse=True)], stats
@@ -0,0 +1,218 @@
+"""
+Streaming HTML tokenizer for very large pages.
+
+Instead of building a tree and walking it, page bytes are decoded and
+tokenized as they arrive and every element start/end and string goes
+straight to an ExtractionEngine. Nothing is kept once its events have been
+sent, so memory is bounded by the open-element stack and the longest
+single token (usually one text run), not by the page size.
+
+The events are the ones the html.parser backend's BeautifulSoup walk would
+produce, because the same stdlib tokenizer is used and BeautifulSoup's
+tree-building rules are applied on the fly:
+
+    - void elements (<br>, <img>, ...) close at once and a later </br> is
+      ignored; <tag/> opens and closes tag
+    - an end tag closes every element opened after the most recent open
+      element of its name, and is ignored if none is open
+    - adjacent text is joined, and whitespace-only strings outside <pre>
+      and <textarea> collapse to '\\n' or ' '
+    - multi-valued attributes (class, rel, ...) become lists
+    - elements still open at the end of the input are closed then
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+
+from bs4.builder import HTMLParserTreeBuilder
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+from aawheel.extract import OTHER, TEXT
+
+CHUNK_SIZE = 64 * 1024
+
+_BUILDER = HTMLParserTreeBuilder()
+VOID_ELEMENTS = frozenset(_BUILDER.empty_element_tags)
+PRESERVE_WHITESPACE = frozenset(_BUILDER.preserve_whitespace_tags)
+STRING_CONTAINERS = frozenset(_BUILDER.string_containers)
+LIST_ATTRIBUTES = {name: frozenset(attrs) for name, attrs in _BUILDER.cdata_list_attributes.items()}
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+_NON_WHITESPACE = re.compile(r'\S+')
+_NUMERIC_PREFIX = {10: re.compile(r'^([0-9]+)(.*)', re.S), 16: re.compile(r'^([0-9a-f]+)(.*)', re.S)}
+
+class StreamDecoder:
+    """Incremental UTF-8 decoding that switches to cp1252 at the first invalid byte.
+
+    Matches parsers.decode_html() for any page whose invalid bytes come
+    before its first non-ASCII UTF-8 character (in practice, every page).
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.fallback = False
+        self.bytes = 0
+
+    def decode(self, chunk, final=False):
+        if isinstance(chunk, str):
+            return chunk
+        self.bytes += len(chunk)
+        if self.fallback:
+            return chunk.decode('cp1252', errors='replace')
+        try:
+            return self._decoder.decode(chunk, final)
+        except UnicodeDecodeError as e:
+            self.fallback = True
+            return e.object[:e.start].decode('utf-8-sig') + e.object[e.start:].decode('cp1252', errors='replace')
+
+class StreamTokenizer(HTMLParser):
+    """html.parser tokenizer that turns tokens into ExtractionEngine events."""
+
+    def __init__(self, engine):
+        super().__init__(convert_charrefs=False)
+        self.engine = engine
+        self.names = []
+        self.open_counts = {}
+        self.pending = []
+        # Open <script>/<style>/... and <pre>/<textarea> elements
+        self.containers = 0
+        self.preserving = 0
+        # Void elements closed at their start tag whose </name> may still follow.
+        # BeautifulSoup keeps these in a list that only grows on pages that
+        # never write </img>, making every end tag a linear scan; counts
+        # behave the same in constant time and space.
+        self.closed_voids = {}
+
+    def _flush(self, kind=None):
+        if not self.pending:
+            return
+        string = ''.join(self.pending)
+        self.pending = []
+        if not self.preserving and not string.strip(ASCII_SPACES):
+            string = '\n' if '\n' in string else ' '
+        if kind is None:
+            kind = OTHER if self.containers else TEXT
+        self.engine.text(string, kind)
+
+    def _push(self, name, attrs):
+        self._flush()
+        self.engine.start(name, attrs, len(self.names))
+        self.names.append(name)
+        self.open_counts[name] = self.open_counts.get(name, 0) + 1
+        if name in STRING_CONTAINERS:
+            self.containers += 1
+        if name in PRESERVE_WHITESPACE:
+            self.preserving += 1
+
+    def _pop_to(self, name):
+        self._flush()
+        if not self.open_counts.get(name):
+            return
+        while self.names:
+            popped = self._pop()
+            if popped == name:
+                break
+
+    def _pop(self):
+        name = self.names.pop()
+        self.open_counts[name] -= 1
+        if name in STRING_CONTAINERS:
+            self.containers -= 1
+        if name in PRESERVE_WHITESPACE:
+            self.preserving -= 1
+        self.engine.end(name, len(self.names))
+        return name
+
+    def _attributes(self, name, attrs):
+        values = {}
+        for key, value in attrs:
+            values[key] = '' if value is None else value
+        for table in ('*', name):
+            for key in LIST_ATTRIBUTES.get(table, ()):
+                if key in values:
+                    values[key] = _NON_WHITESPACE.findall(values[key])
+        return values
+
+    def handle_starttag(self, tag, attrs):
+        self._push(tag, self._attributes(tag, attrs))
+        if tag in VOID_ELEMENTS:
+            self._pop_to(tag)
+            self.closed_voids[tag] = self.closed_voids.get(tag, 0) + 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._push(tag, self._attributes(tag, attrs))
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag):
+        if self.closed_voids.get(tag):
+            self.closed_voids[tag] -= 1
+        else:
+            self._pop_to(tag)
+
+    def handle_data(self, data):
+        self.pending.append(data)
+
+    def handle_charref(self, name):
+        base = 10
+        if name.startswith(('x', 'X')):
+            name = name[1:]
+            base = 16
+        extra = ''
+        try:
+            number = int(name, base)
+        except ValueError:
+            # Unterminated reference: the leading digits are the reference, the rest is text
+            match = _NUMERIC_PREFIX[base].search(name)
+            if match is None:
+                self.pending.append(name)
+                return
+            number, extra = int(match.group(1), base), match.group(2)
+        self.pending.append(UnicodeDammit.numeric_character_reference(number)[0])
+        if extra:
+            self.pending.append(extra)
+
+    def handle_entityref(self, name):
+        self.pending.append(EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name, f"&{name}"))
+
+    def _other(self, string, kind=OTHER):
+        self._flush()
+        self.pending.append(string)
+        self._flush(kind)
+
+    def handle_comment(self, data):
+        self._other(data)
+
+    def handle_decl(self, decl):
+        self._other(decl[len("DOCTYPE "):])
+
+    def handle_pi(self, data):
+        self._other(data)
+
+    def unknown_decl(self, data):
+        if data.upper().startswith("CDATA["):
+            self._other(data[len("CDATA["):], TEXT)
+        else:
+            self._other(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+        while self.names:
+            self._pop()
+
+def iter_chunks(content, size=CHUNK_SIZE):
+    """Slices of page bytes or text, as if they were arriving over the network."""
+    for offset in range(0, len(content), size):
+        yield content[offset:offset + size]
+
+def feed(chunks, engine):
+    """Tokenize an iterable of byte (or str) chunks into engine events. Returns the bytes read."""
+    decoder = StreamDecoder()
+    tokenizer = StreamTokenizer(engine)
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            tokenizer.feed(text)
+    tokenizer.feed(decoder.decode(b'', final=True))
+    tokenizer.close()
+    return decoder.bytes
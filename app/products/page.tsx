@@ -1,49 +1,24 @@
 'use client'
 
-import { useState, useEffect } from 'react'
+import { useState, useMemo } from 'react'
 import ProductCard from '@/components/ProductCard'
 import ProductSearch from '@/components/ProductSearch'
 import ScrollAnimation from '@/components/ScrollAnimation'
 import Link from 'next/link'
 import websiteData from '@/website_data.json'
+import productIndex from '@/search_index.json'
+import { searchProducts, SearchIndex } from '@/lib/searchIndex'
 
 export default function Products() {
   const allProducts = websiteData.content.products
-  const categories = Array.from(new Set(allProducts.map(p => p.category)))
-  const [filteredProducts, setFilteredProducts] = useState(allProducts)
+  const categories = Object.keys(productIndex.facets.category)
   const [selectedCategory, setSelectedCategory] = useState('all')
   const [searchQuery, setSearchQuery] = useState('')
-  const [isLoading, setIsLoading] = useState(false)
 
-  useEffect(() => {
-    setIsLoading(true)
-    
-    // Simulate API call delay
-    const timer = setTimeout(() => {
-      let filtered = allProducts
-
-      // Filter by category
-      if (selectedCategory !== 'all') {
-        filtered = filtered.filter(product =>
-          product.category.toLowerCase() === selectedCategory.toLowerCase()
-        )
-      }
-
-      // Filter by search query
-      if (searchQuery) {
-        const query = searchQuery.toLowerCase()
-        filtered = filtered.filter(product =>
-          product.name.toLowerCase().includes(query) ||
-          product.description.toLowerCase().includes(query) ||
-          product.category.toLowerCase().includes(query)
-        )
-      }
-
-      setFilteredProducts(filtered)
-      setIsLoading(false)
-    }, 300)
-
-    return () => clearTimeout(timer)
+  // Intersect prebuilt postings instead of scanning every product
+  const filteredProducts = useMemo(() => {
+    const ids = searchProducts(productIndex as SearchIndex, searchQuery, selectedCategory)
+    return ids === null ? allProducts : ids.map(id => allProducts[id])
   }, [selectedCategory, searchQuery, allProducts])
 
   const handleCategoryChange = (category: string) => {
@@ -80,52 +55,40 @@ export default function Products() {
             totalProducts={allProducts.length}
           />
 
-          {/* Loading State */}
-          {isLoading && (
+          {/* Products Grid */}
+          {filteredProducts.length > 0 ? (
+            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
+              {filteredProducts.map((product, index) => (
+                <ScrollAnimation key={index} direction="up" delay={index * 50}>
+                  <ProductCard
+                    name={product.name}
+                    description={product.description}
+                    image={product.image}
+                    category={product.category}
+                  />
+                </ScrollAnimation>
+              ))}
+            </div>
+          ) : (
             <div className="text-center py-12">
-              <div className="inline-block animate-spin rounded-full h-8 w-8 border-b-2 border-primary-600"></div>
-              <p className="mt-4 text-gray-600">Searching products...</p>
+              <svg className="mx-auto h-12 w-12 text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9.172 16.172a4 4 0 015.656 0M9 10h.01M15 10h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z" />
+              </svg>
+              <h3 className="mt-4 text-lg font-semibold text-gray-900">No products found</h3>
+              <p className="mt-2 text-gray-600">
+                Try adjusting your search or filter criteria
+              </p>
+              <button
+                onClick={() => {
+                  setSearchQuery('')
+                  setSelectedCategory('all')
+                }}
+                className="mt-4 btn-primary"
+              >
+                Clear Filters
+              </button>
             </div>
           )}
-
-          {/* Products Grid */}
-          {!isLoading && (
-            <>
-              {filteredProducts.length > 0 ? (
-                <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
-                  {filteredProducts.map((product, index) => (
-                    <ScrollAnimation key={index} direction="up" delay={index * 50}>
-                      <ProductCard
-                        name={product.name}
-                        description={product.description}
-                        image={product.image}
-                        category={product.category}
-                      />
-                    </ScrollAnimation>
-                  ))}
-                </div>
-              ) : (
-                <div className="text-center py-12">
-                  <svg className="mx-auto h-12 w-12 text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                    <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9.172 16.172a4 4 0 015.656 0M9 10h.01M15 10h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z" />
-                  </svg>
-                  <h3 className="mt-4 text-lg font-semibold text-gray-900">No products found</h3>
-                  <p className="mt-2 text-gray-600">
-                    Try adjusting your search or filter criteria
-                  </p>
-                  <button
-                    onClick={() => {
-                      setSearchQuery('')
-                      setSelectedCategory('all')
-                    }}
-                    className="mt-4 btn-primary"
-                  >
-                    Clear Filters
-                  </button>
-                </div>
-              )}
-            </>
-          )}
         </div>
       </section>
 
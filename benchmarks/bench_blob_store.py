@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-product image files vs the content-addressed store.
+
+Creates N product images drawn from a smaller set of distinct pictures
+(some stored byte-identical, some re-encoded at another quality), then
+compares the bytes a deployment ships as one named file per product with
+the blob store, times bulk perceptual hashing (serial vs the process
+pool, then the cached re-run) and times near-duplicate search with band
+buckets against comparing every pair. Checks that both searches agree and
+that every re-encoded copy is found.
+
+Run with: python benchmarks/bench_blob_store.py --products 2000 --distinct 200
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from itertools import combinations
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aawheel.blobs import NEAR_DUPLICATE_BITS, BlobStore, dhash
+from aawheel.downloads import file_sha256
+from aawheel.fingerprint import hamming, near_duplicates
+from aawheel.images import load_pillow
+
+def make_picture(Image, ImageDraw, seed):
+    rng = random.Random(seed)
+    image = Image.new('RGB', (400, 300), tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randrange(400), rng.randrange(300)
+        draw.ellipse((x, y, x + rng.randrange(40, 200), y + rng.randrange(40, 150)),
+                     fill=tuple(rng.randrange(256) for _ in range(3)))
+    return image
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<40} {time.perf_counter() - start:8.3f}s")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare named image files with the content-addressed store')
+    parser.add_argument('--products', type=int, default=2000, help='Product images')
+    parser.add_argument('--distinct', type=int, default=200, help='Distinct pictures among them')
+    parser.add_argument('--reencoded', type=float, default=0.1, help='Share of products using a re-encoded copy')
+    parser.add_argument('--workers', type=int, default=None, help='Processes for hashing (default: all cores)')
+    args = parser.parse_args()
+
+    Image, _ = load_pillow()
+    from PIL import ImageDraw
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        named = tmp / 'named'
+        named.mkdir()
+        originals = []
+        for i in range(args.distinct):
+            path = tmp / 'pictures' / f"{i}.jpg"
+            path.parent.mkdir(exist_ok=True)
+            make_picture(Image, ImageDraw, i).save(path, quality=90)
+            originals.append(path)
+        reencoded = {}
+        for i in range(args.products):
+            picture = rng.randrange(args.distinct)
+            dest = named / f"product-{i}.jpg"
+            if rng.random() < args.reencoded:
+                with Image.open(originals[picture]) as image:
+                    image.save(dest, quality=70)
+                reencoded[dest] = originals[picture]
+            else:
+                shutil.copyfile(originals[picture], dest)
+
+        store = BlobStore(tmp / 'blobs')
+        def load():
+            for path in named.iterdir():
+                sha256, _ = store.put_file(path)
+                store.assign(path.stem, sha256)
+        timed(f"store {args.products:,} product images", load)
+        named_bytes = sum(path.stat().st_size for path in named.iterdir())
+        blob_bytes = sum(blob["bytes"] for blob in store.blobs.values())
+        print(f"{'named files':<40} {args.products:8,} files {named_bytes / 2**20:7.1f}MB")
+        print(f"{'blob store':<40} {len(store.blobs):8,} files {blob_bytes / 2**20:7.1f}MB")
+
+        sample = list(store.blobs)[:100]
+        serial = timed(f"dhash serial ({len(sample)} blobs)", lambda: [dhash(store.path(sha256)) for sha256 in sample])
+        hashes = timed(f"dhash bulk ({len(store.blobs):,} blobs)", lambda: store.hash_all(args.workers))
+        timed("dhash bulk again (cached)", lambda: store.hash_all(args.workers))
+        failures = sum(hashes[sha256] != value for sha256, value in zip(sample, serial))
+
+        banded = timed("near-duplicates (band buckets)", lambda: near_duplicates(hashes, NEAR_DUPLICATE_BITS))
+        brute = timed("near-duplicates (every pair)", lambda: [
+            (a, b) for a, b in combinations(sorted(hashes), 2)
+            if hamming(hashes[a], hashes[b]) <= NEAR_DUPLICATE_BITS])
+        pairs = {(a, b) for a, b, _ in banded}
+        if pairs != set(brute):
+            print("✗ Band buckets and every-pair search disagree")
+            failures += 1
+
+        # Each re-encoded copy should pair with its original, if a product uses that too
+        missed = 0
+        for copy, original in reencoded.items():
+            a, b = sorted((store.refs[copy.stem], file_sha256(original)))
+            if a != b and a in store.blobs and b in store.blobs and (a, b) not in pairs:
+                missed += 1
+        print(f"{'near-duplicate pairs':<40} {len(pairs):8,}")
+        print(f"{'re-encoded copies missed':<40} {missed:8,}")
+        failures += missed > 0
+        sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
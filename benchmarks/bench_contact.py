@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: original contact extraction vs the one-pass ContactScanner.
+
+For each synthetic page, times the original extract_contact_info() (two
+findall() calls over get_text() plus a find_all(string=regex) tree scan)
+against feeding the page strings to ContactScanner and scanning once. Also
+checks that the scanner finds exactly the phones and emails the original
+patterns find (normalized, in page order) and every address string.
+
+Run with: python benchmarks/bench_contact.py --sizes 100000 1000000 5000000
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from bs4.element import CData, NavigableString
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from aawheel.contact import ContactScanner, normalize_email, normalize_phone
+from fixtures import make_page
+import legacy_extract
+
+# Strings the engine passes to extractors as TEXT (ExtractionEngine.feed_soup)
+MAIN_STRING_TYPES = (NavigableString, CData)
+
+LEGACY_PHONE = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+LEGACY_EMAIL = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+LEGACY_ADDRESS = re.compile(r'\d+.*(Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr)', re.I)
+
+def ordered(values):
+    return list(dict.fromkeys(value for value in values if value is not None))
+
+def scan(strings):
+    scanner = ContactScanner()
+    for string, is_text in strings:
+        scanner.feed(string, is_text)
+    return scanner.scan()
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        result = func()
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def matches_original(soup, strings, found):
+    text = soup.get_text()
+    phones = ordered(normalize_phone(raw) for raw in re.findall(LEGACY_PHONE, text))
+    emails = ordered(normalize_email(raw) for raw in re.findall(LEGACY_EMAIL, text))
+    addresses = ordered(string.strip() for string, _ in strings if LEGACY_ADDRESS.search(string))
+    # Phones inside emails are deliberately not reported by the scanner
+    email_digits = {re.sub(r'\D', '', email) for email in emails}
+    phones = [phone for phone in phones if not any(phone[2:] in digits for digits in email_digits)]
+    return ([m.value for m in found["phone"]] == phones and
+            [m.value for m in found["email"]] == emails and
+            ordered(m.raw for m in found["address"]) == addresses)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare original and one-pass contact extraction')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000], help='Synthetic page sizes in bytes')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    print(f"{'page':<20} {'original':>9} {'scanner':>9} {'speedup':>8} {'phones':>7} {'emails':>7}  output")
+    mismatches = 0
+    for size in args.sizes:
+        soup = BeautifulSoup(make_page(size, seed=size), 'html.parser')
+        strings = [(str(s), type(s) in MAIN_STRING_TYPES) for s in soup.descendants if isinstance(s, str)]
+        original, _ = best_time(lambda: legacy_extract.extract_contact_info(soup), args.repeat)
+        scanner, found = best_time(lambda: scan(strings), args.repeat)
+        same = matches_original(soup, strings, found)
+        mismatches += not same
+        print(f"{f'synthetic {size // 1000} KB':<20} {original:8.3f}s {scanner:8.3f}s {original / scanner:7.1f}x "
+              f"{len(found['phone']):>7} {len(found['email']):>7}  {'identical' if same else 'MISMATCH'}")
+
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: original multi-pass extractors vs the single-pass engine.
+
+Parses large synthetic catalog pages (or saved HTML files passed with
+--html) once, then measures per-page CPU time for running all extractors
+both ways and checks that their output is identical.
+
+Run with: python benchmarks/bench_extract.py --sizes 100000 1000000 5000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from aawheel import extract
+from fixtures import make_page
+import legacy_extract
+
+BASE_URL = 'https://aawheel.com/'
+
+def run_legacy(soup):
+    return {
+        "navigation": legacy_extract.extract_navigation(soup, BASE_URL),
+        "content": legacy_extract.extract_content(soup),
+        "contact": legacy_extract.extract_contact_info(soup),
+        "social": legacy_extract.extract_social_links(soup, BASE_URL)
+    }
+
+def run_engine(soup):
+    data = extract.extract_all(soup, BASE_URL)
+    del data["hrefs"]
+    return data
+
+def same_output(legacy_data, engine_data):
+    """Compare everything except phones/emails, which the engine normalizes
+    (bench_contact.py checks those against the original patterns)."""
+    legacy_contact, engine_contact = legacy_data["contact"], engine_data["contact"]
+    strip = {"phone": None, "email": None, "address": None}
+    if dict(legacy_data, contact=dict(legacy_contact, **strip)) != dict(engine_data, contact=dict(engine_contact, **strip)):
+        return False
+    # The engine de-duplicates addresses before taking the first five
+    addresses = list(dict.fromkeys(legacy_contact["address"]))
+    return engine_contact["address"][:len(addresses)] == addresses
+
+def cpu_time(func, soup, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        result = func(soup)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare multi-pass and single-pass extraction CPU time')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000], help='Synthetic page sizes in bytes')
+    parser.add_argument('--html', nargs='*', default=[], help='Saved HTML files to benchmark as well')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    pages = [(f"synthetic {size // 1000} KB", make_page(size, seed=size)) for size in args.sizes]
+    pages += [(path, Path(path).read_text(encoding='utf-8', errors='replace')) for path in args.html]
+
+    print(f"{'page':<28} {'parse':>9} {'legacy':>9} {'engine':>9} {'speedup':>8}  output")
+    mismatches = 0
+    for label, html in pages:
+        start = time.process_time()
+        soup = BeautifulSoup(html, 'html.parser')
+        parse = time.process_time() - start
+        legacy, legacy_data = cpu_time(run_legacy, soup, args.repeat)
+        engine, engine_data = cpu_time(run_engine, soup, args.repeat)
+        same = same_output(legacy_data, engine_data)
+        mismatches += not same
+        print(f"{label:<28} {parse:8.3f}s {legacy:8.3f}s {engine:8.3f}s {legacy / engine:7.1f}x  {'identical' if same else 'MISMATCH'}")
+
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial per-call requests.get vs the pooled Fetcher.
+
+Starts a local keep-alive HTTP server (in its own process, so it does not
+compete for the client's GIL) as a stand-in for the real site and fetches the same batch of URLs both ways, reporting throughput and how many
+TCP connections each approach opened.
+
+Run with: python benchmarks/bench_fetch.py --requests 500
+"""
+
+import argparse
+import multiprocessing
+import socket
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aawheel.fetch import Fetcher
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves a fixed HTML body on every path over HTTP/1.1 keep-alive."""
+
+    protocol_version = 'HTTP/1.1'
+    body = b'<html><body>' + b'<p>AA Wheel</p>' * 500 + b'</body></html>'
+    connections = None
+    latency = 0.0
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.connections.get_lock():
+            self.connections.value += 1
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+def serve(latency, connections, port_queue):
+    StandInHandler.latency = latency
+    StandInHandler.connections = connections
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def start_server(latency, connections):
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(latency, connections, port_queue), daemon=True)
+    process.start()
+    return process, port_queue.get()
+
+def run_serial(urls):
+    for url in urls:
+        requests.get(url, timeout=15).raise_for_status()
+
+def run_pooled(urls, per_host):
+    with Fetcher(pool_size=per_host, per_host=per_host) as fetcher:
+        for response in fetcher.fetch_all(urls):
+            if isinstance(response, Exception):
+                raise response
+            response.raise_for_status()
+
+def measure(label, connections, func, *args):
+    connections.value = 0
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    count = len(args[0])
+    print(f"{label:<8} {elapsed:8.3f}s  {count / elapsed:9.1f} req/s  {connections.value:5d} connections")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare serial and pooled fetch throughput')
+    parser.add_argument('--requests', type=int, default=500, help='Number of URLs to fetch')
+    parser.add_argument('--per-host', type=int, default=8, help='Per-host concurrency for the pooled fetcher')
+    parser.add_argument('--latency', type=float, default=0.005, help='Simulated server latency in seconds')
+    args = parser.parse_args()
+
+    connections = multiprocessing.Value('i', 0)
+    server, port = start_server(args.latency, connections)
+    base = f"http://127.0.0.1:{port}"
+    urls = [f"{base}/page/{i}" for i in range(args.requests)]
+
+    print(f"Fetching {args.requests} URLs from {base} ({args.latency * 1000:.0f} ms latency)")
+    serial = measure('serial', connections, run_serial, urls)
+    pooled = measure('pooled', connections, run_pooled, urls, args.per_host)
+    print(f"Speedup: {serial / pooled:.1f}x")
+    server.terminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: crawl frontier at scale.
+
+Fills a CrawlFrontier database with N URLs, then measures membership checks,
+claiming work from the queue and how long a resumed crawl takes to reopen
+the database.
+
+Run with: python benchmarks/bench_frontier.py --urls 200000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aawheel.frontier import DONE, CrawlFrontier
+
+def timed(label, func, count=None):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    rate = f"  ({count / elapsed:,.0f}/s)" if count else ""
+    print(f"{label:<34} {elapsed:8.3f}s{rate}")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure frontier insert, lookup and reopen cost')
+    parser.add_argument('--urls', type=int, default=200_000, help='Number of URLs to enqueue')
+    args = parser.parse_args()
+
+    urls = [f"https://aawheel.com/products/{i}?page={i % 97}" for i in range(args.urls)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'frontier.sqlite'
+        frontier = CrawlFrontier(path)
+
+        def fill():
+            for depth, url in enumerate(urls):
+                frontier.add(url, depth % 5)
+            frontier.commit()
+        timed(f"enqueue {args.urls:,} URLs", fill, args.urls)
+        timed(f"membership x{args.urls:,} (all hits)", lambda: sum(url in frontier for url in urls), args.urls)
+        timed(f"re-add x{args.urls:,} (all dupes)", lambda: sum(frontier.add(url, 0) for url in urls), args.urls)
+
+        def drain_half():
+            for _ in range(args.urls // 2 // 100):
+                for url, _, _ in frontier.pop(100):
+                    frontier.mark(url, DONE)
+            frontier.commit()
+        timed("claim + complete half the queue", drain_half, args.urls // 2)
+        frontier.close()
+
+        reopened = timed("reopen for resume", lambda: CrawlFrontier(path))
+        print(f"  {reopened.count(DONE):,} done, {len(reopened):,} known")
+        reopened.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark: incremental image builds.
+
+Creates N small product images, builds their variants once, then measures
+the no-op rebuild (stat only), a rebuild after every source was touched
+(stat mismatch, hash match) and a rebuild after a few sources changed.
+
+Run with: python benchmarks/bench_image_cache.py --images 3000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aawheel.images import ImageBuildCache, build_images, load_pillow
+
+def timed(label, func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:8.3f}s")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure no-op and incremental image rebuilds')
+    parser.add_argument('--images', type=int, default=3000, help='Number of source images')
+    parser.add_argument('--changed', type=int, default=20, help='Sources modified before the last rebuild')
+    args = parser.parse_args()
+
+    Image, _ = load_pillow()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        sources = []
+        for i in range(args.images):
+            path = tmp / 'src' / f"product-{i}.jpg"
+            path.parent.mkdir(exist_ok=True)
+            Image.new('RGB', (96, 64), (i % 256, i // 256 % 256, 90)).save(path)
+            sources.append(path)
+
+        def build():
+            cache = ImageBuildCache(tmp / 'build.json')
+            return build_images(sources, tmp / 'out', widths=(48,), formats=('jpeg',), cache=cache)
+
+        timed(f"cold build ({args.images:,} images)", build)
+        timed("no-op rebuild", build)
+        for path in sources:
+            os.utime(path)
+        timed("rebuild after touching all", build)
+        timed("no-op rebuild (after touch)", build)
+        for i, path in enumerate(sources[:args.changed]):
+            Image.new('RGB', (96, 64), (255, 255, i)).save(path)
+        timed(f"rebuild with {args.changed} changed", build)
+
+if __name__ == "__main__":
+    main()
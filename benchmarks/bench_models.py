@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading a catalog from JSON dicts vs the typed models.
+
+For synthetic catalogs of increasing size, times json.loads() alone,
+json.loads() plus validation into the slotted models, and decoding the
+binary catalog, and compares file sizes and the memory held by the loaded
+products (plain dicts vs slotted objects). Also checks that the binary
+form round-trips.
+
+Run with: python benchmarks/bench_models.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from aawheel.models import Catalog
+from bench_search import make_products
+
+def make_website_data(count):
+    products = make_products(count)
+    for i, product in enumerate(products):
+        product["image"] = f"/images/product-{i % 50}.jpg"
+    return {
+        "navigation": {"main": [{"text": "Home", "href": "/"}], "footer": []},
+        "content": {
+            "products": products,
+            "testimonials": [{"author": f"author {i}", "date": "2025-01-01", "text": "Great service."}
+                             for i in range(count // 100)]
+        },
+        "contact": {"locations": [{"city": "Omaha, NE", "phone": "800-688-2953"}]}
+    }
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def held_memory(func):
+    tracemalloc.start()
+    result = func()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JSON dicts with the typed catalog models')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='Catalog sizes (products)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    print(f"{'products':>9} {'json':>9} {'binary':>9} {'loads':>9} {'validate':>9} {'decode':>9} "
+          f"{'dicts':>9} {'models':>9}  round-trip")
+    failures = 0
+    for size in args.sizes:
+        text = json.dumps(make_website_data(size))
+        data = Catalog.from_website_data(json.loads(text)).to_bytes()
+        loads, _ = best_time(lambda: json.loads(text), args.repeat)
+        validate, catalog = best_time(lambda: Catalog.from_website_data(json.loads(text)), args.repeat)
+        decode, decoded = best_time(lambda: Catalog.from_bytes(data), args.repeat)
+        dict_bytes, _ = held_memory(lambda: json.loads(text)["content"]["products"])
+        model_bytes, _ = held_memory(lambda: Catalog.from_bytes(data).products)
+        same = decoded == catalog
+        failures += not same
+        print(f"{size:>9} {len(text) / 1024:7.0f}KB {len(data) / 1024:7.0f}KB {loads * 1000:7.1f}ms "
+              f"{validate * 1000:7.1f}ms {decode * 1000:7.1f}ms {dict_bytes / 2**20:7.1f}MB "
+              f"{model_bytes / 2**20:7.1f}MB  {'identical' if same else 'MISMATCH'}")
+
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parse throughput of each installed parser backend.
+
+Reports parse-only and parse+extract time and MB/s per backend on
+synthetic catalog pages (or saved HTML passed with --html), plus the peak
+memory Python allocates while parsing and extracting (tracemalloc, which
+does not see the C trees of lxml and selectolax). The stream backend
+tokenizes during extraction, so it has no parse-only time.
+
+Run with: python benchmarks/bench_parsers.py --sizes 100000 1000000 5000000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from aawheel import extract, parsers
+from fixtures import make_page
+
+BASE_URL = 'https://aawheel.com/'
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def peak_mb(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare parser backend throughput')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000], help='Synthetic page sizes in bytes')
+    parser.add_argument('--html', nargs='*', default=[], help='Saved HTML files to benchmark as well')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    pages = [(f"synthetic {size // 1000} KB", make_page(size, seed=size).encode('utf-8')) for size in args.sizes]
+    pages += [(path, Path(path).read_bytes()) for path in args.html]
+
+    print(f"{'page':<24} {'backend':<12} {'parse':>9} {'MB/s':>8} {'+extract':>9} {'MB/s':>8} {'peak':>9}")
+    for label, body in pages:
+        megabytes = len(body) / 1_000_000
+        for name in parsers.available_backends():
+            run = lambda: extract.extract_all(parsers.parse(body, name), BASE_URL)
+            total = best_of(args.repeat, run)
+            peak = peak_mb(run)
+            if name == parsers.STREAM_PARSER:
+                parse_columns = f"{'-':>9} {'-':>8}"
+            else:
+                parse = best_of(args.repeat, lambda: parsers.parse(body, name))
+                parse_columns = f"{parse:8.3f}s {megabytes / parse:8.1f}"
+            print(f"{label:<24} {name:<12} {parse_columns} {total:8.3f}s {megabytes / total:8.1f} {peak:7.1f}MB")
+
+if __name__ == "__main__":
+    main()
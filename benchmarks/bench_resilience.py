@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: crawls against a fault-injecting server, with and without the
+resilience layer.
+
+Crawls a synthetic site through replay_server.py under several fault
+scenarios, once per fetcher configuration, and reports pages completed
+and failed, wall time, p99 page latency, retries, hedged requests and
+requests refused by an open circuit:
+
+    transient    20% of page requests get a 503, 5% are dropped
+    retry-after  every page's first request gets a 503 with Retry-After
+    tail         5% of page responses take --slow-seconds longer
+    outage       every page request gets a 503
+
+    none         no retries, circuit breakers or hedging (the old behaviour)
+    retry        retries with backoff only
+    default      retries and per-host circuit breakers (Fetcher's default)
+    hedged       default plus hedged requests
+
+Exits with 1 if a configuration with retries loses any page in the
+retry-after scenario or more than 5% of them in the transient one (four
+attempts at a 25% fault rate still lose about 0.4%).
+
+Run with: python benchmarks/bench_resilience.py --pages 200 --latency 0.01
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import scrape_website
+from aawheel.fetch import Fetcher
+from aawheel.metrics import Metrics, percentile
+from aawheel.robots import HostScheduler, RobotsCache
+from corpus import DEFAULT_CORPUS_DIR, synthetic_corpus
+from replay_server import start_server
+
+CONFIGS = {
+    "none": {"retry": False, "breakers": False, "hedge": False},
+    "retry": {"retry": True, "breakers": False, "hedge": False},
+    "default": {"retry": True, "breakers": True, "hedge": False},
+    "hedged": {"retry": True, "breakers": True, "hedge": True},
+}
+# Share of pages a configuration with retries may lose per scenario
+ALLOWED_LOSS = {"transient": 0.05, "retry-after": 0.0}
+
+def scenarios(slow_seconds):
+    return {
+        "transient": {"error_rate": 0.2, "drop_rate": 0.05},
+        "retry-after": {"fail_first": 1, "retry_after": 0.5},
+        "tail": {"slow_rate": 0.05, "slow_seconds": slow_seconds},
+        "outage": {"error_rate": 1.0},
+    }
+
+def counter(metrics, name, **labels):
+    """Sum of a counter over every label set that includes labels."""
+    wanted = set(labels.items())
+    return sum(value for (key, label_set), value in metrics.counters.items()
+               if key == name and wanted <= set(label_set))
+
+def run_crawl(url, pages, workers, config):
+    metrics = Metrics(samples=True)
+    scheduler = HostScheduler()
+    fetcher = Fetcher(per_host=workers, scheduler=scheduler, metrics=metrics, **config)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scrape_website.crawl(url + '/', max_depth=1, max_pages=pages, workers=workers, fetcher=fetcher,
+                             robots=RobotsCache(fetcher, scheduler), sitemaps=True)
+    elapsed = time.perf_counter() - start
+    fetcher.close()
+    times = sorted(metrics.histograms.get(("page_seconds", ()), {}).get("samples", []))
+    return {
+        "done": counter(metrics, "pages_total", status="parsed"),
+        "failed": counter(metrics, "pages_total", status="failed"),
+        "seconds": elapsed,
+        "p99": percentile(times, 99) or 0.0,
+        "retries": counter(metrics, "fetch_retries_total"),
+        "hedges": counter(metrics, "fetch_hedges_total"),
+        "refused": counter(metrics, "fetch_circuit_open_total"),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawl a fault-injecting server with and without retries, breakers and hedging')
+    parser.add_argument('--pages', type=int, default=100, help='Pages in the crawled site')
+    parser.add_argument('--page-bytes', type=int, default=20_000, help='Size of each page')
+    parser.add_argument('--workers', type=int, default=8, help='Crawl workers')
+    parser.add_argument('--latency', type=float, default=0.01, help='Seconds the server adds to every response')
+    parser.add_argument('--slow-seconds', type=float, default=1.0, help='Extra delay of slow responses in the tail scenario')
+    parser.add_argument('--scenarios', nargs='+', help='Only run these scenarios')
+    parser.add_argument('--configs', nargs='+', choices=list(CONFIGS), help='Only run these configurations')
+    parser.add_argument('--corpus-root', default=DEFAULT_CORPUS_DIR, help='Where synthetic corpora are generated')
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.pages, args.page_bytes, 0, args.corpus_root)
+    print(f"{'scenario':<12} {'config':<8} {'done':>5} {'failed':>6} {'seconds':>8} {'p99':>8} "
+          f"{'retries':>7} {'hedges':>6} {'refused':>7}")
+    failures = 0
+    for scenario, faults in scenarios(args.slow_seconds).items():
+        if args.scenarios and scenario not in args.scenarios:
+            continue
+        for name, config in CONFIGS.items():
+            if args.configs and name not in args.configs:
+                continue
+            server, url = start_server(corpus, args.latency, **faults)
+            try:
+                result = run_crawl(url, args.pages, args.workers, config)
+            finally:
+                server.terminate()
+            print(f"{scenario:<12} {name:<8} {result['done']:>5} {result['failed']:>6} {result['seconds']:>7.2f}s "
+                  f"{result['p99']:>7.3f}s {result['retries']:>7} {result['hedges']:>6} {result['refused']:>7}")
+            lost = args.pages - result["done"]
+            if scenario in ALLOWED_LOSS and config["retry"] and lost > ALLOWED_LOSS[scenario] * args.pages:
+                print(f"✗ {scenario}/{name}: {lost} pages lost despite retries")
+                failures += 1
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
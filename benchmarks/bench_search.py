@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: prebuilt product search index vs. substring scanning.
+
+Builds synthetic catalogs of increasing size, then times typical queries
+against the index (postings intersection) and against the substring filter
+the products page used to run over every product.
+
+Run with: python benchmarks/bench_search.py --sizes 9 1000 10000 50000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from aawheel.search import build_search_index, search_products
+from fixtures import CATEGORIES, WORDS
+
+QUERIES = ["brake", "heavy duty axle", "air valve", "hub bear", "lamp harness strap", "meritor"]
+
+def make_products(count, seed=0):
+    rng = random.Random(seed)
+    return [{
+        "category": rng.choice(CATEGORIES),
+        "name": f"{' '.join(rng.choice(WORDS) for _ in range(3))} #{i}",
+        "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 40)))
+    } for i in range(count)]
+
+def substring_filter(products, query):
+    query = query.lower()
+    return [p for p in products
+            if query in p["name"].lower() or query in p["description"].lower() or query in p["category"].lower()]
+
+def per_query(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            func(query)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare indexed search with substring filtering')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[9, 1000, 10000, 50000], help='Catalog sizes (products)')
+    args = parser.parse_args()
+
+    print(f"{'products':>9} {'build':>9} {'index':>10} {'indexed':>12} {'substring':>12}")
+    for size in args.sizes:
+        products = make_products(size)
+        start = time.perf_counter()
+        index = build_search_index(products)
+        build = time.perf_counter() - start
+        index_bytes = len(json.dumps(index, separators=(',', ':')))
+        repeat = max(1, 2000 // size)
+        indexed = per_query(lambda q: search_products(index, q), repeat)
+        scanned = per_query(lambda q: substring_filter(products, q), repeat)
+        print(f"{size:>9,} {build:>8.2f}s {index_bytes / 1024:>8.0f}KB {indexed:>10.0f}us {scanned:>10.0f}us")
+
+if __name__ == "__main__":
+    main()
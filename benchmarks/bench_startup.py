@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: startup time of the `python -m aawheel` commands.
+
+Runs each command repeatedly in a fresh interpreter (in a scratch
+directory holding a copy of website_data.json) and reports its median wall
+time and how much that adds to a bare `python -c pass`. Every command
+has a budget for the added time and must not import any of HEAVY_MODULES
+(scrape loads requests and BeautifulSoup only once it fetches). For every
+command over budget the slowest top-level imports (from -X importtime) are
+listed.
+
+Exits with 1 if a command is over budget or imports a heavy module.
+Budgets are for a single ordinary core; scale them with --scale on slower
+machines.
+
+Run with: python benchmarks/bench_startup.py --rounds 20
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (name, arguments, budget in ms over a bare interpreter)
+CASES = [
+    ("--help", ["--help"], 30),
+    ("status", ["status"], 80),
+    ("index", ["index", "--no-shards"], 80),
+    ("images --help", ["images", "--help"], 80),
+    ("images download --help", ["images", "download", "--help"], 80),
+    ("scrape --help", ["scrape", "--help"], 150),
+]
+HEAVY_MODULES = ('requests', 'urllib3', 'bs4', 'lxml', 'selectolax', 'PIL', 'multiprocessing', 'concurrent.futures')
+
+def timed_runs(argv, rounds, cwd, env):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        process = subprocess.run(argv, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        times.append(time.perf_counter() - start)
+        if process.returncode != 0:
+            output = process.stderr.decode('utf-8', 'replace').strip().splitlines()
+            raise RuntimeError(output[-1] if output else f"exited with {process.returncode}")
+    return times
+
+def imports(argv, cwd, env):
+    """[(module, cumulative microseconds, top level)] from one run under -X importtime."""
+    process = subprocess.run([argv[0], '-X', 'importtime', *argv[1:]], cwd=cwd, env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(cumulative), not name[2:].startswith(' ')))
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure startup time of the python -m aawheel commands against a budget')
+    parser.add_argument('--rounds', type=int, default=10, help='Runs per command (the median is reported)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget by this (e.g. 2 on a slow CI runner)')
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get('PYTHONPATH')])))
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(ROOT / 'website_data.json', tmp)
+        bare = statistics.median(timed_runs([sys.executable, '-c', 'pass'], args.rounds, tmp, env))
+        print(f"{'command':<26} {'median':>9} {'added':>9} {'budget':>8}")
+        print(f"{'python -c pass':<26} {bare * 1000:>7.1f}ms")
+        for name, command, budget in CASES:
+            argv = [sys.executable, '-m', 'aawheel', *command]
+            try:
+                median = statistics.median(timed_runs(argv, args.rounds, tmp, env))
+            except RuntimeError as e:
+                print(f"✗ {name}: {e}")
+                failures += 1
+                continue
+            added = (median - bare) * 1000
+            limit = budget * args.scale
+            print(f"{name:<26} {median * 1000:>7.1f}ms {added:>7.1f}ms {f'{limit:.0f}ms':>8} "
+                  f"{'✓' if added <= limit else '✗'}")
+            modules = imports(argv, tmp, env)
+            heavy = sorted({module for module, _, _ in modules if module.split('.')[0] in HEAVY_MODULES
+                            or module in HEAVY_MODULES})
+            if heavy:
+                print(f"  ✗ imports {', '.join(heavy)}")
+                failures += 1
+            if added > limit:
+                slowest = sorted((item for item in modules if item[2]), key=lambda item: -item[1])[:5]
+                print("  ✗ slowest imports: " + ", ".join(f"{module} {micros / 1000:.1f}ms" for module, micros, _ in slowest))
+                failures += 1
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
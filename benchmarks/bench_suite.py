@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the scraper.
+
+Runs against recorded corpora (corpus.py) replayed by a local HTTP server
+(replay_server.py) with configurable latency, so results do not depend on
+the live site. Cases:
+
+    parse/<size>, extract_*/<size>
+                     parsing and each extract_* function (plus the combined
+                     single-pass extract_page) on one page of <size> bytes,
+                     timed pytest-benchmark style: warm-up, then rounds
+                     until --min-time has passed
+    page/<size>      the full scrape_website.py pipeline for one page of
+                     <size> bytes (fetch, parse, extract, write outputs),
+                     repeated like the extract cases
+    crawl/<pages>    the full pipeline crawling a <pages>-page site found
+                     through its sitemap
+
+Every case group runs in a fresh interpreter, so its peak RSS is its own.
+Reported: throughput (pages or calls per second), p50/p99 latency (per
+page for crawls, per round otherwise) and peak RSS. Results are compared
+with a stored baseline (--save-baseline writes one); a case whose latency
+or RSS grew, or whose throughput fell, by more than --threshold is flagged
+and the run exits with 1.
+
+Run with:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --full --latency 0.02 --save-baseline
+    python benchmarks/bench_suite.py --corpus .cache/bench_corpus/aawheel
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from aawheel import parsers
+from aawheel.metrics import Metrics, percentile
+from corpus import DEFAULT_CORPUS_DIR, load_corpus, synthetic_corpus
+from replay_server import start_server
+
+DEFAULT_BASELINE = '.cache/bench_baseline.json'
+SIZES = [10_000, 100_000, 1_000_000]
+FULL_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+PAGES = [1, 100, 1000]
+FULL_PAGES = [1, 100, 1000, 10_000]
+MIN_ROUNDS = 3
+# metric -> True if higher is better
+COMPARED = {"per_sec": True, "p50": False, "p99": False, "rss_mb": False}
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def rounds(func, min_time, max_rounds=1000):
+    """Call func once to warm up, then until min_time has passed (at least MIN_ROUNDS times)."""
+    func()
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_rounds and (len(times) < MIN_ROUNDS or time.perf_counter() - start < min_time):
+        began = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - began)
+    return times
+
+def summarize(name, times, per_sec=None):
+    values = sorted(times)
+    return {
+        "name": name,
+        "rounds": len(values),
+        "min": values[0],
+        "mean": statistics.fmean(values),
+        "stddev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "p50": percentile(values, 50),
+        "p99": percentile(values, 99),
+        "per_sec": per_sec if per_sec is not None else len(values) / sum(values)
+    }
+
+def run_extract(spec):
+    """parse and extract_* cases for one page size."""
+    import scrape_website
+    from fixtures import make_page
+    size, parser, min_time = spec["size"], spec["parser"], spec["min_time"]
+    url = "https://aawheel.com/"
+    content = make_page(size, seed=size).encode('utf-8')
+    document = parsers.parse(content, parser)
+    cases = [
+        ("parse", lambda: parsers.parse(content, parser)),
+        ("extract_navigation", lambda: scrape_website.extract_navigation(document, url)),
+        ("extract_content", lambda: scrape_website.extract_content(document)),
+        ("extract_contact_info", lambda: scrape_website.extract_contact_info(document)),
+        ("extract_social_links", lambda: scrape_website.extract_social_links(document, url)),
+        ("extract_page", lambda: scrape_website.extract_page(document, url)),
+    ]
+    return [summarize(f"{name}/{size}", rounds(func, min_time)) for name, func in cases]
+
+def scrape_once(argv, metrics=None):
+    """Run scrape_website's pipeline in a scratch directory with its output silenced."""
+    import scrape_website
+    with tempfile.TemporaryDirectory() as tmp:
+        args = scrape_website.build_parser().parse_args(argv + [
+            '--jsonl', str(Path(tmp) / 'pages.jsonl'), '--state', str(Path(tmp) / 'frontier.sqlite'),
+            '--shards-dir', str(Path(tmp) / 'shards')
+        ])
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scrape_website.scrape(args, metrics)
+        finally:
+            os.chdir(cwd)
+
+def run_page(spec):
+    """The whole pipeline for the start page of a corpus, repeated."""
+    argv = ['--url', spec["url"] + '/', '--no-cache', '--parser', spec["parser"]]
+    times = rounds(lambda: scrape_once(argv), spec["min_time"])
+    return [summarize(spec["name"], times)]
+
+def run_crawl(spec):
+    """The whole pipeline crawling every page of a corpus; latency is per page."""
+    argv = ['--url', spec["url"] + '/', '--crawl', '--no-cache', '--parser', spec["parser"],
+            '--max-pages', str(spec["pages"]), '--max-depth', '1', '--workers', str(spec["workers"])]
+    metrics = Metrics(samples=True)
+    start = time.perf_counter()
+    scrape_once(argv, metrics)
+    elapsed = time.perf_counter() - start
+    times = metrics.histograms.get(("page_seconds", ()), {}).get("samples", [])
+    parsed = metrics.counters.get(("pages_total", (("status", "parsed"),)), 0)
+    if not times:
+        raise RuntimeError("no pages were scraped")
+    result = summarize(spec["name"], times, per_sec=parsed / elapsed)
+    result.update(pages=parsed, seconds=elapsed)
+    return [result]
+
+RUNNERS = {"extract": run_extract, "page": run_page, "crawl": run_crawl}
+
+def run_child(spec):
+    """Run one case group in a fresh interpreter; returns its results with peak RSS."""
+    process = subprocess.run([sys.executable, __file__, '--child', json.dumps(spec)],
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "failed")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+def compare(results, baseline, threshold):
+    """{case name: [flag text]} for metrics that regressed beyond threshold."""
+    previous = {result["name"]: result for result in baseline.get("results", [])}
+    flags = {}
+    for result in results:
+        old = previous.get(result["name"])
+        if old is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            if not old.get(metric) or result.get(metric) is None:
+                continue
+            change = result[metric] / old[metric] - 1
+            if (-change if higher_is_better else change) > threshold:
+                flags.setdefault(result["name"], []).append(f"{metric} {change:+.0%}")
+    return flags
+
+def format_seconds(value):
+    return f"{value * 1000:9.2f}ms" if value < 10 else f"{value:9.2f}s "
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline scraper benchmarks against a replayed corpus')
+    parser.add_argument('--sizes', type=int, nargs='+', help=f'Page sizes in bytes (default: {SIZES})')
+    parser.add_argument('--pages', type=int, nargs='+', help=f'Site sizes to crawl (default: {PAGES})')
+    parser.add_argument('--full', action='store_true', help='Use the full range: pages of 10 KB to 10 MB, sites of 1 to 10k pages')
+    parser.add_argument('--page-bytes', type=int, default=20_000, help='Page size in the crawled sites')
+    parser.add_argument('--corpus', help='Also crawl this recorded corpus (e.g. one made by corpus.py record)')
+    parser.add_argument('--corpus-root', default=DEFAULT_CORPUS_DIR, help='Where synthetic corpora are generated')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds the replay server adds to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds per response')
+    parser.add_argument('--workers', type=int, default=8, help='Crawl workers')
+    parser.add_argument('--parser', default=parsers.DEFAULT_PARSER, choices=list(parsers.BACKENDS), help='HTML parser backend')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds each repeated case runs for (after a warm-up call)')
+    parser.add_argument('-k', dest='select', help='Only run cases whose name contains this text')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Relative change flagged as a regression (default: 0.2)')
+    parser.add_argument('--output', help='Also write the results as JSON here')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        spec = json.loads(args.child)
+        results = RUNNERS[spec["kind"]](spec)
+        rss = peak_rss_mb()
+        for result in results:
+            result["rss_mb"] = rss
+        print(json.dumps(results))
+        return
+
+    sizes = args.sizes or (FULL_SIZES if args.full else SIZES)
+    pages = args.pages or (FULL_PAGES if args.full else PAGES)
+    common = {"parser": args.parser, "min_time": args.min_time, "workers": args.workers}
+    groups = []
+    for size in sizes:
+        groups.append(({"kind": "extract", "size": size, **common}, None))
+    for size in sizes:
+        groups.append(({"kind": "page", "name": f"page/{size}", **common}, synthetic_corpus(1, size, size, args.corpus_root)))
+    for count in pages:
+        groups.append(({"kind": "crawl", "name": f"crawl/{count}", "pages": count, **common},
+                       synthetic_corpus(count, args.page_bytes, 0, args.corpus_root)))
+    if args.corpus:
+        count = load_corpus(args.corpus)["pages"]
+        groups.append(({"kind": "crawl", "name": f"crawl/{Path(args.corpus).name}", "pages": count, **common},
+                       Path(args.corpus)))
+
+    print(f"{'case':<30} {'rounds':>7} {'per sec':>10} {'p50':>11} {'p99':>11} {'peak RSS':>9}")
+    results = []
+    failures = 0
+    for spec, corpus in groups:
+        names = [f"{name}/{spec['size']}" for name in ("parse", "extract_")] if spec["kind"] == "extract" else [spec["name"]]
+        if args.select and not any(args.select in name for name in names):
+            continue
+        server = None
+        try:
+            if corpus is not None:
+                server, spec["url"] = start_server(corpus, args.latency, args.jitter)
+            group = run_child(spec)
+        except Exception as e:
+            print(f"✗ {names[0]}: {e}")
+            failures += 1
+            continue
+        finally:
+            if server is not None:
+                server.terminate()
+        for result in group:
+            if args.select and args.select not in result["name"]:
+                continue
+            results.append(result)
+            print(f"{result['name']:<30} {result['rounds']:>7} {result['per_sec']:>10.2f} "
+                  f"{format_seconds(result['p50'])} {format_seconds(result['p99'])} {result['rss_mb']:>7.0f}MB")
+
+    report = {"parser": args.parser, "latency": args.latency, "results": results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Baseline saved to {baseline_path}")
+    elif baseline_path.exists():
+        with open(baseline_path, encoding='utf-8') as f:
+            flags = compare(results, json.load(f), args.threshold)
+        if flags:
+            print(f"\n✗ Regressions against {baseline_path} (threshold {args.threshold:.0%}):")
+            for name, items in flags.items():
+                print(f"  {name}: {', '.join(items)}")
+            failures += len(flags)
+        else:
+            print(f"\n✓ No regressions against {baseline_path}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
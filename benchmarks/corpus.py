@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Recorded page corpora for offline benchmarks.
+
+A corpus is a directory of response bodies plus corpus.json mapping each
+request path to its file and content type. replay_server.py serves one
+over HTTP, so the scraper can be benchmarked without touching the live
+site. Files marked as templates (robots.txt, sitemaps) have `{origin}`
+replaced by the server's own address when served, and recorded real
+pages have their site origin rewritten to root-relative URLs, so every
+link stays on the replay server.
+
+Corpora come from three sources:
+
+    synthetic     N pages of about B bytes each from fixtures.make_page(),
+                  linked through a sitemap (cached under .cache/bench_corpus)
+    import-cache  every HTML response for a host in the scraper's response
+                  cache (.cache/http), i.e. pages from a previous real scrape
+    record        crawl a live site into a fresh response cache, then import it
+
+Run with:
+    python benchmarks/corpus.py synthetic --pages 1000 --page-bytes 20000
+    python benchmarks/corpus.py record --url https://aawheel.com --max-pages 50 --name aawheel
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from fixtures import make_page
+
+DEFAULT_CORPUS_DIR = '.cache/bench_corpus'
+CORPUS_FILE = 'corpus.json'
+HTML_TYPE = 'text/html; charset=utf-8'
+
+ROBOTS_TXT = "User-agent: *\nAllow: /\nSitemap: {origin}/sitemap.xml\n"
+
+def _write(directory, files, path, name, body, content_type, template=False):
+    target = directory / name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(body)
+    files[path] = {"file": name, "type": content_type, "bytes": len(body), "template": template}
+
+def _save_manifest(directory, name, files):
+    manifest = {"name": name, "start": "/", "pages": sum(f["type"].startswith("text/html") for f in files.values()),
+                "files": files}
+    tmp = directory / (CORPUS_FILE + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, directory / CORPUS_FILE)
+    return manifest
+
+def load_corpus(directory):
+    """The corpus.json manifest of a recorded corpus."""
+    with open(Path(directory) / CORPUS_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+def synthetic_corpus(pages, page_bytes, seed=0, root=DEFAULT_CORPUS_DIR):
+    """Directory of a synthetic site of `pages` pages, generating it on first use.
+
+    The home page is `/`, the rest are /pages/<n>.html; all of them are
+    listed in /sitemap.xml (referenced from robots.txt), so a crawl with
+    max_pages >= pages reaches every page.
+    """
+    directory = Path(root) / f"synthetic-{pages}x{page_bytes}-s{seed}"
+    if (directory / CORPUS_FILE).exists():
+        return directory
+    files = {}
+    for i in range(pages):
+        path = "/" if i == 0 else f"/pages/{i}.html"
+        _write(directory, files, path, f"pages/{i}.html", make_page(page_bytes, seed + i).encode('utf-8'), HTML_TYPE)
+    _write(directory, files, "/robots.txt", "robots.txt", ROBOTS_TXT.encode('utf-8'), 'text/plain', template=True)
+    urls = "".join(f"<url><loc>{{origin}}{path}</loc></url>" for path in files if path != "/robots.txt")
+    sitemap = f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+    _write(directory, files, "/sitemap.xml", "sitemap.xml", sitemap.encode('utf-8'), 'application/xml', template=True)
+    _save_manifest(directory, directory.name, files)
+    return directory
+
+def _drop_missing_sitemaps(robots_txt, paths):
+    """robots.txt without Sitemap: lines for paths that were not recorded.
+
+    Sitemaps are streamed past the response cache, so a recorded crawl
+    usually has none of them.
+    """
+    lines = []
+    for line in robots_txt.splitlines(keepends=True):
+        if line.lower().startswith(b"sitemap:"):
+            target = line.split(b":", 1)[1].strip().replace(b"{origin}", b"")
+            if target.decode('utf-8', 'replace') not in paths:
+                continue
+        lines.append(line)
+    return b"".join(lines)
+
+def import_cache(cache_dir, host, name, root=DEFAULT_CORPUS_DIR):
+    """Copy every cached response for host into a corpus. Returns its directory.
+
+    Absolute links to the recorded origin become root-relative, so a crawl
+    of the replayed pages stays on the replay server.
+    """
+    from aawheel.cache import ResponseCache
+    cache = ResponseCache(cache_dir)
+    directory = Path(root) / name
+    files = {}
+    origins = set()
+    for key, entry in sorted(cache._index.items(), key=lambda item: item[1]['url']):
+        parsed = urlparse(entry['url'])
+        if parsed.hostname != host or not cache._body_path(key).exists():
+            continue
+        origins.add(f"{parsed.scheme}://{parsed.netloc}".encode('utf-8'))
+        path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+        files[path] = (cache._body_path(key).read_bytes(), entry.get('content_type') or HTML_TYPE)
+    if not files:
+        raise ValueError(f"No cached responses for {host} in {cache_dir}")
+
+    recorded = {}
+    for i, (path, (body, content_type)) in enumerate(sorted(files.items())):
+        template = not content_type.startswith("text/html")
+        for origin in origins:
+            # Pages link root-relative; robots.txt and sitemaps need absolute URLs
+            body = body.replace(origin, b"{origin}" if template else b"")
+        if path == "/robots.txt":
+            body = _drop_missing_sitemaps(body, files)
+        _write(directory, recorded, path, f"pages/{i}", body, content_type, template)
+    if "/robots.txt" not in recorded:
+        _write(directory, recorded, "/robots.txt", "robots.txt", b"User-agent: *\nAllow: /\n", 'text/plain')
+    _save_manifest(directory, name, recorded)
+    return directory
+
+def record(url, name, max_pages=50, max_depth=2, root=DEFAULT_CORPUS_DIR):
+    """Crawl a live site into a fresh response cache and import it as a corpus."""
+    import scrape_website
+    with tempfile.TemporaryDirectory() as tmp:
+        args = scrape_website.build_parser().parse_args([
+            '--url', url, '--crawl', '--max-pages', str(max_pages), '--max-depth', str(max_depth),
+            '--cache-dir', str(Path(tmp) / 'http'), '--jsonl', str(Path(tmp) / 'pages.jsonl'),
+            '--state', str(Path(tmp) / 'frontier.sqlite'), '--fingerprints', str(Path(tmp) / 'fp.json'),
+            '--no-shards'
+        ])
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scrape_website.scrape(args)
+        finally:
+            os.chdir(cwd)
+        return import_cache(Path(tmp) / 'http', urlparse(url).hostname, name, root)
+
+def main():
+    parser = argparse.ArgumentParser(description='Record page corpora for the offline benchmarks')
+    parser.add_argument('--root', default=DEFAULT_CORPUS_DIR, help='Directory holding the corpora')
+    commands = parser.add_subparsers(dest='command', required=True)
+    synthetic = commands.add_parser('synthetic', help='Generate a synthetic site')
+    synthetic.add_argument('--pages', type=int, default=100, help='Pages in the site')
+    synthetic.add_argument('--page-bytes', type=int, default=20_000, help='Approximate size of each page')
+    synthetic.add_argument('--seed', type=int, default=0, help='Seed of the first page')
+    cached = commands.add_parser('import-cache', help="Import a host's pages from the response cache")
+    cached.add_argument('--cache-dir', default='.cache/http', help='Response cache to import from')
+    cached.add_argument('--host', default='aawheel.com', help='Host whose pages are imported')
+    cached.add_argument('--name', required=True, help='Corpus name')
+    live = commands.add_parser('record', help='Crawl a live site into a corpus')
+    live.add_argument('--url', default='https://aawheel.com', help='Start URL')
+    live.add_argument('--name', required=True, help='Corpus name')
+    live.add_argument('--max-pages', type=int, default=50, help='Pages to record')
+    live.add_argument('--max-depth', type=int, default=2, help='Link depth to follow')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'synthetic':
+            directory = synthetic_corpus(args.pages, args.page_bytes, args.seed, args.root)
+        elif args.command == 'import-cache':
+            directory = import_cache(args.cache_dir, args.host, args.name, args.root)
+        else:
+            directory = record(args.url, args.name, args.max_pages, args.max_depth, args.root)
+    except Exception as e:
+        sys.exit(f"✗ {e}")
+    manifest = load_corpus(directory)
+    size = sum(f["bytes"] for f in manifest["files"].values())
+    print(f"✓ {directory}: {manifest['pages']} pages, {size / 2**20:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Deterministic synthetic pages shaped like the AA Wheel catalog.
+
+make_page() mixes every construct the extractors look at (header/nav menus,
+hero blocks, nested sections, product cards, reviews with and without
+paragraphs, contact details, scripts, comments) so that pages of any size
+exercise the same code paths as the real site.
+"""
+
+import random
+
+CATEGORIES = [
+    "Suspension", "Dressed Axles", "Chemicals and Lubricants", "Safety Equipment",
+    "Cargo Security", "Trailer Body Parts", "Air & Hydraulic Components",
+    "Brake Parts", "Lighting & Electrical"
+]
+WORDS = (
+    "heavy duty truck trailer axle brake hub bearing seal wheel rim air "
+    "hydraulic valve chamber slack adjuster drum rotor lamp harness strap "
+    "chain binder winch bolt nut spring hanger bushing shock reliable fast "
+    "delivery quality OEM aftermarket Meritor Dexter Alcoa DOT approved"
+).split()
+STREETS = ["Main Street", "Oak Ave", "Industrial Blvd", "Commerce Dr", "Harbor Rd"]
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def _phone(rng):
+    formats = ["({}) {}-{}", "{}-{}-{}", "{}.{}.{}"]
+    return rng.choice(formats).format(rng.randint(200, 999), rng.randint(200, 999), rng.randint(1000, 9999))
+
+def _product(rng, i):
+    category = rng.choice(CATEGORIES)
+    tag = rng.choice(["div", "article"])
+    cls = rng.choice(["product-card", "service-item", "Product", "card product"])
+    heading = rng.choice(["h2", "h3", "h4"])
+    desc = f"<p>{_words(rng, rng.randint(8, 30))}</p>" if rng.random() > 0.1 else ""
+    return (f'<{tag} class="{cls}" data-category="{category}">'
+            f'<img src="/images/p{i}.jpg" alt="{category}">'
+            f'<{heading}>{category} {_words(rng, 2)} #{i}</{heading}>{desc}'
+            f'<a href="/products/{i}">Details</a></{tag}>')
+
+def _section(rng, i, nested=True):
+    cls = rng.choice(["section", "content-block", "page-section about", "main-content"])
+    heading = rng.choice(["h1", "h2", "h3"]) if rng.random() > 0.15 else "h5"
+    paragraphs = "".join(f"<p>{_words(rng, rng.randint(5, 20))} <strong>{_words(rng, 2)}</strong></p>"
+                         for _ in range(rng.randint(0, 5)))
+    inner = _section(rng, i * 100, nested=False) if nested and rng.random() < 0.2 else ""
+    return f'<section class="{cls}"><{heading}>Section {i} {_words(rng, 3)}</{heading}>{inner}{paragraphs}</section>'
+
+def _review(rng, i):
+    tag = rng.choice(["div", "blockquote"])
+    cls = rng.choice(["review", "testimonial-card", "google-review"])
+    author_tag = rng.choice(["span", "div", "p"])
+    author = f'<{author_tag} class="{rng.choice(["author", "reviewer-name"])}">Customer {i}</{author_tag}>'
+    if rng.random() < 0.2:
+        author = ""
+    body = (f"<p>{_words(rng, rng.randint(10, 60))}</p>" if rng.random() > 0.3
+            else f"{_words(rng, rng.randint(10, 60))}")
+    return f'<{tag} class="{cls}">{body}{author}<time>2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}</time></{tag}>'
+
+def _contact(rng, i):
+    return (f'<div class="location"><h4>Branch {i}</h4>'
+            f'<p>{rng.randint(10, 9999)} {rng.choice(STREETS)}, Kansas City, MO</p>'
+            f'<p>Call {_phone(rng)} or email sales{i}@aawheel.com</p></div>')
+
+def make_page(target_bytes=50_000, seed=0):
+    """Return an HTML page of roughly target_bytes, fully determined by seed."""
+    rng = random.Random(seed)
+    head = ('<!DOCTYPE html><html><head><title>AA Wheel &amp; Truck Supply | Catalog</title>'
+            '<style>.hero{color:red} /* 123 Style Street */</style>'
+            '<script>var office = "55 Script Ave"; var phone = "816-555-0100";</script></head><body>')
+    header_kind = rng.random()
+    nav_links = "".join(f'<li><a href="/{slug}">{slug.title()}</a></li>'
+                        for slug in ["about", "products", "where-to-buy", "forms", "contact"])
+    if header_kind < 0.4:
+        header = f'<header><a href="/"><img src="/logo.png"></a><ul>{nav_links}</ul></header>'
+    elif header_kind < 0.7:
+        header = f'<div class="site-header"><ul class="main-menu">{nav_links}</ul></div>'
+    else:
+        header = f'<div class="Header top"><a href="/">Home</a>{nav_links}</div><header><a href="#top">Top</a></header>'
+    hero = ('<section class="hero"><h1>Your trusted partner</h1><p>Supplying parts nationwide</p></section>'
+            if rng.random() < 0.5 else
+            '<h1>Your trusted partner for the right part</h1><div><p>Supplying <em>Quality</em> Truck &amp; Trailer Parts</p></div>')
+    parts = [head, header, hero, '<!-- 999 Comment Road -->']
+    footer = ('<footer>' + "".join(f'<a href="/footer/{i}">Footer link {i}</a>' for i in range(14))
+              + '<a href="#top">Back to top</a><a href="https://facebook.com/aawheel">Facebook</a>'
+              '<a href="https://instagram.com/aawheel">Instagram</a><a href="https://wa.me/18005550100">WhatsApp</a>'
+              '</footer></body></html>')
+
+    size = sum(len(p) for p in parts) + len(footer)
+    i = 0
+    builders = [_product, _product, _product, _section, _review, _contact]
+    while size < target_bytes:
+        chunk = rng.choice(builders)(rng, i)
+        if rng.random() < 0.05:
+            chunk = f'<div class="wrapper"><span>{_words(rng, 4)}</span>{chunk}</div>'
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append(footer)
+    return "".join(parts)
@@ -0,0 +1,160 @@
+"""
+Reference copy of the original multi-pass extractors from scrape_website.py.
+
+Kept for the parity checks and as the baseline in the extraction
+benchmarks; aawheel.extract must produce identical output.
+"""
+
+import re
+from urllib.parse import urljoin
+
+def extract_navigation(soup, base_url):
+    """Extract navigation menu structure."""
+    nav = {
+        "main": [],
+        "footer": []
+    }
+    
+    # Main navigation
+    nav_elements = soup.find_all(['nav', 'ul'], class_=lambda x: x and ('nav' in x.lower() or 'menu' in x.lower()))
+    if not nav_elements:
+        # Try finding links in header
+        header = soup.find('header') or soup.find('div', class_=lambda x: x and 'header' in x.lower())
+        if header:
+            links = header.find_all('a', href=True)
+            for link in links:
+                text = link.get_text(strip=True)
+                href = link.get('href', '')
+                if text and href:
+                    nav["main"].append({
+                        "text": text,
+                        "href": urljoin(base_url, href)
+                    })
+    
+    # Footer navigation
+    footer = soup.find('footer')
+    if footer:
+        footer_links = footer.find_all('a', href=True)
+        for link in footer_links[:10]:  # Limit to avoid too many
+            text = link.get_text(strip=True)
+            href = link.get('href', '')
+            if text and href and not href.startswith('#'):
+                nav["footer"].append({
+                    "text": text,
+                    "href": urljoin(base_url, href)
+                })
+    
+    return nav
+
+def extract_content(soup):
+    """Extract main content sections."""
+    content = {
+        "title": "",
+        "tagline": "",
+        "hero": "",
+        "sections": [],
+        "features": [],
+        "products": [],
+        "testimonials": []
+    }
+    
+    # Title
+    title_tag = soup.find('title')
+    if title_tag:
+        content["title"] = title_tag.get_text(strip=True)
+    
+    # Hero section
+    hero = soup.find(['section', 'div'], class_=lambda x: x and ('hero' in x.lower() if x else False))
+    if not hero:
+        # Try h1 as hero
+        h1 = soup.find('h1')
+        if h1:
+            content["hero"] = h1.get_text(strip=True)
+            # Get tagline from nearby p
+            next_p = h1.find_next('p')
+            if next_p:
+                content["tagline"] = next_p.get_text(strip=True)
+    
+    # Extract sections
+    sections = soup.find_all(['section', 'div'], class_=lambda x: x and ('section' in x.lower() or 'content' in x.lower() if x else False))
+    for section in sections[:10]:  # Limit sections
+        heading = section.find(['h1', 'h2', 'h3'])
+        if heading:
+            section_data = {
+                "heading": heading.get_text(strip=True),
+                "content": ""
+            }
+            # Get paragraph content
+            paragraphs = section.find_all('p')
+            section_data["content"] = " ".join([p.get_text(strip=True) for p in paragraphs[:3]])
+            if section_data["content"]:
+                content["sections"].append(section_data)
+    
+    # Extract products/services
+    product_sections = soup.find_all(['div', 'article'], class_=lambda x: x and ('product' in x.lower() or 'service' in x.lower() if x else False))
+    for product in product_sections[:20]:
+        heading = product.find(['h2', 'h3', 'h4'])
+        if heading:
+            product_data = {
+                "name": heading.get_text(strip=True),
+                "description": ""
+            }
+            desc = product.find('p')
+            if desc:
+                product_data["description"] = desc.get_text(strip=True)
+            content["products"].append(product_data)
+    
+    # Extract testimonials/reviews
+    reviews = soup.find_all(['div', 'blockquote'], class_=lambda x: x and ('review' in x.lower() or 'testimonial' in x.lower() if x else False))
+    for review in reviews[:10]:
+        author = review.find(['span', 'div', 'p'], class_=lambda x: x and ('author' in x.lower() or 'name' in x.lower() if x else False))
+        text = review.find('p') or review
+        if text and author:
+            content["testimonials"].append({
+                "author": author.get_text(strip=True),
+                "text": text.get_text(strip=True)[:200]
+            })
+    
+    return content
+
+def extract_contact_info(soup):
+    """Extract contact information."""
+    contact = {
+        "phone": [],
+        "email": [],
+        "address": [],
+        "locations": []
+    }
+    
+    # Find phone numbers
+    text = soup.get_text()
+    phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+    phones = re.findall(phone_pattern, text)
+    contact["phone"] = list(set(phones))[:5]
+    
+    # Find email
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    emails = re.findall(email_pattern, text)
+    contact["email"] = list(set(emails))[:5]
+    
+    # Find addresses (look for common patterns)
+    address_patterns = soup.find_all(string=re.compile(r'\d+.*(Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr)', re.I))
+    for addr in address_patterns[:5]:
+        contact["address"].append(addr.strip())
+    
+    return contact
+
+def extract_social_links(soup, base_url):
+    """Extract social media links."""
+    social = {}
+    social_keywords = ['facebook', 'twitter', 'instagram', 'linkedin', 'youtube', 'whatsapp']
+    
+    links = soup.find_all('a', href=True)
+    for link in links:
+        href = link.get('href', '').lower()
+        for keyword in social_keywords:
+            if keyword in href:
+                social[keyword] = urljoin(base_url, link.get('href'))
+                break
+    
+    return social
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Parity check: every parser backend must extract identical page data.
+
+Runs the full single-pass extraction over synthetic catalog pages, any
+saved HTML files given with --html, and recorded pages from the scraper's
+response cache (--cache-dir), once per installed backend, and compares the
+results against the html.parser baseline. Exits non-zero on any mismatch.
+
+Run with: python benchmarks/parity_parsers.py --pages 50 --cache-dir .cache/http
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from aawheel import extract, parsers
+from fixtures import make_page
+
+BASE_URL = 'https://aawheel.com/'
+
+def recorded_pages(cache_dir):
+    """(url, body) pairs for the HTML responses stored in a response cache."""
+    index_path = Path(cache_dir) / 'index.json'
+    if not index_path.exists():
+        return []
+    with open(index_path, encoding='utf-8') as f:
+        index = json.load(f)
+    pages = []
+    for key, entry in index.items():
+        body = Path(cache_dir) / f"{key}.body"
+        if 'html' in (entry.get('content_type') or '') and body.exists():
+            pages.append((entry['url'], body.read_bytes()))
+    return pages
+
+def normalized(data):
+    # Contact lists are compared as-is: their page order must not depend on the backend either
+    return json.dumps(data, sort_keys=True, ensure_ascii=False)
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that all parser backends extract identical data')
+    parser.add_argument('--pages', type=int, default=50, help='Number of synthetic pages')
+    parser.add_argument('--html', nargs='*', default=[], help='Saved HTML files to check as well')
+    parser.add_argument('--cache-dir', help='Response cache directory with recorded pages')
+    args = parser.parse_args()
+
+    pages = [(f"synthetic-{seed}", make_page(2_000 + seed * 2_000, seed).encode('utf-8')) for seed in range(args.pages)]
+    pages += [(path, Path(path).read_bytes()) for path in args.html]
+    if args.cache_dir:
+        pages += recorded_pages(args.cache_dir)
+
+    backends = parsers.available_backends()
+    print(f"Checking {len(pages)} pages with: {', '.join(backends)}")
+    failures = 0
+    for label, body in pages:
+        base_url = label if label.startswith('http') else BASE_URL
+        results = {name: normalized(extract.extract_all(parsers.parse(body, name), base_url)) for name in backends}
+        baseline = results[parsers.DEFAULT_PARSER]
+        for name, result in results.items():
+            if result != baseline:
+                failures += 1
+                print(f"✗ {label}: {name} differs from {parsers.DEFAULT_PARSER}")
+
+    print("✓ All backends identical" if not failures else f"✗ {failures} mismatches")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
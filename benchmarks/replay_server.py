@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-in that replays a recorded corpus (see corpus.py).
+
+Serves every recorded path over HTTP/1.1 keep-alive with its recorded
+content type, after a configurable delay (latency plus uniform jitter)
+per request, and 404 for anything else. start_server() runs it in its own
+process so it does not compete for the client's GIL.
+
+Faults can be injected into HTML page responses (robots.txt and sitemaps
+are always served, so a crawl can still find its pages):
+
+    fail_first    the first N requests for each page get a 503
+    error_rate    share of page requests answered with a 503
+    retry_after   Retry-After seconds sent with every injected 503
+    drop_rate     share of page requests whose connection is closed unanswered
+    slow_first    the first N requests for each page are delayed by slow_seconds
+    slow_rate     share of page requests delayed by another slow_seconds
+
+Run with: python benchmarks/replay_server.py .cache/bench_corpus/synthetic-100x20000-s0 --port 8800 --latency 0.05
+          python benchmarks/replay_server.py CORPUS --error-rate 0.2 --retry-after 1 --slow-rate 0.05 --slow-seconds 2
+"""
+
+import argparse
+import multiprocessing
+import random
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from corpus import load_corpus
+
+FAULTS = {"fail_first": 0, "error_rate": 0.0, "retry_after": None, "drop_rate": 0.0, "slow_first": 0,
+          "slow_rate": 0.0, "slow_seconds": 0.0}
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Serves the files of one corpus; configured through class attributes."""
+
+    protocol_version = 'HTTP/1.1'
+    directory = None
+    files = {}
+    latency = 0.0
+    jitter = 0.0
+    faults = FAULTS
+    requests_seen = {}
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        entry = self.files.get(self.path)
+        if entry is None:
+            self.send_error(404)
+            return
+        if entry["type"].startswith("text/html") and self._inject_fault():
+            return
+        body = (self.directory / entry["file"]).read_bytes()
+        if entry["template"]:
+            host, port = self.server.server_address[:2]
+            body = body.replace(b"{origin}", f"http://{host}:{port}".encode('utf-8'))
+        self.send_response(200)
+        self.send_header('Content-Type', entry["type"])
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _inject_fault(self):
+        """Apply the configured faults to this page request. True if it was answered (or dropped) here."""
+        faults = self.faults
+        with self.lock:
+            seen = self.requests_seen[self.path] = self.requests_seen.get(self.path, 0) + 1
+        if seen <= faults["slow_first"] or (faults["slow_rate"] and random.random() < faults["slow_rate"]):
+            time.sleep(faults["slow_seconds"])
+        if faults["drop_rate"] and random.random() < faults["drop_rate"]:
+            self.close_connection = True
+            return True
+        if seen <= faults["fail_first"] or (faults["error_rate"] and random.random() < faults["error_rate"]):
+            self.send_response(503)
+            if faults["retry_after"] is not None:
+                self.send_header('Retry-After', f"{faults['retry_after']:g}")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return True
+        return False
+
+    def log_message(self, *args):
+        pass
+
+def make_server(directory, port=0, latency=0.0, jitter=0.0, **faults):
+    unknown = set(faults) - set(FAULTS)
+    if unknown:
+        raise TypeError(f"Unknown faults: {', '.join(sorted(unknown))}")
+    ReplayHandler.directory = Path(directory)
+    ReplayHandler.files = load_corpus(directory)["files"]
+    ReplayHandler.latency = latency
+    ReplayHandler.jitter = jitter
+    ReplayHandler.faults = dict(FAULTS, **faults)
+    ReplayHandler.requests_seen = {}
+    server = ThreadingHTTPServer(('127.0.0.1', port), ReplayHandler)
+    server.daemon_threads = True
+    return server
+
+def _serve(directory, latency, jitter, faults, port_queue):
+    server = make_server(directory, 0, latency, jitter, **faults)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def start_server(directory, latency=0.0, jitter=0.0, **faults):
+    """Replay a corpus from a background process. Returns (process, base URL)."""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(str(directory), latency, jitter, faults, port_queue),
+                                      daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get()}"
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded corpus over HTTP')
+    parser.add_argument('corpus', help='Corpus directory (see corpus.py)')
+    parser.add_argument('--port', type=int, default=8800, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds per response')
+    parser.add_argument('--fail-first', type=int, default=0, help='Answer the first N requests for each page with a 503')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of page requests answered with a 503')
+    parser.add_argument('--retry-after', type=float, help='Retry-After seconds sent with injected 503s')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='Share of page requests dropped without an answer')
+    parser.add_argument('--slow-first', type=int, default=0, help='Delay the first N requests for each page by --slow-seconds')
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='Share of page requests delayed by --slow-seconds')
+    parser.add_argument('--slow-seconds', type=float, default=2.0, help='Extra delay of slow responses')
+    args = parser.parse_args()
+
+    server = make_server(args.corpus, args.port, args.latency, args.jitter, fail_first=args.fail_first,
+                         error_rate=args.error_rate, retry_after=args.retry_after, drop_rate=args.drop_rate,
+                         slow_first=args.slow_first, slow_rate=args.slow_rate, slow_seconds=args.slow_seconds)
+    print(f"✓ Replaying {args.corpus} ({len(ReplayHandler.files)} files) on http://127.0.0.1:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 import Link from 'next/link'
 import websiteData from '@/website_data.json'
+import type { NavItem } from '@/lib/types'
 
 export default function Footer() {
-  const footerLinks = websiteData.navigation.footer
+  const footerLinks: NavItem[] = websiteData.navigation.footer
   const contact = websiteData.contact
   const social = websiteData.social
 
@@ -0,0 +1,145 @@
+// Client side of the product search index written by aawheel/search.py.
+// tokenize() and stem() mirror the Python versions; keep them in sync.
+
+export interface SearchIndex {
+  version: number
+  count: number
+  fields: string[]
+  terms: string[]
+  postings: number[][]
+  prefixes: Record<string, number[]>
+  words: string[]
+  stems: number[]
+  facets: Record<string, Record<string, number[]>>
+}
+
+const STOPWORDS = new Set(
+  'a an and are as at be by for from in is it of on or our that the to with your'.split(' ')
+)
+
+const STEM_RULES: [string, string][] = [
+  ['sses', 'ss'],
+  ['ies', 'y'],
+  ['ss', 'ss'],
+  ['us', 'us'],
+  ['is', 'is'],
+  ['ments', ''],
+  ['ment', ''],
+  ['ness', ''],
+  ['ings', ''],
+  ['ing', ''],
+  ['edly', ''],
+  ['ed', ''],
+  ['ers', 'er'],
+  ['ly', ''],
+  ['s', ''],
+]
+
+export function stem(word: string): string {
+  if (word.length <= 3 || !/^[a-z]+$/.test(word)) {
+    return word
+  }
+  for (const [suffix, replacement] of STEM_RULES) {
+    if (word.endsWith(suffix)) {
+      if (word.length - suffix.length + replacement.length < 3) {
+        return word
+      }
+      return word.slice(0, word.length - suffix.length) + replacement
+    }
+  }
+  return word
+}
+
+export function tokenize(text: string): string[] {
+  return (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter(token => !STOPWORDS.has(token))
+}
+
+const decoded = new WeakMap<SearchIndex, Map<number, number[]>>()
+
+function postingsFor(index: SearchIndex, position: number): number[] {
+  let cache = decoded.get(index)
+  if (!cache) {
+    cache = new Map()
+    decoded.set(index, cache)
+  }
+  let ids = cache.get(position)
+  if (!ids) {
+    // Postings are stored delta-encoded
+    let doc = 0
+    ids = index.postings[position].map(delta => (doc += delta))
+    cache.set(position, ids)
+  }
+  return ids
+}
+
+function lowerBound(terms: string[], target: string, start: number, end: number): number {
+  while (start < end) {
+    const mid = (start + end) >> 1
+    if (terms[mid] < target) {
+      start = mid + 1
+    } else {
+      end = mid
+    }
+  }
+  return start
+}
+
+function exactTerm(index: SearchIndex, term: string): number[] {
+  const range = index.prefixes[term.slice(0, 2)]
+  if (!range) {
+    return []
+  }
+  const position = lowerBound(index.terms, term, range[0], range[1])
+  return index.terms[position] === term ? postingsFor(index, position) : []
+}
+
+function prefixTerms(index: SearchIndex, prefix: string): number[] {
+  let start = Infinity
+  let end = -Infinity
+  for (const key in index.prefixes) {
+    if (key.startsWith(prefix) || prefix.startsWith(key)) {
+      start = Math.min(start, index.prefixes[key][0])
+      end = Math.max(end, index.prefixes[key][1])
+    }
+  }
+  const matched = new Set<number>()
+  for (let i = lowerBound(index.terms, prefix, start, end); i < end && index.terms[i].startsWith(prefix); i++) {
+    matched.add(i)
+  }
+  // Unstemmed words, so a partly typed word ("lightin") still finds its stem ("light")
+  const words = index.words
+  for (let i = lowerBound(words, prefix, 0, words.length); i < words.length && words[i].startsWith(prefix); i++) {
+    matched.add(index.stems[i])
+  }
+  const ids = new Set<number>()
+  matched.forEach(position => postingsFor(index, position).forEach(id => ids.add(id)))
+  return Array.from(ids).sort((a, b) => a - b)
+}
+
+function union(a: number[], b: number[]): number[] {
+  return Array.from(new Set([...a, ...b])).sort((x, y) => x - y)
+}
+
+function intersect(lists: number[][]): number[] {
+  lists.sort((a, b) => a.length - b.length)
+  let result = lists[0]
+  for (const list of lists.slice(1)) {
+    const members = new Set(list)
+    result = result.filter(id => members.has(id))
+  }
+  return result
+}
+
+// Ids (positions in content.products) matching every word of the query and
+// the category, or null when neither narrows the results. The last word
+// also matches as a prefix, since it may still be being typed.
+export function searchProducts(index: SearchIndex, query: string, category = 'all'): number[] | null {
+  const tokens = tokenize(query)
+  const lists: number[][] = tokens.map((token, i) =>
+    i === tokens.length - 1 ? union(prefixTerms(index, token), exactTerm(index, stem(token))) : exactTerm(index, stem(token))
+  )
+  if (category !== 'all') {
+    lists.push(index.facets.category[category] || [])
+  }
+  return lists.length ? intersect(lists) : null
+}
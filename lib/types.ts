@@ -0,0 +1,32 @@
+// Shapes of the records in website_data.json, mirroring the dataclasses in
+// aawheel/models.py (which validate the data before it is written).
+// Optional fields may be missing from scraped data.
+
+export interface Product {
+  name: string
+  description: string
+  category?: string
+  image?: string
+}
+
+export interface Testimonial {
+  author: string
+  text: string
+  date?: string
+}
+
+export interface Location {
+  city: string
+  phone?: string
+}
+
+export interface NavItem {
+  text: string
+  href: string
+}
+
+export interface ProductImage {
+  slug: string
+  category: string
+  image: string
+}
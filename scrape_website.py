@@ -4,36 +4,70 @@ Website Scraper for AA Wheel & Truck Supply
 Ethically scrapes public content and structure from the target website.
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
 import sys
 import argparse
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urldefrag
+from contextlib import nullcontext
+from pathlib import Path
 import time
+import traceback
 
-def check_robots_txt(url):
-    """Check robots.txt to respect crawling rules."""
-    try:
-        robots_url = urljoin(url, '/robots.txt')
-        response = requests.get(robots_url, timeout=10)
-        if response.status_code == 200:
-            print(f"✓ Found robots.txt: {robots_url}")
-            return True
-        return False
-    except:
-        return False
+from aawheel import extract, parsers
+from aawheel.diff import diff_website_data, summary_lines
+from aawheel.fingerprint import DEFAULT_FINGERPRINTS, PageFingerprints, dom_hash
+from aawheel.frontier import DEFERRED, DONE, FAILED, QUEUED, SKIPPED, CrawlFrontier
+from aawheel.metrics import Metrics
+from aawheel.models import Catalog, ValidationError
+from aawheel.profiling import profile
+from aawheel.robots import HostScheduler, RobotsCache
+from aawheel.rules import RulesError, default_rules, load_rules
+from aawheel.search import write_search_index
+from aawheel.sitemap import discover
+from aawheel.shards import DEFAULT_SHARDS_DIR, size_report, slugify, write_shards
+from aawheel.sink import JsonlSink, read_pages
+
+SKIP_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.pdf', '.zip', '.css', '.js', '.ico')
+# Bump whenever extractor output changes so cached extractions are not reused
+EXTRACT_VERSION = 2
+STREAM_CHUNK_SIZE = 64 * 1024
+# Times an otherwise idle crawl waits for an unreadable robots.txt before leaving its URLs to --resume
+ROBOTS_WAITS = 3
+# Exit statuses follow diff(1): 1 only ever means --diff found changes
+EXIT_CHANGED = 1
+EXIT_ERROR = 2
+
+def fail(message):
+    """Print message to stderr and exit with EXIT_ERROR."""
+    print(message, file=sys.stderr)
+    sys.exit(EXIT_ERROR)
 
-def scrape_page(url, session=None):
+def check_robots_txt(url, robots=None):
+    """Load robots.txt for the site and return its parsed RobotsPolicy."""
+    if robots is None:
+        from aawheel.fetch import get_fetcher
+        robots = RobotsCache(get_fetcher())
+    
+    policy = robots.policy(url)
+    if policy.found:
+        print(f"✓ Found robots.txt: {policy.robots_url}")
+        delay = policy.crawl_delay(robots.agent)
+        if delay:
+            print(f"  Honoring Crawl-delay: {delay:g}s")
+    elif policy.unavailable:
+        print(f"✗ Could not read {policy.robots_url}; the site is treated as disallowed until it can be read")
+    return policy
+
+def scrape_page(url, fetcher=None):
     """Scrape a single page and return BeautifulSoup object."""
-    if session is None:
-        session = requests.Session()
+    from bs4 import BeautifulSoup
+    
+    if fetcher is None:
+        from aawheel.fetch import get_fetcher
+        fetcher = get_fetcher()
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = session.get(url, headers=headers, timeout=15)
+        response = fetcher.get(url)
         response.raise_for_status()
         return BeautifulSoup(response.content, 'html.parser')
     except Exception as e:
@@ -42,172 +76,794 @@ def scrape_page(url, session=None):
 
 def extract_navigation(soup, base_url):
     """Extract navigation menu structure."""
-    nav = {
-        "main": [],
-        "footer": []
-    }
-    
-    # Main navigation
-    nav_elements = soup.find_all(['nav', 'ul'], class_=lambda x: x and ('nav' in x.lower() or 'menu' in x.lower()))
-    if not nav_elements:
-        # Try finding links in header
-        header = soup.find('header') or soup.find('div', class_=lambda x: x and 'header' in x.lower())
-        if header:
-            links = header.find_all('a', href=True)
-            for link in links:
-                text = link.get_text(strip=True)
-                href = link.get('href', '')
-                if text and href:
-                    nav["main"].append({
-                        "text": text,
-                        "href": urljoin(base_url, href)
-                    })
-    
-    # Footer navigation
-    footer = soup.find('footer')
-    if footer:
-        footer_links = footer.find_all('a', href=True)
-        for link in footer_links[:10]:  # Limit to avoid too many
-            text = link.get_text(strip=True)
-            href = link.get('href', '')
-            if text and href and not href.startswith('#'):
-                nav["footer"].append({
-                    "text": text,
-                    "href": urljoin(base_url, href)
-                })
-    
-    return nav
+    return extract.run(soup, [extract.NavigationExtractor(base_url)])[0]
 
 def extract_content(soup):
     """Extract main content sections."""
-    content = {
-        "title": "",
-        "tagline": "",
-        "hero": "",
-        "sections": [],
-        "features": [],
-        "products": [],
-        "testimonials": []
-    }
-    
-    # Title
-    title_tag = soup.find('title')
-    if title_tag:
-        content["title"] = title_tag.get_text(strip=True)
-    
-    # Hero section
-    hero = soup.find(['section', 'div'], class_=lambda x: x and ('hero' in x.lower() if x else False))
-    if not hero:
-        # Try h1 as hero
-        h1 = soup.find('h1')
-        if h1:
-            content["hero"] = h1.get_text(strip=True)
-            # Get tagline from nearby p
-            next_p = h1.find_next('p')
-            if next_p:
-                content["tagline"] = next_p.get_text(strip=True)
-    
-    # Extract sections
-    sections = soup.find_all(['section', 'div'], class_=lambda x: x and ('section' in x.lower() or 'content' in x.lower() if x else False))
-    for section in sections[:10]:  # Limit sections
-        heading = section.find(['h1', 'h2', 'h3'])
-        if heading:
-            section_data = {
-                "heading": heading.get_text(strip=True),
-                "content": ""
-            }
-            # Get paragraph content
-            paragraphs = section.find_all('p')
-            section_data["content"] = " ".join([p.get_text(strip=True) for p in paragraphs[:3]])
-            if section_data["content"]:
-                content["sections"].append(section_data)
-    
-    # Extract products/services
-    product_sections = soup.find_all(['div', 'article'], class_=lambda x: x and ('product' in x.lower() or 'service' in x.lower() if x else False))
-    for product in product_sections[:20]:
-        heading = product.find(['h2', 'h3', 'h4'])
-        if heading:
-            product_data = {
-                "name": heading.get_text(strip=True),
-                "description": ""
-            }
-            desc = product.find('p')
-            if desc:
-                product_data["description"] = desc.get_text(strip=True)
-            content["products"].append(product_data)
-    
-    # Extract testimonials/reviews
-    reviews = soup.find_all(['div', 'blockquote'], class_=lambda x: x and ('review' in x.lower() or 'testimonial' in x.lower() if x else False))
-    for review in reviews[:10]:
-        author = review.find(['span', 'div', 'p'], class_=lambda x: x and ('author' in x.lower() or 'name' in x.lower() if x else False))
-        text = review.find('p') or review
-        if text and author:
-            content["testimonials"].append({
-                "author": author.get_text(strip=True),
-                "text": text.get_text(strip=True)[:200]
-            })
-    
-    return content
+    return extract.assemble_content(*extract.run(soup, extract.content_extractors()))
 
 def extract_contact_info(soup):
     """Extract contact information."""
-    contact = {
-        "phone": [],
-        "email": [],
-        "address": [],
-        "locations": []
+    return extract.run(soup, [extract.ContactExtractor()])[0]
+
+def extract_social_links(soup, base_url):
+    """Extract social media links."""
+    return extract.run(soup, [extract.SocialExtractor(base_url)])[0]
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def normalize_url(url):
+    """Canonical form used to deduplicate URLs.
+
+    Drops the fragment and default port, lower-cases scheme and host and
+    turns an empty path into '/', so '/about', '/about#team' and
+    'HTTPS://Site:443/about' are crawled once.
+    """
+    parsed = urlparse(urldefrag(url)[0])
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if ':' in host:
+        host = f"[{host}]"
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+    if parsed.username:
+        netloc = f"{parsed.username}{':' + parsed.password if parsed.password else ''}@{netloc}"
+    return parsed._replace(scheme=scheme, netloc=netloc, path=parsed.path or '/').geturl()
+
+def is_crawlable(url, base_url):
+    """Only follow http(s) links on the same host that look like HTML pages."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https'):
+        return False
+    if parsed.netloc.lower() != urlparse(base_url).netloc.lower():
+        return False
+    return not parsed.path.lower().endswith(SKIP_EXTENSIONS)
+
+def filter_links(hrefs, base_url):
+    """Resolve raw hrefs into unique, crawlable same-host URLs."""
+    links = []
+    seen = set()
+    for href in hrefs:
+        if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+            continue
+        url = normalize_url(urljoin(base_url, href))
+        if url not in seen and is_crawlable(url, base_url):
+            seen.add(url)
+            links.append(url)
+    return links
+
+def extract_links(soup, base_url, all_anchors=False):
+    """Collect same-host links to follow from the nav, header and footer (or every anchor)."""
+    hrefs = extract.run(soup, [extract.LinkExtractor(all_anchors)])[0]
+    return filter_links(hrefs, base_url)
+
+def extract_page(document, url, all_anchors=False, stats=None, rules=None):
+    """Run every extractor over one page in a single pass, returning (page, links).
+
+    document is a BeautifulSoup tree or a page parsed by aawheel.parsers.
+    rules are compiled aawheel.rules (default: extraction_rules.json).
+    """
+    data = extract.extract_all(document, url, all_anchors, stats, rules)
+    page = {
+        "url": url,
+        "navigation": data["navigation"],
+        "content": data["content"],
+        "contact": data["contact"],
+        "social": data["social"]
     }
+    return page, filter_links(data["hrefs"], url)
+
+def parse_page(content, url, all_anchors=False, parser=parsers.DEFAULT_PARSER, timed=False, rules=None):
+    """Parse and extract page bytes; runs in a worker process in batch mode.
+
+    The stream parser also accepts an iterable of byte chunks as content.
+
+    With timed=True returns (page, links, stats), stats holding the parse
+    time, the element count and the seconds spent in each extractor.
+    """
+    if not timed:
+        return extract_page(parsers.parse(content, parser), url, all_anchors, rules=rules)
+    start = time.perf_counter()
+    document = parsers.parse(content, parser)
+    stats = {"parse": time.perf_counter() - start}
+    page, links = extract_page(document, url, all_anchors, stats, rules)
+    if parser == parsers.STREAM_PARSER:
+        # Tokenizing happens during the walk: all of it but the extractors is parsing
+        stats["parse"] = time.perf_counter() - start - sum(stats["extractors"].values())
+    return page, links, stats
+
+def record_parse(metrics, stats, parser, size):
+    metrics.observe("parse_seconds", stats["parse"], parser=parser)
+    metrics.add("parse_bytes_total", size, parser=parser)
+    metrics.add("parse_elements_total", stats["elements"], parser=parser)
+    for name, seconds in stats["extractors"].items():
+        metrics.observe("extract_seconds", seconds, extractor=name)
+
+def load_page(url, fetcher=None, depth=0, all_anchors=False, parser=parsers.DEFAULT_PARSER, pool=None,
+              fingerprints=None, lastmod=None, rules=None):
+    """Fetch and extract one page, returning (page, links) or (None, []).
+
+    When the fetcher's cache reports the page unchanged (HTTP 304), the
+    extraction stored on the previous run is reused and the HTML is not
+    parsed again. With a process pool, parsing and extraction run there
+    instead of in the calling thread. Page, parse and extract timings go to
+    the fetcher's metrics registry, if it has one.
+    
+    With PageFingerprints, a page whose normalized markup has not changed
+    since the last run reuses that run's extraction even when its bytes did,
+    and a page last fetched after its sitemap lastmod is not fetched at all.
     
-    # Find phone numbers
-    text = soup.get_text()
-    import re
-    phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    phones = re.findall(phone_pattern, text)
-    contact["phone"] = list(set(phones))[:5]
+    With the stream parser and no cache, fingerprints or pool, the body is
+    extracted while it downloads and never held in memory as a whole.
+    
+    Extractions stored with other extraction rules are never reused.
+    """
+    if fetcher is None:
+        from aawheel.fetch import get_fetcher
+        fetcher = get_fetcher()
+    if fetcher.metrics is None:
+        return _load_page(url, fetcher, depth, all_anchors, parser, pool, fingerprints, lastmod, rules)
+    with fetcher.metrics.timer("page_seconds"):
+        return _load_page(url, fetcher, depth, all_anchors, parser, pool, fingerprints, lastmod, rules)
+
+def _load_page(url, fetcher, depth, all_anchors, parser, pool, fingerprints, lastmod, rules):
+    metrics = fetcher.metrics
+    # Stored extractions are only reused under the same rules, including edits to extraction_rules.json
+    rules = rules or default_rules()
+    derived_name = f"page-v{EXTRACT_VERSION}-{'all' if all_anchors else 'nav'}-{rules.digest[:12]}"
     
-    # Find email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    contact["email"] = list(set(emails))[:5]
+    if fingerprints is not None and lastmod is not None:
+        cached = fingerprints.unchanged_since(url, lastmod, derived_name)
+        if cached is not None:
+            if metrics is not None:
+                metrics.add("pages_total", status="not_modified")
+            return dict(cached["page"], depth=depth), cached["links"]
     
-    # Find addresses (look for common patterns)
-    address_patterns = soup.find_all(string=re.compile(r'\d+.*(Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr)', re.I))
-    for addr in address_patterns[:5]:
-        contact["address"].append(addr.strip())
+    streamed = parser == parsers.STREAM_PARSER and fetcher.cache is None and fingerprints is None and pool is None
+    try:
+        response = fetcher.get(url, stream=streamed)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"Error scraping {url}: {e}")
+        if metrics is not None:
+            metrics.add("pages_total", status="failed")
+        return None, []
+    if streamed:
+        return stream_page(response, url, depth, all_anchors, metrics, rules)
     
-    return contact
+    cached = None
+    if fingerprints is not None:
+        dom = dom_hash(response.content)
+        cached = fingerprints.reuse(url, dom, derived_name)
+    reused = cached is not None
+    if cached is None and getattr(response, 'not_modified', False):
+        cached = fetcher.cache.get_derived(url, derived_name)
+    if cached is None:
+        job = (response.content, url, all_anchors, parser, metrics is not None, rules)
+        try:
+            if pool is None:
+                result = parse_page(*job)
+            else:
+                result = pool.submit(parse_page, *job).result()
+        except Exception as e:
+            print(f"Error extracting {url}: {e}")
+            if metrics is not None:
+                metrics.add("pages_total", status="failed")
+            return None, []
+        if metrics is not None:
+            record_parse(metrics, result[2], parser, len(response.content))
+            metrics.add("pages_total", status="parsed")
+        cached = {"page": result[0], "links": result[1]}
+        if fetcher.cache is not None:
+            fetcher.cache.put_derived(url, derived_name, cached)
+    elif metrics is not None:
+        metrics.add("pages_total", status="cached")
+    if fingerprints is not None and not reused:
+        fingerprints.update(url, response.content, dom, derived_name, cached)
+    
+    page = dict(cached["page"], depth=depth)
+    return page, cached["links"]
 
-def extract_social_links(soup, base_url):
-    """Extract social media links."""
-    social = {}
-    social_keywords = ['facebook', 'twitter', 'instagram', 'linkedin', 'youtube', 'whatsapp']
+def stream_page(response, url, depth, all_anchors, metrics=None, rules=None):
+    """Extract a streamed response chunk by chunk, returning (page, links) or (None, []).
+    
+    Neither the body nor a tree is kept, so memory stays flat whatever the
+    page size. Parse time includes waiting for the body to arrive.
+    """
+    size = 0
     
-    links = soup.find_all('a', href=True)
-    for link in links:
-        href = link.get('href', '').lower()
-        for keyword in social_keywords:
-            if keyword in href:
-                social[keyword] = urljoin(base_url, link.get('href'))
-                break
+    def chunks():
+        nonlocal size
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            size += len(chunk)
+            yield chunk
     
-    return social
+    with response:
+        try:
+            result = parse_page(chunks(), url, all_anchors, parsers.STREAM_PARSER, metrics is not None, rules)
+        except Exception as e:
+            print(f"Error extracting {url}: {e}")
+            if metrics is not None:
+                metrics.add("pages_total", status="failed")
+            return None, []
+    if metrics is not None:
+        record_parse(metrics, result[2], parsers.STREAM_PARSER, size)
+        metrics.add("pages_total", status="parsed")
+    return dict(result[0], depth=depth), result[1]
 
-def main():
+def build_website_data(page):
+    """Shape the extracted data of the start page into website_data.json."""
+    content = page["content"]
+    return {
+        "site_info": {
+            "name": content.get("title", "AA Wheel & Truck Supply"),
+            "title": content.get("hero", ""),
+            "tagline": content.get("tagline", ""),
+            "description": " ".join([s.get("content", "") for s in content.get("sections", [])[:2]])
+        },
+        "navigation": page["navigation"],
+        "content": content,
+        "contact": page["contact"],
+        "social": page["social"],
+        "correlations": {}
+    }
+
+# (group, field, dedup key) of the lists unioned across crawled pages
+MERGE_FIELDS = [
+    ("content", "sections", lambda s: s["heading"]),
+    ("content", "products", lambda p: p["name"]),
+    ("content", "testimonials", lambda t: (t["author"], t["text"])),
+    ("contact", "phone", lambda v: v),
+    ("contact", "email", lambda v: v),
+    ("contact", "address", lambda v: v)
+]
+
+class WebsiteDataBuilder:
+    """Folds pages into website_data one at a time.
+
+    Site info and navigation come from the first page (the start page);
+    sections, products, testimonials and contact details are unioned across
+    all pages, keeping first-seen order.
+    """
+    
+    def __init__(self):
+        self.website_data = None
+        self._seen = {}
+        self._urls = set()
+    
+    def add_page(self, page):
+        """Fold one extracted page into the dataset (repeated URLs are ignored)."""
+        if page["url"] in self._urls:
+            return
+        self._urls.add(page["url"])
+        if self.website_data is None:
+            self.website_data = build_website_data(page)
+            self.website_data["pages"] = []
+            for group, field, key in MERGE_FIELDS:
+                self._seen[field] = {key(item) for item in self.website_data[group][field]}
+        else:
+            for group, field, key in MERGE_FIELDS:
+                target = self.website_data[group][field]
+                seen = self._seen[field]
+                for item in page[group][field]:
+                    item_key = key(item)
+                    if item_key not in seen:
+                        seen.add(item_key)
+                        target.append(item)
+            for network, href in page["social"].items():
+                self.website_data["social"].setdefault(network, href)
+        
+        self.website_data["pages"].append(
+            {"url": page["url"], "title": page["content"]["title"], "depth": page["depth"]}
+        )
+    
+    def result(self):
+        return self.website_data
+
+def merge_pages(pages):
+    """Merge per-page results into a single website_data dict."""
+    builder = WebsiteDataBuilder()
+    for page in pages:
+        builder.add_page(page)
+    return builder.result()
+
+def read_sitemaps(start_url, fetcher, robots, limit):
+    """The best `limit` crawlable URLs from the host's sitemaps, in priority order.
+
+    Sitemaps come from robots.txt, falling back to /sitemap.xml. Returns
+    (urls, {url: lastmod timestamp}).
+    """
+    listed = robots.policy(start_url).sitemaps()
+    sitemap_urls = listed or [urljoin(start_url, '/sitemap.xml')]
+    # Kept while robots.txt is unreadable: the crawl defers them until it can be read
+    accept = lambda url: is_crawlable(normalize_url(url), start_url) and (robots.policy(url).unavailable
+                                                                           or robots.allowed(url))
+    entries, stats = discover(sitemap_urls, fetcher, limit, accept)
+    if listed:
+        for url, error in stats["errors"]:
+            print(f"  ✗ Sitemap {url}: {error}")
+    if not stats["sitemaps"]:
+        if not listed:
+            print("  - No sitemap in robots.txt or at /sitemap.xml")
+        return [], {}
+    
+    urls = list(dict.fromkeys(normalize_url(entry.url) for entry in entries))
+    lastmods = {normalize_url(entry.url): entry.lastmod for entry in entries if entry.lastmod is not None}
+    print(f"✓ Sitemaps: {stats['sitemaps']} read, {stats['urls']} URLs listed, {len(urls)} selected by priority")
+    return urls, lastmods
+
+def crawl(start_url, max_depth=2, max_pages=50, workers=8, all_anchors=False, fetcher=None, robots=None,
+          parser=parsers.DEFAULT_PARSER, on_page=None, frontier=None, pool=None, fingerprints=None, sitemaps=False,
+          rules=None):
+    """Crawl same-host pages breadth-first with a bounded pool of workers.
+
+    Links disallowed by robots.txt are dropped before they are enqueued.
+    While the host's robots.txt cannot be read, URLs are deferred instead;
+    once nothing else is left the crawl waits for robots.txt (up to
+    ROBOTS_WAITS retries) and then queues or skips them. Any still deferred
+    at the end are picked up by a resumed crawl.
+    Each page is handed to on_page(page, links) as soon as it is extracted;
+    without a callback the pages are collected and returned in discovery
+    order (start page first).
+    
+    The URL queue and visited set live in a CrawlFrontier. Pass a persistent
+    one to resume an interrupted crawl: completed pages are not refetched
+    and count towards max_pages, and interrupted or failed ones are retried.
+    With a process pool, pages are parsed there while threads keep fetching.
+    PageFingerprints skip re-extracting pages whose markup did not change.
+    
+    With sitemaps=True the host's sitemap URLs are queued, highest priority
+    first, once the start page is done (site info and navigation come from
+    the first page completed), and with fingerprints pages whose lastmod
+    predates their last fetch are not fetched again. They count as depth 1,
+    like the start page's links, so max_depth=0 skips them.
+    
+    Pages are extracted with rules (compiled aawheel.rules), by default
+    the ones in extraction_rules.json.
+    """
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        from aawheel.fetch import Fetcher
+        scheduler = HostScheduler()
+        fetcher = Fetcher(per_host=workers, scheduler=scheduler)
+        robots = RobotsCache(fetcher, scheduler)
+    elif robots is None:
+        robots = RobotsCache(fetcher, fetcher.scheduler)
+    own_frontier = frontier is None
+    if own_frontier:
+        frontier = CrawlFrontier()
+    
+    def fetch(url, depth):
+        page, links = load_page(url, fetcher, depth, all_anchors, parser, pool, fingerprints, lastmods.get(url), rules)
+        return page, links if depth < max_depth else []
+    
+    def admit(url):
+        """Frontier status for a new URL under the host's robots.txt."""
+        policy = robots.policy(url)
+        if policy.unavailable:
+            return DEFERRED
+        return QUEUED if policy.allowed(url, robots.agent) else SKIPPED
+    
+    def release_deferred():
+        """Queue or skip the deferred URLs whose robots.txt can now be read.
+        
+        Returns when robots.txt may next be tried for those still waiting, or None.
+        """
+        retry_at = None
+        for url, _ in frontier.deferred():
+            status = admit(url)
+            if status == DEFERRED:
+                waiting = robots.policy(url).retry_at
+                retry_at = waiting if retry_at is None else min(retry_at, waiting)
+            else:
+                frontier.mark(url, status)
+        frontier.commit()
+        return retry_at
+    
+    results = []
+    if on_page is None:
+        def on_page(page, links):
+            # `order` is the discovery index of the page being handled below
+            results.append((order, page))
+    
+    start_url = normalize_url(start_url)
+    frontier.requeue()
+    frontier.add(start_url, 0, admit(start_url))
+    frontier.commit()
+    sitemap_urls, lastmods = read_sitemaps(start_url, fetcher, robots, max_pages) if sitemaps and max_depth > 0 else ([], {})
+    
+    def queue_sitemap_urls():
+        for url in sitemap_urls:
+            frontier.add(url, 1, admit(url))
+        sitemap_urls.clear()
+    
+    if frontier.status(start_url) != QUEUED:
+        queue_sitemap_urls()
+    completed = submitted = frontier.count(DONE)
+    robots_waits = 0
+    
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while True:
+            slots = min(workers - len(running), max_pages - submitted)
+            if slots > 0:
+                for url, depth, order in frontier.pop(slots):
+                    running[executor.submit(fetch, url, depth)] = (url, order)
+                    submitted += 1
+            if not running:
+                if submitted >= max_pages or not frontier.count(DEFERRED):
+                    break
+                retry_at = release_deferred()
+                if retry_at is None or frontier.count(QUEUED):
+                    continue
+                if robots_waits == ROBOTS_WAITS:
+                    break
+                robots_waits += 1
+                pause = max(retry_at - time.monotonic(), 0.0)
+                print(f"  - Waiting {pause:.0f}s to read robots.txt again ({robots_waits}/{ROBOTS_WAITS})")
+                time.sleep(pause)
+                continue
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, order = running.pop(future)
+                page, links = future.result()
+                if url == start_url:
+                    queue_sitemap_urls()
+                if page is None:
+                    frontier.mark(url, FAILED)
+                    continue
+                completed += 1
+                on_page(page, links)
+                frontier.mark(url, DONE)
+                print(f"  ✓ [{completed}] {page['url']} (depth {page['depth']})")
+                for link in links:
+                    if link in frontier:
+                        continue
+                    status = admit(link)
+                    if status == SKIPPED:
+                        print(f"  - Skipping {link} (disallowed by robots.txt)")
+                    frontier.add(link, page["depth"] + 1, status)
+            frontier.commit()
+    
+    deferred = frontier.count(DEFERRED)
+    if deferred:
+        print(f"✗ {deferred} URLs are waiting for a readable robots.txt; continue with --resume")
+    if own_fetcher:
+        fetcher.close()
+    if own_frontier:
+        frontier.close()
+    results.sort(key=lambda item: item[0])
+    return [page for _, page in results]
+
+def compact_jsonl(path):
+    """Fold a crawl's JSONL records into website_data, one page at a time.
+
+    Returns None when the file holds no complete page.
+    """
+    builder = WebsiteDataBuilder()
+    for page, _ in read_pages(path):
+        builder.add_page(page)
+    return builder.result()
+
+def write_website_data(website_data, output_file="website_data.json", shards_dir=None):
+    """Save website_data, its search index, binary catalog and (optionally) shards, then print a summary.
+
+    Nothing is written if the data does not validate against aawheel.models.
+    """
+    try:
+        catalog = Catalog.from_website_data(website_data)
+    except ValidationError as e:
+        fail(f"✗ Scraped data does not match the data model: {e}")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(website_data, f, indent=2, ensure_ascii=False)
+    index_file = Path(output_file).with_name("search_index.json")
+    index_size = write_search_index(website_data, index_file)
+    catalog_file = Path(output_file).with_suffix(".bin")
+    catalog_size = catalog.write(catalog_file)
+    
+    print(f"✓ Scraping complete! Data saved to {output_file}")
+    print(f"  - Search index: {index_file} ({index_size / 1024:.1f} KB)")
+    print(f"  - Binary catalog: {catalog_file} ({catalog_size / 1024:.1f} KB)")
+    print(f"  - Navigation items: {len(website_data.get('navigation', {}).get('main', []))}")
+    print(f"  - Products: {len(website_data.get('content', {}).get('products', []))}")
+    print(f"  - Testimonials: {len(website_data.get('content', {}).get('testimonials', []))}")
+    if website_data.get('pages'):
+        print(f"  - Pages crawled: {len(website_data['pages'])}")
+    
+    if shards_dir:
+        manifest, previous = write_shards(website_data, shards_dir)
+        print(f"✓ Wrote {len(manifest['shards'])} shards to {shards_dir}")
+        for line in size_report(manifest, previous):
+            print(f"  {line}")
+
+def report_changes(website_data, output_file, diff_file, fingerprints=None):
+    """Diff website_data against output_file, write the report to diff_file and return it.
+
+    Crawled data (with a "pages" list) is compared ignoring list order.
+    """
+    try:
+        with open(output_file, encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = None
+    report = diff_website_data(previous, website_data, ordered="pages" not in website_data)
+    if fingerprints is not None:
+        report["pages"] = fingerprints.report()
+    with open(diff_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    
+    if "pages" in report:
+        pages = report["pages"]
+        print(f"✓ Pages: {len(pages['added'])} new, {len(pages['changed'])} changed, {pages['unchanged']} unchanged")
+        for pair in pages["near_duplicates"]:
+            print(f"  near-duplicate: {pair['urls'][0]} ~ {pair['urls'][1]} ({pair['distance']} bits)")
+    if report["rebuild"]:
+        print(f"✗ Data changed since the last scrape, rebuild needed (details in {diff_file})")
+        for line in summary_lines(report):
+            print(f"  {line}")
+    else:
+        print(f"✓ No data changes since the last scrape; {output_file} left as is")
+    return report
+
+SITE_DEFAULTS = {
+    "crawl": True,
+    "max_depth": 2,
+    "max_pages": 50,
+    "all_links": False,
+    "sitemaps": True,
+    "rules": None
+}
+
+def load_site_manifest(path):
+    """Read a batch manifest: a JSON list of sites, or {"defaults": {...}, "sites": [...]}.
+
+    Each site is a start URL string or an object with "url" and optional
+    "name", "crawl", "max_depth", "max_pages", "all_links", "sitemaps" and
+    "rules" (an extraction rules file, relative to the manifest). Rules
+    files are loaded here, so invalid ones fail before anything is fetched.
+    """
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"sites": manifest}
+    defaults = dict(SITE_DEFAULTS, **manifest.get("defaults", {}))
+    
+    sites = []
+    names = set()
+    for entry in manifest["sites"]:
+        site = dict(defaults, **({"url": entry} if isinstance(entry, str) else entry))
+        parsed = urlparse(site["url"])
+        name = base = site.get("name") or slugify(parsed.netloc + parsed.path)
+        suffix = 2
+        while name in names:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        names.add(name)
+        site["name"] = name
+        if site["rules"]:
+            site["rules"] = load_rules(Path(path).parent / site["rules"])
+        sites.append(site)
+    return sites
+
+def scrape_site(site, output_dir, fetcher, robots, pool, workers=8, parser=parsers.DEFAULT_PARSER, rules=None):
+    """Scrape one manifest site into output_dir/<name>.json and return its summary.
+
+    The site's own rules win over rules.
+    """
+    start = time.perf_counter()
+    summary = {"name": site["name"], "url": site["url"], "pages": 0, "products": 0, "output": None, "error": None}
+    rules = site.get("rules") or rules
+    try:
+        if site["crawl"]:
+            pages = crawl(site["url"], site["max_depth"], site["max_pages"], workers, site["all_links"],
+                          fetcher, robots, parser, pool=pool, sitemaps=site["sitemaps"], rules=rules)
+            website_data = merge_pages(pages) if pages else None
+            summary["pages"] = len(pages)
+        elif not robots.allowed(site["url"]):
+            website_data = None
+            summary["error"] = "disallowed by robots.txt"
+        else:
+            page, _ = load_page(normalize_url(site["url"]), fetcher, 0, site["all_links"], parser, pool, rules=rules)
+            website_data = build_website_data(page) if page else None
+            summary["pages"] = 1 if page else 0
+        if website_data is None:
+            summary["error"] = summary["error"] or "no pages could be scraped"
+        else:
+            output_file = Path(output_dir) / f"{site['name']}.json"
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(website_data, f, indent=2, ensure_ascii=False)
+            summary["output"] = str(output_file)
+            summary["products"] = len(website_data["content"]["products"])
+    except Exception as e:
+        summary["error"] = str(e)
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    return summary
+
+def scrape_manifest(manifest_path, output_dir="sites", workers=8, processes=None, sites_parallel=4,
+                    fetcher=None, robots=None, parser=parsers.DEFAULT_PARSER, rules=None):
+    """Scrape every site in a manifest and write per-site results plus summary.json.
+
+    Sites are crawled concurrently by fetch threads sharing one fetcher; all
+    parsing and extraction runs in a process pool with `processes` workers,
+    so CPU-bound work is not serialized by the GIL. Sites without a "rules"
+    file of their own are extracted with rules.
+    """
+    sites = load_site_manifest(manifest_path)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        from aawheel.fetch import Fetcher
+        scheduler = HostScheduler()
+        fetcher = Fetcher(per_host=workers, scheduler=scheduler)
+        robots = RobotsCache(fetcher, scheduler)
+    elif robots is None:
+        robots = RobotsCache(fetcher, fetcher.scheduler)
+    start = time.perf_counter()
+    
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    with ProcessPoolExecutor(max_workers=processes) as pool, \
+            ThreadPoolExecutor(max_workers=sites_parallel) as site_executor:
+        futures = [site_executor.submit(scrape_site, site, output_dir, fetcher, robots, pool, workers, parser, rules)
+                   for site in sites]
+        summaries = [future.result() for future in futures]
+    if own_fetcher:
+        fetcher.close()
+    
+    elapsed = time.perf_counter() - start
+    pages = sum(summary["pages"] for summary in summaries)
+    summary = {
+        "sites": summaries,
+        "total_pages": pages,
+        "failed_sites": sum(1 for item in summaries if item["error"]),
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(pages / elapsed, 2) if elapsed else None
+    }
+    with open(Path(output_dir) / "summary.json", 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    
+    print(f"\n✓ Scraped {len(sites)} sites ({pages} pages) in {elapsed:.1f}s")
+    for item in summaries:
+        if item["error"]:
+            print(f"  ✗ {item['name']}: {item['error']}")
+        else:
+            print(f"  ✓ {item['name']}: {item['pages']} pages, {item['products']} products ({item['seconds']:.1f}s) -> {item['output']}")
+    print(f"  Summary: {Path(output_dir) / 'summary.json'}")
+    return summary
+
+def build_parser():
     parser = argparse.ArgumentParser(description='Scrape website content and structure')
     parser.add_argument('--url', default='https://aawheel.com', help='Target website URL')
+    parser.add_argument('--crawl', action='store_true', help='Follow same-host links instead of scraping a single page')
+    parser.add_argument('--max-depth', type=int, default=2, help='Maximum link depth from the start page when crawling')
+    parser.add_argument('--max-pages', type=int, default=50, help='Maximum number of pages to fetch when crawling')
+    parser.add_argument('--workers', type=int, default=8, help='Number of pages fetched concurrently when crawling')
+    parser.add_argument('--no-sitemaps', action='store_true', help='Do not queue URLs from the sitemaps listed in robots.txt (or /sitemap.xml) when crawling')
+    parser.add_argument('--all-links', action='store_true', help='Follow every anchor, not just nav/header/footer links')
+    parser.add_argument('--cache-dir', help='Directory of the on-disk HTTP response cache (default: .cache/http)')
+    parser.add_argument('--cache-size', type=int, default=256, help='Maximum size of the response cache in MB')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the response cache')
+    parser.add_argument('--offline', action='store_true', help='Replay cached responses only, with no network access')
+    parser.add_argument('--parser', default=parsers.DEFAULT_PARSER, choices=list(parsers.BACKENDS), help='HTML parser backend')
+    parser.add_argument('--rules', help='Extraction rules file (default: extraction_rules.json); keys it leaves out keep their defaults')
+    parser.add_argument('--jsonl', default='website_data.jsonl', help='Crawl records are streamed to this JSONL file as pages complete')
+    parser.add_argument('--state', default='.cache/crawl_frontier.sqlite', help='Crawl frontier database (queue, visited set, per-URL status)')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted crawl from --state, appending to --jsonl')
+    parser.add_argument('--compact', action='store_true', help='Only fold an existing --jsonl file into website_data.json')
+    parser.add_argument('--retries', type=int, default=3, help='Retries of a request after a connection error, timeout, 429 or 5xx, with jittered exponential backoff (0 disables)')
+    parser.add_argument('--hedge', action='store_true', help="Send a second request when a page is slower than the host's recent p95 latency; use the first answer")
+    parser.add_argument('--delay', type=float, default=0.0, help='Minimum seconds between requests to the same host (robots.txt Crawl-delay wins if larger)')
+    parser.add_argument('--shards-dir', default=DEFAULT_SHARDS_DIR, help='Directory for per-section/per-category JSON shards and their manifest')
+    parser.add_argument('--no-shards', action='store_true', help='Do not write sharded output')
+    parser.add_argument('--manifest', help='JSON list of sites to scrape in batch (one result file per site plus a summary)')
+    parser.add_argument('--output-dir', default='sites', help='Directory for per-site results in --manifest mode')
+    parser.add_argument('--processes', type=int, default=None, help='Parser processes in --manifest mode (default: all cores)')
+    parser.add_argument('--sites-parallel', type=int, default=4, help='Sites crawled at the same time in --manifest mode')
+    parser.add_argument('--fingerprints', default=DEFAULT_FINGERPRINTS, help='Page fingerprints and extractions kept between runs (disabled by --no-cache)')
+    parser.add_argument('--diff', metavar='PATH', help='Write a JSON diff against the existing website_data.json; exit 0 if nothing changed, 1 if a rebuild is needed, 2 on errors')
+    parser.add_argument('--metrics', help='Write per-stage timings and counters here (.prom/.txt for Prometheus text, otherwise JSON)')
+    parser.add_argument('--profile', metavar='PREFIX', help='Write cProfile stats to PREFIX.pstats and sampled stacks to PREFIX.folded')
+    return parser
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
     
+    if args.offline and args.no_cache:
+        parser.error('--offline needs the response cache')
+    try:
+        parsers.get_backend(args.parser)
+    except ImportError as e:
+        parser.error(str(e))
+    if args.rules:
+        try:
+            load_rules(args.rules)
+        except (OSError, RulesError) as e:
+            parser.error(f"--rules: {e}")
+    
+    metrics = Metrics() if args.metrics else None
+    try:
+        with profile(args.profile) if args.profile else nullcontext():
+            scrape(args, metrics)
+    except Exception:
+        traceback.print_exc()
+        sys.exit(EXIT_ERROR)
+    finally:
+        if metrics is not None:
+            metrics.write(args.metrics)
+            print(f"✓ Metrics written to {args.metrics}")
+            for line in metrics.summary_lines():
+                print(f"  {line}")
+
+def scrape(args, metrics=None):
+    """Run the scrape main() was configured for."""
+    if args.compact:
+        website_data = compact_jsonl(args.jsonl) if Path(args.jsonl).exists() else None
+        if website_data is None:
+            fail(f"No complete pages in {args.jsonl}")
+        write_website_data(website_data, shards_dir=None if args.no_shards else args.shards_dir)
+        return
+    
+    from aawheel.cache import DEFAULT_CACHE_DIR, ResponseCache
+    from aawheel.fetch import Fetcher
+    from aawheel.resilience import RetryPolicy
+    
+    cache = None if args.no_cache else ResponseCache(args.cache_dir or DEFAULT_CACHE_DIR, args.cache_size * 1024 * 1024)
+    scheduler = HostScheduler(default_delay=args.delay)
+    retry = RetryPolicy(attempts=args.retries + 1) if args.retries > 0 else None
+    fetcher = Fetcher(per_host=args.workers, cache=cache, offline=args.offline, scheduler=scheduler, metrics=metrics,
+                      retry=retry, hedge=args.hedge)
+    robots = RobotsCache(fetcher, scheduler)
+    fingerprints = None if args.no_cache else PageFingerprints(args.fingerprints)
+    rules = load_rules(args.rules) if args.rules else None
+    
+    if args.manifest:
+        print(f"Scraping sites from {args.manifest}" + (" (offline)" if args.offline else ""))
+        summary = scrape_manifest(args.manifest, args.output_dir, args.workers, args.processes, args.sites_parallel,
+                                  fetcher, robots, args.parser, rules)
+        fetcher.close()
+        if summary["failed_sites"]:
+            sys.exit(EXIT_ERROR)
+        return
+    
     base_url = args.url
-    print(f"Scraping website: {base_url}")
+    print(f"Scraping website: {base_url}" + (" (offline)" if args.offline else ""))
     
     # Check robots.txt
-    check_robots_txt(base_url)
+    policy = check_robots_txt(base_url, robots)
     
-    # Scrape main page
-    print("Scraping main page...")
-    soup = scrape_page(base_url)
+    website_data = None
+    if args.crawl:
+        frontier = CrawlFrontier(args.state)
+        if args.resume:
+            print(f"Resuming: {frontier.count(DONE)} pages done, {len(frontier)} URLs known")
+        else:
+            frontier.reset()
+        print(f"Crawling up to {args.max_pages} pages (depth {args.max_depth}, {args.workers} workers)...")
+        with JsonlSink(args.jsonl, append=args.resume) as sink:
+            crawl(base_url, args.max_depth, args.max_pages, args.workers, args.all_links, fetcher, robots,
+                  args.parser, on_page=sink.write_page, frontier=frontier, fingerprints=fingerprints,
+                  sitemaps=not args.no_sitemaps, rules=rules)
+        frontier.close()
+        website_data = compact_jsonl(args.jsonl)
+    elif not policy.allowed(base_url, robots.agent):
+        print(f"✗ {base_url} is disallowed by robots.txt")
+    else:
+        # Scrape main page
+        print("Scraping main page...")
+        page, _ = load_page(base_url, fetcher, parser=args.parser, fingerprints=fingerprints, rules=rules)
+        if page:
+            # Extract data from scraped content
+            website_data = build_website_data(page)
+    fetcher.close()
+    if fingerprints is not None:
+        fingerprints.save()
     
-    if not soup:
+    if website_data is None:
         print("Failed to scrape main page. Using fallback data from web search.")
         # Use data from web search results
         website_data = {
@@ -386,36 +1042,16 @@ def main():
                 "home_to_about": "About section links from hero"
             }
         }
-    else:
-        # Extract data from scraped content
-        nav = extract_navigation(soup, base_url)
-        content = extract_content(soup)
-        contact = extract_contact_info(soup)
-        social = extract_social_links(soup, base_url)
-        
-        website_data = {
-            "site_info": {
-                "name": content.get("title", "AA Wheel & Truck Supply"),
-                "title": content.get("hero", ""),
-                "tagline": content.get("tagline", ""),
-                "description": " ".join([s.get("content", "") for s in content.get("sections", [])[:2]])
-            },
-            "navigation": nav,
-            "content": content,
-            "contact": contact,
-            "social": social,
-            "correlations": {}
-        }
     
-    # Save to JSON
-    output_file = "website_data.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(website_data, f, indent=2, ensure_ascii=False)
+    if args.diff:
+        report = report_changes(website_data, "website_data.json", args.diff, fingerprints)
+        if not report["rebuild"]:
+            return
     
-    print(f"✓ Scraping complete! Data saved to {output_file}")
-    print(f"  - Navigation items: {len(website_data.get('navigation', {}).get('main', []))}")
-    print(f"  - Products: {len(website_data.get('content', {}).get('products', []))}")
-    print(f"  - Testimonials: {len(website_data.get('content', {}).get('testimonials', []))}")
+    # Save to JSON
+    write_website_data(website_data, shards_dir=None if args.no_shards else args.shards_dir)
+    if args.diff:
+        sys.exit(EXIT_CHANGED)
 
 if __name__ == "__main__":
     main()
@@ -4,60 +4,89 @@ Script to download images from AA Wheel Facebook page for use as temporary produ
 This script can work with direct image URLs or Facebook post URLs.
 """
 
-import requests
-import os
+import sys
+import csv
 import json
+import argparse
 from pathlib import Path
-from urllib.parse import urlparse
 import re
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aawheel.blobs import BlobStore, download_into
+from aawheel.models import load_product_images
+
 # Facebook page URL
 FACEBOOK_PAGE = "https://www.facebook.com/aawheel"
 
-# Product categories and their image mappings
-PRODUCT_IMAGES = {
-    "suspension": "suspension.jpg",
-    "dressed-axles": "dressed-axles.jpg",
-    "chemicals": "chemicals.jpg",
-    "safety": "safety.jpg",
-    "cargo-security": "cargo-security.jpg",
-    "trailer-body": "trailer-body.jpg",
-    "air-hydraulic": "air-hydraulic.jpg",
-    "brake-parts": "brake-parts.jpg",
-    "lighting": "lighting.jpg",
-}
+# Product category slugs and their image file names (shared product_images.json)
+PRODUCT_IMAGES = {entry.slug: entry.image for entry in load_product_images()}
 
-def download_image(url, output_path):
-    """Download an image from a URL."""
+def download_image(url, store, slug, fetcher=None):
+    """Download an image into the store and make it slug's image."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, stream=True, timeout=10)
-        response.raise_for_status()
-        
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        print(f"✓ Downloaded: {output_path}")
+        sha256, status = store.put_url(url, fetcher)
+        store.assign(slug, sha256)
+        print(f"✓ {slug}: {store.path(sha256)} ({status})")
         return True
     except Exception as e:
         print(f"✗ Failed to download {url}: {e}")
         return False
 
-def extract_facebook_image_url(facebook_url):
+def load_manifest(path):
+    """
+    Read a URL manifest mapping PRODUCT_IMAGES keys to image URLs.
+    JSON: {"suspension": "https://..."} or [{"category": ..., "url": ...}].
+    CSV: a header row with category,url columns.
+    Returns a list of (url, slug) jobs.
+    """
+    path = Path(path)
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            rows = [(row['category'].strip(), row['url'].strip()) for row in csv.DictReader(f)]
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                rows = list(data.items())
+            else:
+                rows = [(row['category'], row['url']) for row in data]
+    
+    jobs = []
+    for category, url in rows:
+        if not url:
+            continue
+        if category not in PRODUCT_IMAGES:
+            print(f"✗ Unknown category '{category}' (expected one of: {', '.join(PRODUCT_IMAGES)})")
+            continue
+        jobs.append((url, category))
+    return jobs
+
+def download_manifest(manifest, store, workers=8):
+    """Download every image in a manifest into the store in parallel. Returns {slug: status}."""
+    from aawheel.fetch import Fetcher
+    
+    jobs = load_manifest(manifest)
+    print(f"Downloading {len(jobs)} images with {workers} workers...")
+    with Fetcher(pool_size=workers, per_host=workers) as fetcher:
+        results = download_into(store, jobs, workers=workers, fetcher=fetcher)
+    
+    counts = {}
+    for status in results.values():
+        counts[status] = counts.get(status, 0) + 1
+    print("  " + ", ".join(f"{status}: {count}" for status, count in sorted(counts.items())))
+    return results
+
+def extract_facebook_image_url(facebook_url, fetcher=None):
     """
     Attempt to extract image URL from Facebook post/page.
     Note: Facebook's structure changes frequently, so this may need updates.
     """
+    from aawheel.fetch import get_fetcher
+    
+    if fetcher is None:
+        fetcher = get_fetcher()
+    
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(facebook_url, headers=headers, timeout=10)
+        response = fetcher.get(facebook_url, timeout=10)
         response.raise_for_status()
         
         # Try to find image URLs in the HTML
@@ -77,77 +106,88 @@ def extract_facebook_image_url(facebook_url):
     
     return None
 
+def write_mapping(store):
+    """Write image_mapping.json recording which category images are in the store."""
+    print("\n" + "=" * 60)
+    print("Creating image mapping file...")
+    
+    mapping = {
+        "instructions": "Map downloaded images to product categories",
+        "images_dir": str(store.root),
+        "mappings": {}
+    }
+    
+    # Resolve each category through the store
+    for category, filename in PRODUCT_IMAGES.items():
+        sha256 = store.resolve(category)
+        mapping["mappings"][category] = {
+            "filename": filename,
+            "blob": sha256,
+            "exists": sha256 is not None,
+            "path": store.url(sha256) if sha256 else f"/images/{filename}"
+        }
+    
+    mapping_file = Path("image_mapping.json")
+    with open(mapping_file, 'w') as f:
+        json.dump(mapping, f, indent=2)
+    
+    print(f"✓ Created mapping file: {mapping_file}")
+
 def main():
     """Main function to download images."""
-    # Create images directory
-    images_dir = Path("public/images")
-    images_dir.mkdir(parents=True, exist_ok=True)
+    parser = argparse.ArgumentParser(description='Download AA Wheel product images')
+    parser.add_argument('--manifest', help='JSON/CSV file mapping product categories to image URLs (non-interactive batch mode)')
+    parser.add_argument('--workers', type=int, default=8, help='Parallel downloads in batch mode (default: 8)')
+    parser.add_argument('--store', default='public/images/blobs', help='Content-addressed image store (default: public/images/blobs)')
+    args = parser.parse_args()
+    
+    store = BlobStore(args.store)
+    
+    if args.manifest:
+        results = download_manifest(args.manifest, store, args.workers)
+        write_mapping(store)
+        if 'failed' in results.values():
+            sys.exit(1)
+        return
     
     print("=" * 60)
     print("AA Wheel Facebook Image Downloader")
     print("=" * 60)
     print(f"\nFacebook Page: {FACEBOOK_PAGE}")
-    print(f"Output Directory: {images_dir}")
+    print(f"Image Store: {store.root}")
     print("\n" + "=" * 60)
     
     # Option 1: Manual URL input
     print("\nOption 1: Enter direct image URLs manually")
     print("You can right-click images on Facebook and 'Copy image address'")
-    print("Then paste the URLs here (one per line, or 'done' to finish):\n")
+    print("Then paste the URLs here, each followed by the category it is for ('done' to finish).")
+    print(f"Categories: {', '.join(PRODUCT_IMAGES)}\n")
     
     image_urls = []
     while True:
         url = input("Image URL (or 'done' to finish): ").strip()
         if url.lower() == 'done':
             break
-        if url:
-            image_urls.append(url)
+        if not url:
+            continue
+        slug = input("  Category: ").strip()
+        if slug not in PRODUCT_IMAGES:
+            print(f"✗ Unknown category '{slug}', skipping this URL")
+            continue
+        image_urls.append((url, slug))
     
     # Option 2: Download from provided URLs
     if image_urls:
         print(f"\nDownloading {len(image_urls)} images...")
-        for i, url in enumerate(image_urls, 1):
-            # Determine filename based on product category
-            if i <= len(PRODUCT_IMAGES):
-                category_key = list(PRODUCT_IMAGES.keys())[i-1]
-                filename = PRODUCT_IMAGES[category_key]
-            else:
-                # Generic filename
-                parsed = urlparse(url)
-                filename = os.path.basename(parsed.path) or f"product-{i}.jpg"
-                if not filename.endswith(('.jpg', '.jpeg', '.png')):
-                    filename += '.jpg'
-            
-            output_path = images_dir / filename
-            download_image(url, output_path)
-    
-    # Option 3: Create a mapping file for manual assignment
-    print("\n" + "=" * 60)
-    print("Creating image mapping file...")
+        for url, slug in image_urls:
+            download_image(url, store, slug)
+        store.save()
     
-    mapping = {
-        "instructions": "Map downloaded images to product categories",
-        "images_dir": str(images_dir),
-        "mappings": {}
-    }
+    write_mapping(store)
     
-    # Check which images exist
-    for category, filename in PRODUCT_IMAGES.items():
-        image_path = images_dir / filename
-        mapping["mappings"][category] = {
-            "filename": filename,
-            "exists": image_path.exists(),
-            "path": f"/images/{filename}"
-        }
-    
-    mapping_file = Path("image_mapping.json")
-    with open(mapping_file, 'w') as f:
-        json.dump(mapping, f, indent=2)
-    
-    print(f"✓ Created mapping file: {mapping_file}")
     print("\nNext steps:")
     print("1. Download images from Facebook manually")
-    print("2. Save them to public/images/ with the correct filenames")
+    print("2. Save them to public/images/ with the correct filenames and run setup_product_images.py")
     print("3. Or update image_mapping.json with your image URLs")
     
     print("\n" + "=" * 60)
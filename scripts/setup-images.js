@@ -6,17 +6,10 @@
 const fs = require('fs');
 const path = require('path');
 
-const PRODUCT_IMAGES = {
-  "Suspension": "suspension.jpg",
-  "Dressed Axles": "dressed-axles.jpg",
-  "Chemicals and Lubricants": "chemicals.jpg",
-  "Safety Equipment": "safety.jpg",
-  "Cargo Security": "cargo-security.jpg",
-  "Trailer Body Parts": "trailer-body.jpg",
-  "Air & Hydraulic Components": "air-hydraulic.jpg",
-  "Brake Parts": "brake-parts.jpg",
-  "Lighting & Electrical": "lighting.jpg",
-};
+// Shared with the Python scripts through aawheel/models.py
+const PRODUCT_IMAGES = Object.fromEntries(
+  require('../product_images.json').map(({ category, image }) => [category, image])
+);
 
 function createImagesDirectory() {
   const imagesDir = path.join(__dirname, '..', 'public', 'images');
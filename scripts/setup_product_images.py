@@ -5,22 +5,20 @@ This script helps organize images downloaded from AA Wheel's Facebook page.
 """
 
 import os
+import sys
 import json
 import shutil
+import argparse
 from pathlib import Path
 
-# Product image mappings
-PRODUCT_IMAGES = {
-    "Suspension": "suspension.jpg",
-    "Dressed Axles": "dressed-axles.jpg",
-    "Chemicals and Lubricants": "chemicals.jpg",
-    "Safety Equipment": "safety.jpg",
-    "Cargo Security": "cargo-security.jpg",
-    "Trailer Body Parts": "trailer-body.jpg",
-    "Air & Hydraulic Components": "air-hydraulic.jpg",
-    "Brake Parts": "brake-parts.jpg",
-    "Lighting & Electrical": "lighting.jpg",
-}
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aawheel.blobs import BlobStore
+from aawheel.models import load_product_images
+
+# Product image mappings (shared product_images.json)
+PRODUCT_IMAGES = {entry.category: entry.image for entry in load_product_images()}
+# Categories are stored in the image store under their slugs
+PRODUCT_SLUGS = {entry.category: entry.slug for entry in load_product_images()}
 
 def create_images_directory():
     """Create the images directory if it doesn't exist."""
@@ -85,42 +83,130 @@ def create_instructions():
     
     print("✓ Created instructions file: IMAGE_DOWNLOAD_INSTRUCTIONS.md")
 
-def check_existing_images():
-    """Check which images already exist."""
+def import_named_images(store):
+    """Add images saved by hand as public/images/<filename> to the store.
+    
+    A named file with new content becomes its category's image, so a file
+    that was already imported does not undo a later download.
+    """
     images_dir = Path("public/images")
+    for category, filename in PRODUCT_IMAGES.items():
+        image_path = images_dir / filename
+        if not image_path.exists():
+            continue
+        slug = PRODUCT_SLUGS[category]
+        sha256, new = store.put_file(image_path)
+        if (new or store.resolve(slug) is None) and store.assign(slug, sha256):
+            print(f"✓ Imported {filename} for {category}")
+    store.save()
+
+def check_existing_images(store):
+    """Check which categories have an image in the store."""
     existing = {}
     missing = []
     
     for category, filename in PRODUCT_IMAGES.items():
-        image_path = images_dir / filename
-        if image_path.exists():
-            size = image_path.stat().st_size
+        sha256 = store.resolve(PRODUCT_SLUGS[category])
+        if sha256:
             existing[category] = {
                 "filename": filename,
-                "size": f"{size / 1024:.1f} KB",
-                "path": str(image_path)
+                "blob": sha256,
+                "size": f"{store.blobs[sha256]['bytes'] / 1024:.1f} KB",
+                "path": str(store.path(sha256))
             }
         else:
             missing.append((category, filename))
     
     return existing, missing
 
-def create_image_mapping():
-    """Create a JSON file mapping products to images."""
+def report_duplicates(store, workers=None):
+    """Print categories sharing one image and stored images that look alike."""
+    users = {}
+    for category, slug in PRODUCT_SLUGS.items():
+        users.setdefault(store.refs.get(slug), []).append(category)
+    for sha256, keys in store.shared().items():
+        print(f"  ≡ Shared image {sha256[:12]}: {', '.join(users.get(sha256, keys))}")
+    
+    pairs = store.near_duplicates(workers=workers)
+    store.save()
+    for a, b, distance in pairs:
+        names = [", ".join(users.get(sha256, [])) or f"unused {sha256[:12]}" for sha256 in (a, b)]
+        print(f"  ≈ Near-duplicates ({distance} bits apart): {names[0]} / {names[1]}")
+    if not pairs:
+        print("  ✓ No near-duplicate images")
+
+def prune_store(store):
+    """Delete stored images no category uses, along with their optimized variants."""
+    from aawheel.images import ImageBuildCache
+    
+    removed = store.prune()
+    store.save()
+    cache = ImageBuildCache()
+    for path in removed:
+        cache.forget(path)
+    cache.save()
+    print(f"✓ Pruned {len(removed)} unused images")
+
+def optimize_product_images(store, workers=None, rebuild=False):
+    """Generate resized AVIF/WebP/JPEG variants of every new or changed product image.
+    
+    Variants are built per stored image, so categories sharing an image share them too.
+    """
+    from aawheel.images import ImageBuildCache, build_images
+    
+    blobs = {category: store.resolve(slug) for category, slug in PRODUCT_SLUGS.items()}
+    sources = sorted({store.path(sha256) for sha256 in blobs.values() if sha256})
+    if not sources:
+        print("✗ No product images to optimize")
+        return {}
+    
+    cache = ImageBuildCache()
+    if rebuild:
+        cache.entries.clear()
+    print(f"Optimizing {len(sources)} images...")
+    results = build_images(sources, Path("public/images/optimized"), workers=workers, cache=cache)
+    optimized = {category: results[store.path(sha256)] for category, sha256 in blobs.items()
+                 if sha256 and store.path(sha256) in results}
+    for category, info in optimized.items():
+        variant_bytes = sum(v["bytes"] for v in info["variants"])
+        print(f"  ✓ {category}: {info['width']}x{info['height']}, "
+              f"{len(info['variants'])} variants ({variant_bytes / 1024:.1f} KB total)")
+    return optimized
+
+def create_image_mapping(store, optimized=None):
+    """Create a JSON file mapping products to images.
+    
+    With `optimized` ({category: optimize_image() result}), each product also
+    gets its dimensions, byte size, variants and per-format srcsets.
+    """
+    from aawheel.images import srcsets
+    
     images_dir = Path("public/images")
+    optimized = optimized or {}
     mapping = {
         "images_directory": str(images_dir),
         "products": {}
     }
     
     for category, filename in PRODUCT_IMAGES.items():
-        image_path = images_dir / filename
-        mapping["products"][category] = {
+        sha256 = store.resolve(PRODUCT_SLUGS[category])
+        entry = {
             "filename": filename,
-            "path": f"/images/{filename}",
-            "exists": image_path.exists(),
+            "blob": sha256,
+            "path": store.url(sha256) if sha256 else f"/images/{filename}",
+            "exists": sha256 is not None,
             "category_key": category.lower().replace(" ", "-").replace("&", "")
         }
+        info = optimized.get(category)
+        if info:
+            entry.update(
+                width=info["width"],
+                height=info["height"],
+                bytes=info["bytes"],
+                variants=info["variants"],
+                srcset=srcsets(info["variants"])
+            )
+        mapping["products"][category] = entry
     
     with open("image_mapping.json", "w") as f:
         json.dump(mapping, f, indent=2)
@@ -129,6 +215,15 @@ def create_image_mapping():
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description='Set up AA Wheel product images')
+    parser.add_argument('--optimize', action='store_true', help='Generate resized AVIF/WebP/JPEG variants for responsive srcsets (needs Pillow)')
+    parser.add_argument('--workers', type=int, default=None, help='Processes used for optimization (default: all cores)')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the image build cache and reprocess every image')
+    parser.add_argument('--store', default='public/images/blobs', help='Content-addressed image store (default: public/images/blobs)')
+    parser.add_argument('--duplicates', action='store_true', help='Report categories sharing an image and near-duplicate images (needs Pillow)')
+    parser.add_argument('--prune', action='store_true', help='Delete stored images that no category uses')
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("AA Wheel Product Images Setup")
     print("=" * 60)
@@ -137,8 +232,12 @@ def main():
     images_dir = create_images_directory()
     print(f"✓ Images directory: {images_dir}")
     
+    # Add hand-saved images to the store
+    store = BlobStore(args.store)
+    import_named_images(store)
+    
     # Check existing images
-    existing, missing = check_existing_images()
+    existing, missing = check_existing_images(store)
     
     print(f"\n✓ Found {len(existing)} existing images")
     print(f"✗ Missing {len(missing)} images\n")
@@ -156,8 +255,22 @@ def main():
     # Create instructions
     create_instructions()
     
+    if args.prune:
+        print()
+        prune_store(store)
+    
+    if args.duplicates:
+        print("\nDuplicate images:")
+        report_duplicates(store, args.workers)
+    
+    # Optimize images
+    optimized = None
+    if args.optimize:
+        print()
+        optimized = optimize_product_images(store, args.workers, args.rebuild)
+    
     # Create mapping
-    create_image_mapping()
+    create_image_mapping(store, optimized)
     
     print("\n" + "=" * 60)
     print("Next Steps:")
@@ -0,0 +1,37 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The tests reuse the benchmark fixtures, reference extractors and replay server
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from corpus import synthetic_corpus
+from replay_server import make_server
+
+# Pages in the replayed synthetic site
+PAGES = 12
+
+@pytest.fixture(scope='session')
+def corpus(tmp_path_factory):
+    return synthetic_corpus(PAGES, 3_000, 0, tmp_path_factory.mktemp('corpus'))
+
+@pytest.fixture
+def serve(corpus):
+    """Start the replay server in this process with the given faults; returns its base URL."""
+    servers = []
+
+    def start(**faults):
+        server = make_server(corpus, **faults)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
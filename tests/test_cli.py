@@ -0,0 +1,29 @@
+import json
+import shutil
+
+from aawheel.cli import ROOT, build_parser, status
+
+def run_status(tmp_path):
+    args = build_parser().parse_args([
+        'status', '--strict', '--data', str(tmp_path / 'website_data.json'),
+        '--shards-dir', str(tmp_path / 'data'), '--store', str(tmp_path / 'blobs'),
+        '--state', str(tmp_path / 'crawl_frontier.sqlite')])
+    return status(args, [])
+
+def clean_checkout(tmp_path):
+    """The committed outputs only: no website_data.bin and no image store."""
+    shutil.copy(ROOT / 'website_data.json', tmp_path)
+    shutil.copy(ROOT / 'search_index.json', tmp_path)
+    shutil.copytree(ROOT / 'public' / 'data', tmp_path / 'data')
+
+def test_strict_status_passes_on_a_clean_checkout(tmp_path, capsys):
+    clean_checkout(tmp_path)
+    assert run_status(tmp_path) == 0
+    output = capsys.readouterr().out
+    assert "- Binary catalog" in output and "- Product images" in output
+
+def test_strict_status_fails_on_a_stale_search_index(tmp_path, capsys):
+    clean_checkout(tmp_path)
+    (tmp_path / 'search_index.json').write_text(json.dumps({}), encoding='utf-8')
+    assert run_status(tmp_path) == 1
+    assert "✗ Search index" in capsys.readouterr().out
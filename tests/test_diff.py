@@ -0,0 +1,31 @@
+from aawheel.diff import diff_website_data
+
+def review(author, text, **fields):
+    return dict(fields, author=author, text=text)
+
+def reviews_diff(old, new):
+    wrap = lambda items: {"content": {"testimonials": items}}
+    return diff_website_data(wrap(old), wrap(new), ordered=False)["testimonials"]
+
+def test_reviews_by_the_same_author_are_told_apart_by_text():
+    diff = reviews_diff([review("Ann", "one"), review("Ann", "two")],
+                        [review("Ann", "two", rating=5), review("Ann", "three")])
+    assert diff["added"] == [review("Ann", "three")]
+    assert diff["removed"] == [review("Ann", "one")]
+    assert diff["changed"] == [{"key": ["Ann", None], "fields": {"rating": [None, 5]}}]
+
+def test_an_authors_only_review_is_changed_not_replaced():
+    diff = reviews_diff([review("Ann", "one")], [review("Ann", "one, edited")])
+    assert diff["added"] == diff["removed"] == []
+    assert diff["changed"][0]["fields"] == {"text": ["one", "one, edited"]}
+
+def test_anonymous_reviews_are_added_and_removed():
+    diff = reviews_diff([review("", "x"), review("", "y")], [review("", "y"), review("", "z")])
+    assert diff["added"] == [review("", "z")]
+    assert diff["removed"] == [review("", "x")]
+    assert diff["changed"] == []
+
+def test_duplicate_reviews_are_counted():
+    diff = reviews_diff([review("Ann", "one"), review("Ann", "one")], [review("Ann", "one")])
+    assert diff["removed"] == [review("Ann", "one")]
+    assert diff["added"] == diff["changed"] == []
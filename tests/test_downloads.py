@@ -0,0 +1,116 @@
+"""
+Resuming interrupted downloads (aawheel/downloads.py and the image store
+built on it) against a small range-capable server whose file can change
+between attempts.
+"""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from aawheel.blobs import BlobStore
+from aawheel.downloads import CHUNK_SIZE, download_file
+from aawheel.fetch import Fetcher
+
+# Three chunks, so an interrupted attempt leaves whole chunks in the .part file
+OLD = bytes(range(256)) * (3 * CHUNK_SIZE // 256)
+NEW = bytes(reversed(range(256))) * (3 * CHUNK_SIZE // 256)
+
+class FileHandler(BaseHTTPRequestHandler):
+    body = OLD
+    etag = '"old"'
+    cut_after = None        # drop the connection after this many body bytes
+    honor_if_range = True
+    range_shift = 0         # answer ranges from this many bytes later than asked
+    ranges = []
+
+    def do_GET(self):
+        cls = type(self)
+        start = 0
+        requested = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if requested and (if_range in (None, cls.etag) or not cls.honor_if_range):
+            start = int(requested[len('bytes='):-1]) + cls.range_shift
+        cls.ranges.append(requested)
+        body = cls.body[start:]
+        self.send_response(206 if start else 200)
+        self.send_header('ETag', cls.etag)
+        self.send_header('Content-Length', str(len(body)))
+        if start:
+            self.send_header('Content-Range', f'bytes {start}-{len(cls.body) - 1}/{len(cls.body)}')
+        self.end_headers()
+        if cls.cut_after is not None:
+            self.wfile.write(body[:cls.cut_after])
+            cls.cut_after = None
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    FileHandler.body, FileHandler.etag = OLD, '"old"'
+    FileHandler.honor_if_range, FileHandler.range_shift, FileHandler.ranges = True, 0, []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FileHandler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/image.jpg"
+    server.shutdown()
+    server.server_close()
+
+def interrupted(url, dest, fetcher):
+    """Start a download that is cut off in its second chunk, leaving one chunk in dest.part."""
+    FileHandler.cut_after = CHUNK_SIZE + 1000
+    with pytest.raises(requests.RequestException):
+        download_file(url, dest, fetcher)
+    assert dest.with_name(dest.name + '.part').stat().st_size == CHUNK_SIZE
+
+@pytest.fixture
+def fetcher():
+    return Fetcher(retry=False, breakers=False)
+
+def test_an_interrupted_download_resumes(server, tmp_path, fetcher):
+    dest = tmp_path / 'image.jpg'
+    interrupted(server, dest, fetcher)
+    assert download_file(server, dest, fetcher) == hashlib.sha256(OLD).hexdigest()
+    assert dest.read_bytes() == OLD
+    assert FileHandler.ranges[-1] == f'bytes={CHUNK_SIZE}-'
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['image.jpg']
+
+def test_a_file_that_changed_is_downloaded_again(server, tmp_path, fetcher):
+    dest = tmp_path / 'image.jpg'
+    interrupted(server, dest, fetcher)
+    FileHandler.body, FileHandler.etag = NEW, '"new"'
+    assert download_file(server, dest, fetcher) == hashlib.sha256(NEW).hexdigest()
+    assert dest.read_bytes() == NEW
+
+def test_a_server_ignoring_if_range_does_not_splice_files(server, tmp_path, fetcher):
+    dest = tmp_path / 'image.jpg'
+    interrupted(server, dest, fetcher)
+    FileHandler.body, FileHandler.etag, FileHandler.honor_if_range = NEW, '"new"', False
+    assert download_file(server, dest, fetcher) == hashlib.sha256(NEW).hexdigest()
+    assert dest.read_bytes() == NEW
+
+def test_a_range_from_the_wrong_offset_restarts_the_download(server, tmp_path, fetcher):
+    dest = tmp_path / 'image.jpg'
+    interrupted(server, dest, fetcher)
+    FileHandler.range_shift = 100
+    assert download_file(server, dest, fetcher) == hashlib.sha256(OLD).hexdigest()
+    assert dest.read_bytes() == OLD
+    assert FileHandler.ranges[-1] is None
+
+def test_the_image_store_resumes_and_then_skips_a_stored_url(server, tmp_path, fetcher):
+    store = BlobStore(tmp_path / 'blobs')
+    FileHandler.cut_after = CHUNK_SIZE + 1000
+    with pytest.raises(requests.RequestException):
+        store.put_url(server, fetcher)
+    assert store.put_url(server, fetcher) == (hashlib.sha256(OLD).hexdigest(), 'downloaded')
+    assert FileHandler.ranges[-1] == f'bytes={CHUNK_SIZE}-'
+    requests_made = len(FileHandler.ranges)
+    assert store.put_url(server, fetcher) == (hashlib.sha256(OLD).hexdigest(), 'current')
+    assert len(FileHandler.ranges) == requests_made
+    assert store.path(hashlib.sha256(OLD).hexdigest()).read_bytes() == OLD
@@ -0,0 +1,48 @@
+"""
+Extraction parity: every parser backend, and the single-pass engine against
+the original extractors in benchmarks/legacy_extract.py.
+"""
+
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+from aawheel import extract, parsers
+from bench_extract import run_engine, run_legacy, same_output
+from fixtures import make_page
+
+BASE_URL = 'https://aawheel.com/'
+PAGES = [make_page(2_000 + seed * 3_000, seed) for seed in range(12)]
+EDGE_CASES = [
+    "",
+    "<p>no html or body element</p>",
+    "<html><body><div class='products'><article class='product-card'><h3>Brake &amp; Drums</h3><p>Heavy&nbsp;duty</p></article></div></body></html>",
+    "<html><body><footer><a href='#top'>Top</a><a href='/about'>About &amp; us</a></footer></body></html>",
+    "<html><body><p>Call 816-221-9556 or (816) 221-9556, mail Sales@AAWheel.com or sales@aawheel.com</p></body></html>",
+    "<html><body><script>var phone = '816-555-0100';</script><template><p>hidden</p></template></body></html>",
+]
+
+def extracted(html, backend):
+    return json.dumps(extract.extract_all(parsers.parse(html.encode('utf-8'), backend), BASE_URL),
+                      sort_keys=True, ensure_ascii=False)
+
+@pytest.mark.parametrize("backend", [name for name in parsers.BACKENDS if name != parsers.DEFAULT_PARSER])
+@pytest.mark.parametrize("html", PAGES + EDGE_CASES, ids=[f"page{i}" for i in range(len(PAGES))]
+                         + [f"edge{i}" for i in range(len(EDGE_CASES))])
+def test_backend_matches_html_parser(backend, html):
+    if backend not in parsers.available_backends():
+        pytest.skip(f"{backend} is not installed")
+    # Contact lists are compared in page order, which must not depend on the backend
+    assert extracted(html, backend) == extracted(html, parsers.DEFAULT_PARSER)
+
+@pytest.mark.parametrize("html", PAGES, ids=[f"page{i}" for i in range(len(PAGES))])
+def test_engine_matches_legacy_extractors(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    assert same_output(run_legacy(soup), run_engine(soup))
+
+def test_contacts_are_normalized_and_in_page_order():
+    html = EDGE_CASES[4]
+    contact = extract.extract_all(parsers.parse(html.encode('utf-8')), BASE_URL)["contact"]
+    assert contact["phone"] == ["+18162219556"]
+    assert contact["email"] == ["sales@aawheel.com"]
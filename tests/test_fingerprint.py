@@ -0,0 +1,21 @@
+from aawheel.fingerprint import PageFingerprints, dom_hash
+from scrape_website import parse_page
+
+URL = 'http://example.com/contact.html'
+PAGE = b'<html><body><h1>Contact</h1>\n  <!-- %s -->\n</body></html>'
+OLD = PAGE % b'123 Main Street, Springfield'
+NEW = PAGE % b'456 Oak Avenue, Springfield'
+
+def test_reindented_markup_keeps_its_hash():
+    assert dom_hash(OLD) == dom_hash(OLD.replace(b'\n  ', b'\n\t\t').replace(b'<h1>', b'<H1>'))
+
+def test_a_comment_only_edit_is_re_extracted(tmp_path):
+    old_page, old_links = parse_page(OLD, URL)
+    new_page, _ = parse_page(NEW, URL)
+    # The contact extractor reads the address from the comment
+    assert old_page["contact"]["address"] != new_page["contact"]["address"]
+
+    fingerprints = PageFingerprints(tmp_path / 'fingerprints.json')
+    fingerprints.update(URL, OLD, dom_hash(OLD), 'page', {"page": old_page, "links": old_links})
+    assert fingerprints.reuse(URL, dom_hash(OLD), 'page') is not None
+    assert fingerprints.reuse(URL, dom_hash(NEW), 'page') is None
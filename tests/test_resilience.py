@@ -0,0 +1,111 @@
+"""
+Retries, circuit breakers and hedging of the fetch layer against the
+fault-injecting replay server (benchmarks/replay_server.py).
+"""
+
+import time
+
+import pytest
+import requests
+
+from aawheel.fetch import Fetcher
+from aawheel.metrics import Metrics
+from aawheel.resilience import CircuitBreakers, CircuitOpenError, HedgePolicy, RetryPolicy
+from aawheel.robots import HostScheduler
+from bench_resilience import CONFIGS, counter, run_crawl
+from conftest import PAGES
+from replay_server import ReplayHandler
+
+PAGE = '/pages/1.html'
+
+def fast_retry(attempts=4):
+    return RetryPolicy(attempts=attempts, base=0.01, cap=0.05)
+
+def seen(path=PAGE):
+    return ReplayHandler.requests_seen.get(path, 0)
+
+def test_transient_errors_are_retried(serve):
+    url = serve(fail_first=2)
+    metrics = Metrics()
+    fetcher = Fetcher(retry=fast_retry(), breakers=False, metrics=metrics)
+    assert fetcher.get(url + PAGE).status_code == 200
+    assert seen() == 3
+    assert counter(metrics, "fetch_retries_total", reason="503") == 2
+
+def test_retries_give_up_after_the_last_attempt(serve):
+    url = serve(error_rate=1.0)
+    fetcher = Fetcher(retry=fast_retry(attempts=3), breakers=False)
+    assert fetcher.get(url + PAGE).status_code == 503
+    assert seen() == 3
+
+def test_without_retries_the_first_answer_is_returned(serve):
+    url = serve(fail_first=1)
+    fetcher = Fetcher(retry=False, breakers=False)
+    assert fetcher.get(url + PAGE).status_code == 503
+    assert seen() == 1
+
+def test_retry_after_is_honored(serve):
+    url = serve(fail_first=1, retry_after=0.3)
+    fetcher = Fetcher(retry=fast_retry(), breakers=False, scheduler=HostScheduler())
+    start = time.monotonic()
+    assert fetcher.get(url + PAGE).status_code == 200
+    assert time.monotonic() - start >= 0.3
+
+def test_dropped_connections_are_retried_then_raised(serve):
+    url = serve(drop_rate=1.0)
+    fetcher = Fetcher(retry=fast_retry(attempts=3), breakers=False)
+    with pytest.raises(requests.ConnectionError):
+        fetcher.get(url + PAGE)
+    assert seen() == 3
+
+def test_not_found_is_neither_retried_nor_a_failure(serve):
+    url = serve()
+    breakers = CircuitBreakers(window=4, min_attempts=4)
+    fetcher = Fetcher(retry=fast_retry(), breakers=breakers)
+    for _ in range(8):
+        assert fetcher.get(url + '/missing.html').status_code == 404
+    assert breakers.state(url.split('//')[1]) == 'closed'
+
+def test_circuit_opens_fails_fast_and_closes_after_a_good_probe(serve):
+    url = serve(error_rate=1.0)
+    host = url.split('//')[1]
+    now = [0.0]
+    breakers = CircuitBreakers(window=4, min_attempts=4, cooldown=10.0, clock=lambda: now[0])
+    fetcher = Fetcher(retry=False, breakers=breakers)
+    for _ in range(4):
+        assert fetcher.get(url + PAGE).status_code == 503
+    assert breakers.state(host) == 'open'
+    with pytest.raises(CircuitOpenError):
+        fetcher.get(url + PAGE)
+    assert seen() == 4
+
+    # A failed probe re-opens the circuit for another cooldown
+    now[0] = 11.0
+    assert breakers.state(host) == 'half-open'
+    assert fetcher.get(url + PAGE).status_code == 503
+    assert breakers.state(host) == 'open'
+
+    ReplayHandler.faults["error_rate"] = 0.0
+    now[0] = 22.0
+    assert fetcher.get(url + PAGE).status_code == 200
+    assert breakers.state(host) == 'closed'
+    assert seen() == 6
+
+def test_slow_responses_are_hedged(serve):
+    url = serve(slow_first=1, slow_seconds=1.0)
+    hedge = HedgePolicy(min_samples=3, min_delay=0.05)
+    for _ in range(3):
+        hedge.record(url.split('//')[1], 0.01)
+    metrics = Metrics()
+    fetcher = Fetcher(retry=False, breakers=False, hedge=hedge, metrics=metrics)
+    start = time.monotonic()
+    assert fetcher.get(url + PAGE).status_code == 200
+    assert time.monotonic() - start < 0.8
+    assert counter(metrics, "fetch_hedges_total", winner="hedge") == 1
+    fetcher.close()
+
+def test_crawl_loses_no_pages_to_transient_errors(serve):
+    url = serve(fail_first=1, retry_after=0.05)
+    assert run_crawl(url, PAGES, 4, CONFIGS["default"])["done"] == PAGES
+    url = serve(fail_first=1, retry_after=0.05)
+    assert run_crawl(url, PAGES, 4, CONFIGS["none"])["done"] < PAGES
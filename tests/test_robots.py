@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+import pytest
+
+from aawheel.robots import RobotsCache
+
+URL = 'http://example.com/products.html'
+
+class RobotsFetcher:
+    """Answers every robots.txt request with the given status and body (or raises it)."""
+
+    cache = None
+
+    def __init__(self, status, text=''):
+        self.status, self.text = status, text
+
+    def get(self, url, **kwargs):
+        if isinstance(self.status, Exception):
+            raise self.status
+        return SimpleNamespace(status_code=self.status, text=self.text)
+
+@pytest.mark.parametrize('status', [401, 403, 404, 410])
+def test_every_client_error_allows_everything(status):
+    assert RobotsCache(RobotsFetcher(status)).allowed(URL)
+
+@pytest.mark.parametrize('status', [500, 503, ConnectionError("refused")])
+def test_an_unreadable_robots_txt_disallows_everything_for_now(status):
+    policy = RobotsCache(RobotsFetcher(status)).policy(URL)
+    assert policy.unavailable and not policy.allowed(URL)
+
+def test_rules_are_applied():
+    robots = RobotsCache(RobotsFetcher(200, "User-agent: *\nDisallow: /private/\n"))
+    assert robots.allowed(URL)
+    assert not robots.allowed('http://example.com/private/a.html')
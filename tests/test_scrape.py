@@ -0,0 +1,77 @@
+import sys
+
+import pytest
+import requests
+
+import aawheel.robots as robots_module
+import scrape_website
+from aawheel.fetch import Fetcher
+from aawheel.frontier import DEFERRED, CrawlFrontier
+from aawheel.robots import RobotsCache
+from conftest import PAGES
+
+def run(monkeypatch, *argv):
+    """Exit status of scrape_website.main() run with argv."""
+    monkeypatch.setattr(sys, 'argv', ['scrape_website.py', *argv])
+    try:
+        scrape_website.main()
+    except SystemExit as e:
+        return e.code
+    return 0
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def test_diff_exits_1_when_the_data_changed_and_0_when_it_did_not(serve, workdir, monkeypatch):
+    url = serve()
+    args = ['--url', url + '/', '--diff', 'changes.json', '--no-shards']
+    assert run(monkeypatch, *args) == 1
+    assert (workdir / 'website_data.json').exists()
+    assert run(monkeypatch, *args) == 0
+
+def test_a_failed_run_exits_2(workdir, monkeypatch):
+    assert run(monkeypatch, '--compact', '--jsonl', 'missing.jsonl', '--diff', 'changes.json') == 2
+
+def test_an_unexpected_error_exits_2(serve, workdir, monkeypatch, capsys):
+    def broken(*args, **kwargs):
+        raise RuntimeError("extractor bug")
+
+    monkeypatch.setattr(scrape_website, 'report_changes', broken)
+    assert run(monkeypatch, '--url', serve() + '/', '--diff', 'changes.json') == 2
+    assert "extractor bug" in capsys.readouterr().err
+
+class UnreachableRobots:
+    """The fetcher, except that the first `failures` robots.txt requests raise."""
+
+    def __init__(self, fetcher, failures):
+        self.fetcher, self.failures = fetcher, failures
+        self.cache = None
+
+    def get(self, url, **kwargs):
+        if url.endswith('/robots.txt') and self.failures:
+            self.failures -= 1
+            raise requests.ConnectionError("robots.txt timed out")
+        return self.fetcher.get(url, **kwargs)
+
+def crawl_with_robots_failures(url, failures, frontier):
+    fetcher = Fetcher(retry=False, breakers=False)
+    robots = RobotsCache(UnreachableRobots(fetcher, failures))
+    pages = scrape_website.crawl(url + '/', max_depth=1, max_pages=PAGES, fetcher=fetcher, robots=robots,
+                                 frontier=frontier, sitemaps=True)
+    fetcher.close()
+    return pages
+
+def test_urls_wait_for_an_unreachable_robots_txt(serve, monkeypatch):
+    monkeypatch.setattr(robots_module, 'ROBOTS_RETRY', 0.05)
+    assert len(crawl_with_robots_failures(serve(), 2, CrawlFrontier())) == PAGES
+
+def test_urls_still_waiting_are_crawled_on_resume(serve, tmp_path, monkeypatch):
+    monkeypatch.setattr(robots_module, 'ROBOTS_RETRY', 0.05)
+    monkeypatch.setattr(scrape_website, 'ROBOTS_WAITS', 1)
+    url = serve()
+    frontier = CrawlFrontier(tmp_path / 'frontier.sqlite')
+    assert crawl_with_robots_failures(url, 10, frontier) == []
+    assert frontier.count(DEFERRED) == PAGES
+    assert len(crawl_with_robots_failures(url, 0, frontier)) == PAGES
@@ -0,0 +1,32 @@
+import json
+
+from aawheel.cli import ROOT
+from aawheel.search import SEARCH_FIELDS, build_search_index, search_products, tokenize
+
+PRODUCTS = [
+    {"name": "Lighting & Electrical", "category": "Lighting", "description": "LED lights and wiring"},
+    {"name": "Dressed Axles", "category": "Axles", "description": "Ready to install"},
+    {"name": "Safety Equipment", "category": "Safety", "description": "Chains and binders"}
+]
+
+def test_partly_typed_words_match_before_their_stem_is_complete():
+    index = build_search_index(PRODUCTS)
+    for query, expected in [("lighti", [0]), ("lightin", [0]), ("dresse", [1]), ("equipm", [2]),
+                            ("safety equip", [2]), ("lights", [0])]:
+        assert search_products(index, query) == expected, query
+
+def test_only_the_last_word_is_a_prefix():
+    index = build_search_index(PRODUCTS)
+    assert search_products(index, "equipm safety") == []
+    assert search_products(index, "equipment safe") == [2]
+
+def test_every_prefix_of_a_scraped_word_finds_its_product():
+    products = json.loads((ROOT / 'website_data.json').read_text(encoding='utf-8'))["content"]["products"]
+    index = build_search_index(products)
+    for doc, product in enumerate(products):
+        for field in SEARCH_FIELDS:
+            for word in tokenize(product.get(field) or ""):
+                for end in range(1, len(word) + 1):
+                    # None (a stopword so far, e.g. "a") leaves the list unfiltered
+                    ids = search_products(index, word[:end])
+                    assert ids is None or doc in ids, word[:end]
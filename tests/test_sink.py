@@ -0,0 +1,70 @@
+import json
+
+from aawheel.sink import JsonlSink, page_records, read_pages
+from scrape_website import compact_jsonl, parse_page
+
+def page(name, products):
+    url = f"http://example.com/{name}.html"
+    content = {"products": [{"name": product} for product in products], "hero": {"title": name}}
+    return {"url": url, "title": name, "content": content}
+
+def write_killed_page(path, killed, torn=True):
+    """Append a page's item records but not its page record, as a killed write would."""
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in page_records(killed, [])[:-1]:
+            f.write(json.dumps(record) + '\n')
+        if torn:
+            f.write('{"type": "prod')
+
+def products(path):
+    return {record["title"]: [item["name"] for item in record["content"]["products"]]
+            for record, _ in read_pages(path)}
+
+def test_resume_drops_the_items_of_a_killed_page(tmp_path):
+    path = tmp_path / 'crawl.jsonl'
+    with JsonlSink(path) as sink:
+        sink.write_page(page("a", ["A1"]))
+    write_killed_page(path, page("b", ["B1", "B2"]))
+    with JsonlSink(path, append=True) as sink:
+        sink.write_page(page("c", ["C1"]))
+    assert products(path) == {"a": ["A1"], "c": ["C1"]}
+
+def test_resume_drops_a_killed_write_of_the_same_page(tmp_path):
+    path = tmp_path / 'crawl.jsonl'
+    write_killed_page(path, page("a", ["A1"]))
+    with JsonlSink(path, append=True) as sink:
+        sink.write_page(page("a", ["A1"]))
+    assert products(path) == {"a": ["A1"]}
+
+def test_orphaned_items_are_not_merged_into_the_next_page(tmp_path):
+    path = tmp_path / 'crawl.jsonl'
+    write_killed_page(path, page("b", ["B1"]), torn=False)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(record) + '\n' for record in page_records(page("c", ["C1"]), [])))
+    assert products(path) == {"c": ["C1"]}
+
+def test_a_torn_final_line_is_ignored(tmp_path):
+    path = tmp_path / 'crawl.jsonl'
+    with JsonlSink(path) as sink:
+        sink.write_page(page("a", ["A1"]))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "page", "url"')
+    assert products(path) == {"a": ["A1"]}
+
+def test_a_resumed_crawl_compacts_to_its_complete_pages(tmp_path):
+    path = tmp_path / 'crawl.jsonl'
+    html = '<html><body><div class="product-card"><h3>{0}</h3><p>{0} parts</p></div></body></html>'
+
+    def crawled(name, depth):
+        extracted, links = parse_page(html.format(name).encode('utf-8'), f"http://example.com/{name}.html")
+        return dict(extracted, depth=depth), links
+
+    with JsonlSink(path) as sink:
+        sink.write_page(*crawled("Brakes", 0))
+    write_killed_page(path, crawled("Lighting", 1)[0])
+    with JsonlSink(path, append=True) as sink:
+        sink.write_page(*crawled("Axles", 1))
+    website_data = compact_jsonl(path)
+    assert [product["name"] for product in website_data["content"]["products"]] == ["Brakes", "Axles"]
+    assert [entry["url"] for entry in website_data["pages"]] == ["http://example.com/Brakes.html",
+                                                                  "http://example.com/Axles.html"]